@@ -0,0 +1,20 @@
+"""
+Shared fixtures for Part 1.
+
+Reuses the framework code from Part 2 so the browser is launched
+once per worker, not once per test.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Part2_Framework_Design"))
+
+from browser_factory import browser_factory, browser_context, page  # noqa: E402,F401
+from login_cache import login_cache, logged_in  # noqa: E402,F401
+from state_graph import state_graph, state  # noqa: E402,F401
+from plugins import register_plugins  # noqa: E402
+
+
+def pytest_configure(config):
+    register_plugins(config)
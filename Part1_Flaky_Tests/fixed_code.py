@@ -6,23 +6,28 @@ What I fixed:
 2. Used pytest fixture so browser always closes
 3. Handle 2FA (appears sometimes)
 4. Wait longer for big companies (50,000 projects)
+5. Share one browser per worker instead of launching one per test
+6. Reuse a saved login when the test isn't about login
+7. Check every project, not just the ones on the first screen
+8. Start from a saved "logged in, on the projects page" state
+
+The `page` and `state` fixtures come from conftest.py (Part 2's
+browser_factory.py and state_graph.py). Each test still gets its own
+isolated context, and it's always cleaned up even if the test fails.
 """
 
+import os
+
 import pytest
-from playwright.sync_api import sync_playwright
+
+from projects_page import ProjectsPage
 
 
-# Pytest fixture - ensures browser closes even if test fails
-@pytest.fixture
-def page():
-    """Open browser before test, close after test."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        yield page
-        browser.close()  # Always runs!
+# Point at local_server.py with WORKFLOWPRO_URL=http://127.0.0.1:8000
+APP_URL = os.getenv("WORKFLOWPRO_URL", "https://app.workflowpro.com")
 
 
+@pytest.mark.tenant("company1")
 def test_user_login_fixed(page):
     """Test login with proper waits."""
     
@@ -30,11 +35,11 @@ def test_user_login_fixed(page):
     test_email = "admin@company1.com"
     test_password = "password123"
     
-    # Go to login
-    page.goto("https://app.workflowpro.com/login")
+    # Go to login (don't wait for the full load, the form is what we need)
+    page.goto(f"{APP_URL}/login", wait_until="commit")
     
-    # Wait for page to load (this was missing!)
-    page.wait_for_load_state("networkidle")
+    # Wait for the form (this was missing!) - no networkidle, it
+    # always costs 500 ms+ and we only need this one element
     page.wait_for_selector("#email", state="visible", timeout=5000)
     
     # Fill form
@@ -54,7 +59,6 @@ def test_user_login_fixed(page):
     
     # Make sure we're on dashboard
     page.wait_for_url("**/dashboard", timeout=10000)
-    page.wait_for_load_state("networkidle")
     
     # Wait for welcome message before checking
     page.wait_for_selector(".welcome-message", state="visible", timeout=5000)
@@ -64,48 +68,26 @@ def test_user_login_fixed(page):
     assert page.locator(".welcome-message").is_visible()
 
 
-def test_multi_tenant_access_fixed(page):
+@pytest.mark.tenant("company2")
+def test_multi_tenant_access_fixed(state):
     """Test users only see their company's data."""
     
-    # Company2 user
-    test_email = "user@company2.com"
-    test_password = "password123"
-    
-    page.goto("https://app.workflowpro.com/login")
-    
-    # Wait for form
-    page.wait_for_load_state("networkidle")
-    page.wait_for_selector("#email", state="visible", timeout=5000)
-    
-    # Login
-    page.fill("#email", test_email)
-    page.fill("#password", test_password)
-    page.click("#login-btn")
-    
-    # Handle 2FA
-    page.wait_for_url("**/dashboard|**/2fa-verify", timeout=10000)
-    if "/2fa-verify" in page.url:
-        page.fill("#2fa-code", "123456")
-        page.click("#verify-btn")
-        page.wait_for_url("**/dashboard", timeout=10000)
-    
-    # Wait for dashboard
-    page.wait_for_url("**/dashboard", timeout=10000)
-    page.wait_for_load_state("networkidle")
-    
-    # Wait longer - Company2 has 50,000 projects!
-    # Takes 4+ seconds to load
-    page.wait_for_selector(".project-card", state="visible", timeout=30000)
-    
-    # Get projects
-    projects = page.locator(".project-card").all()
+    # Company2 user - login (and 2FA) and opening /projects are done once
+    # per worker and restored, this test isn't about getting there.
+    # The state waits for the first cards (Company2 has 50,000 projects,
+    # takes 4+ seconds to load)
+    page, _ = state("company2 employee on projects page")
+    projects_page = ProjectsPage(page)
+    
+    # Stream the whole list (all 50,000, not just the first screen) and
+    # check each batch as soon as it renders
+    count = 0
+    for batch in projects_page.stream_cards():
+        others = batch.not_owned_by("Company2")
+        assert not others, f"{len(others)} projects from other companies: {others[:5]}"
+        count += len(batch)
     
     # Check we got some
-    assert len(projects) > 0, "No projects"
-    
-    # Check all belong to Company2
-    for project in projects:
-        text = project.text_content() or ""
-        assert "Company2" in text
+    assert count > 0, "No projects"
     
-    print(f"All {len(projects)} projects belong to Company2")
+    print(f"All {count} projects belong to Company2")
@@ -0,0 +1,205 @@
+"""
+API Helper
+==========
+Project API calls with connection reuse.
+
+Every APIHelper for the same tenant shares one requests.Session, so
+calls reuse open keep-alive connections instead of paying a new
+TCP + TLS handshake each time. Headers are built once per tenant.
+Failed connections and 429/5xx responses are retried with backoff.
+
+AsyncAPIHelper has the same methods as coroutines (needs httpx).
+"""
+
+import asyncio
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config_example import Config
+from dependency_index import index
+from tracing import endpoint, tracer
+
+
+# Worth retrying: rate limited or server/gateway trouble
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# POST isn't retried after the request was sent (could create twice)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+def tenant_headers(token, tenant_id):
+    """Headers every call for this tenant needs."""
+    return {
+        "Authorization": f"Bearer {token}",
+        "X-Tenant-ID": tenant_id,
+        "Content-Type": "application/json",
+    }
+
+
+def project_payload(name, description, team_members=None):
+    return {
+        "name": name,
+        "description": description,
+        "team_members": team_members or [],
+    }
+
+
+# One session per tenant per process
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(base_url, token, tenant_id, pool_size=None, retries=None):
+    """Shared, pooled session for one tenant."""
+    key = (base_url, token, tenant_id)
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = _new_session(token, tenant_id, pool_size, retries)
+        return _sessions[key]
+
+
+def _new_session(token, tenant_id, pool_size, retries):
+    pool_size = pool_size or Config.API_POOL_SIZE
+    retries = Config.API_RETRIES if retries is None else retries
+
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=Config.API_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update(tenant_headers(token, tenant_id))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def close_sessions():
+    """Close every shared session (end of run)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+class APIHelper:
+    """Helper for API calls"""
+
+    def __init__(self, base_url, token, tenant_id, pool_size=None, retries=None, timeout=None):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.tenant_id = tenant_id
+        self.timeout = (timeout or Config.API_TIMEOUT) / 1000  # ms -> s
+        self.projects_url = f"{self.base_url}/api/v1/projects"
+        self.session = get_session(self.base_url, token, tenant_id, pool_size, retries)
+
+    def _request(self, method, url, **kwargs):
+        path = endpoint(url)
+        index.touch(f"endpoint:{method} {path}", "class:APIHelper")
+        with tracer.span(f"{method} {path}", "api", path):
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    def create_project(self, name, description, team_members=None):
+        """Create project via API"""
+        payload = project_payload(name, description, team_members)
+        return self._request("POST", self.projects_url, json=payload)
+
+    def get_project(self, project_id):
+        """Get project details via API"""
+        return self._request("GET", f"{self.projects_url}/{project_id}")
+
+    def list_projects(self, offset=0, limit=100):
+        """One page of the projects list (what the projects page loads)"""
+        return self._request("GET", self.projects_url, params={"offset": offset, "limit": limit})
+
+    def delete_project(self, project_id):
+        """Cleanup: Delete project"""
+        return self._request("DELETE", f"{self.projects_url}/{project_id}") or {"status": "deleted"}
+
+
+class AsyncAPIHelper:
+    """
+    Same calls as APIHelper, for asyncio code.
+
+        async with AsyncAPIHelper(url, token, tenant) as api:
+            projects = await asyncio.gather(*(api.get_project(i) for i in ids))
+
+    One pooled httpx client per helper (clients can't be shared across
+    event loops, so there is no process-wide cache here).
+    """
+
+    def __init__(self, base_url, token, tenant_id, pool_size=None, retries=None, timeout=None):
+        import httpx  # Only needed for async runs
+
+        self.base_url = base_url.rstrip("/")
+        self.tenant_id = tenant_id
+        self.retries = Config.API_RETRIES if retries is None else retries
+        self.projects_url = f"{self.base_url}/api/v1/projects"
+
+        pool_size = pool_size or Config.API_POOL_SIZE
+        self.client = httpx.AsyncClient(
+            headers=tenant_headers(token, tenant_id),
+            timeout=(timeout or Config.API_TIMEOUT) / 1000,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            ),
+        )
+        self._transport_error = httpx.TransportError
+        self._connect_errors = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def _request(self, method, url, **kwargs):
+        index.touch(f"endpoint:{method} {endpoint(url)}", "class:AsyncAPIHelper")
+        for attempt in range(self.retries + 1):
+            last_try = attempt == self.retries
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except self._transport_error as error:
+                # If we never connected, retrying is safe for any method
+                sent = not isinstance(error, self._connect_errors)
+                if last_try or (sent and method not in IDEMPOTENT_METHODS):
+                    raise
+            else:
+                retryable = response.status_code in RETRY_STATUSES and method in IDEMPOTENT_METHODS
+                if not retryable or last_try:
+                    response.raise_for_status()
+                    return response.json() if response.content else {}
+            await asyncio.sleep(Config.API_BACKOFF * (2 ** attempt))
+
+    async def create_project(self, name, description, team_members=None):
+        """Create project via API"""
+        payload = project_payload(name, description, team_members)
+        return await self._request("POST", self.projects_url, json=payload)
+
+    async def get_project(self, project_id):
+        """Get project details via API"""
+        return await self._request("GET", f"{self.projects_url}/{project_id}")
+
+    async def list_projects(self, offset=0, limit=100):
+        """One page of the projects list (what the projects page loads)"""
+        return await self._request("GET", self.projects_url, params={"offset": offset, "limit": limit})
+
+    async def delete_project(self, project_id):
+        """Cleanup: Delete project"""
+        return await self._request("DELETE", f"{self.projects_url}/{project_id}") or {"status": "deleted"}
@@ -0,0 +1,250 @@
+"""
+API Record / Replay
+===================
+Record the /api/ calls the browser makes in each test, then replay them
+from disk so UI-only runs don't need the backend.
+
+    API_REPLAY=record pytest ...   # Against a real server, writes archives
+    API_REPLAY=replay pytest ...   # Serves /api/ from the archives
+
+- One archive per test: Config.API_ARCHIVE_DIR/<test id>.har.gz
+  (HAR 1.2 JSON, gzipped - opens in any HAR viewer after gunzip)
+- On replay the archive is loaded into a dict keyed by method + path +
+  request body hash, so every lookup is O(1). Repeated identical calls
+  are answered in the recorded order.
+- A request that wasn't recorded gets a 501 and is listed in the
+  mismatch report at the end of the run
+- Only /api/ is intercepted; pages and static files go to the other
+  routes (asset cache) or the network as usual
+- Logins and precondition states (login_cache.py, state_graph.py) go
+  to a shared archive, API_ARCHIVE_DIR/shared/<worker>.har.gz, not the
+  test's: whether a test builds one or reuses it depends on the test
+  order and the login TTL, so replay mustn't depend on it
+
+Only browser traffic is recorded. APIHelper calls in the test itself
+still go to the server.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+from config_example import Config
+
+
+API_URL = re.compile(r"/api/")
+
+
+def archive_name(nodeid):
+    """Test id -> safe file name (long ids get a hash suffix)."""
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_")
+    if len(name) > 120:
+        name = name[:100] + "_" + hashlib.sha1(nodeid.encode()).hexdigest()[:12]
+    return f"{name}.har.gz"
+
+
+def request_key(method, url, body):
+    """Host-independent key, so archives work against any WORKFLOWPRO_URL."""
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    if body:
+        path += " " + hashlib.sha1(body).hexdigest()[:12]
+    return f"{method} {path}"
+
+
+class ApiReplay:
+    """Routes /api/ for every browser context; per-test state in between."""
+
+    def __init__(self, mode=None, archive_dir=None):
+        self.mode = mode or Config.API_REPLAY
+        self.dir = Path(archive_dir or Config.API_ARCHIVE_DIR)
+        self.test = None  # Current test id
+        self.recorded = []  # HAR entries (record mode)
+        self.index = {}  # key -> [entries] (replay mode)
+        self.served = {}  # key -> how many served so far
+        self.mismatches = []  # (test, method, url)
+        self.sharing = 0  # Depth of shared() blocks
+        self.shared_recorded = []  # This worker's login / state calls (record mode)
+        self.shared_index = None  # All workers' (replay mode), read on first use
+        self.shared_served = {}  # Per outermost shared() block
+        self.stats = {"recorded": 0, "replayed": 0, "tests": 0}
+
+    @property
+    def enabled(self):
+        return self.mode in ("record", "replay")
+
+    def install(self, context):
+        """Called for every new context (see BrowserFactory.setup_context)."""
+        if self.enabled:
+            context.route(API_URL, self._handle)
+
+    @contextmanager
+    def shared(self):
+        """Calls made in this block go to (or come from) the shared archive."""
+        if not self.sharing:
+            self.shared_served = {}  # Every build replays from the start
+        self.sharing += 1
+        try:
+            yield
+        finally:
+            self.sharing -= 1
+
+    # Per test
+
+    def begin(self, nodeid):
+        self.test = nodeid
+        self.recorded = []
+        self.served = {}
+        self.index = {}
+        if self.mode == "replay":
+            self.index = self._load(self.dir / archive_name(nodeid))
+
+    def end(self):
+        if self.mode == "record" and self.recorded:
+            self._save(self.dir / archive_name(self.test), self.recorded)
+        if self.test:
+            self.stats["tests"] += 1
+        self.test = None
+
+    # Routing
+
+    def _handle(self, route, request):
+        if self.sharing:
+            if self.mode == "record":
+                return self._record(route, request, self.shared_recorded)
+            if self.shared_index is None:
+                self.shared_index = self._load(*sorted((self.dir / "shared").glob("*.har.gz")))
+            return self._replay(route, request, self.shared_index, self.shared_served)
+        if self.test is None:
+            return route.fallback()  # Outside a test
+        if self.mode == "record":
+            return self._record(route, request, self.recorded)
+        return self._replay(route, request, self.index, self.served)
+
+    def _record(self, route, request, recorded):
+        response = route.fetch()
+        body = response.body()
+        recorded.append(self._entry(request, response, body))
+        self.stats["recorded"] += 1
+        route.fulfill(response=response, body=body)
+
+    def _replay(self, route, request, index, served):
+        key = request_key(request.method, request.url, request.post_data_buffer)
+        entries = index.get(key)
+        if not entries:
+            where = f"{self.test} (login/state)" if self.sharing else self.test
+            self.mismatches.append((where, request.method, request.url))
+            return route.fulfill(status=501, content_type="application/json",
+                                 body=json.dumps({"error": "not recorded", "key": key}))
+
+        count = served.get(key, 0)
+        served[key] = count + 1
+        entry = entries[min(count, len(entries) - 1)]  # Repeat the last one if asked again
+        response = entry["response"]
+        content = response["content"]
+        body = content.get("text", "")
+        body = base64.b64decode(body) if content.get("encoding") == "base64" else body.encode()
+        self.stats["replayed"] += 1
+        route.fulfill(
+            status=response["status"],
+            headers={h["name"]: h["value"] for h in response["headers"]},
+            body=body,
+        )
+
+    # Archives (HAR 1.2 subset)
+
+    @staticmethod
+    def _entry(request, response, body):
+        post_data = request.post_data_buffer
+        entry = {
+            "request": {
+                "method": request.method,
+                "url": request.url,
+                "headers": [],
+            },
+            "response": {
+                "status": response.status,
+                "headers": [
+                    {"name": name, "value": value}
+                    for name, value in response.headers.items()
+                    if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+                ],
+                "content": {"size": len(body), "text": base64.b64encode(body).decode(), "encoding": "base64"},
+            },
+        }
+        if post_data:
+            entry["request"]["postData"] = {"text": base64.b64encode(post_data).decode(), "encoding": "base64"}
+        return entry
+
+    def save_shared(self):
+        """End of session (record mode): this worker's login / state calls."""
+        if self.mode == "record" and self.shared_recorded:
+            self._save(self.dir / "shared" / f"{os.getenv('WORKER_ID', 'main')}.har.gz", self.shared_recorded)
+
+    def _save(self, path, entries):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        har = {"log": {"version": "1.2", "creator": {"name": "api_replay", "version": "1"}, "entries": entries}}
+        with gzip.open(path, "wt") as out:
+            json.dump(har, out, separators=(",", ":"))
+
+    @staticmethod
+    def _load(*paths):
+        """{key: [entries]} from the archives that exist."""
+        entries = []
+        for path in paths:
+            try:
+                with gzip.open(path, "rt") as archive:
+                    entries += json.load(archive)["log"]["entries"]
+            except FileNotFoundError:
+                continue
+        index = {}
+        for entry in entries:
+            request = entry["request"]
+            post_data = request.get("postData")
+            body = base64.b64decode(post_data["text"]) if post_data else None
+            index.setdefault(request_key(request["method"], request["url"], body), []).append(entry)
+        return index
+
+
+replay = ApiReplay()
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    if replay.enabled:
+        replay.begin(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    yield
+    if replay.enabled:
+        replay.end()
+
+
+def pytest_sessionfinish(session):
+    replay.save_shared()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not replay.enabled:
+        return
+    stats = replay.stats
+    terminalreporter.section(f"API {replay.mode}")
+    terminalreporter.write_line(
+        f"{stats['tests']} tests, {stats['recorded']} calls recorded, {stats['replayed']} replayed, "
+        f"{len(replay.mismatches)} not in the archive"
+    )
+    for test, method, url in replay.mismatches[:20]:
+        terminalreporter.write_line(f"  not recorded: {test}: {method} {url}")
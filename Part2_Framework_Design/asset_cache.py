@@ -0,0 +1,257 @@
+"""
+Static Asset Cache
+==================
+Serves JS/CSS/fonts/images from disk instead of downloading them
+again in every new context.
+
+Every test gets a fresh context, and a fresh context has an empty
+HTTP cache, so every test downloads the WorkflowPro bundles again.
+With ASSET_CACHE=true the browser factory routes static requests
+through this cache:
+
+- Files are stored by SHA-256 of their content and checked against
+  that hash when read back (a corrupt file is just a cache miss)
+- Cache-Control is honoured: no-store responses aren't kept, and an
+  entry is only served as is for its max-age. After that it's
+  revalidated with its ETag / Last-Modified (a 304 keeps the cached
+  body), or fetched again if it has neither
+- The cache is capped at ASSET_CACHE_MAX_MB; least recently used
+  entries are evicted first
+- /api/ calls and anything that isn't a GET of a static resource
+  always go to the network
+
+Note: Playwright turns off the browser's own HTTP cache for contexts
+with routes, which is why we keep our own.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from config_example import Config
+
+
+STATIC_TYPES = {"script", "stylesheet", "font", "image", "media"}
+
+# The body we store is already decoded, so these would be wrong
+DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+# One cache per directory in this process, shared by every factory
+# (including re-created ones) and reported at the end of the run
+_caches = {}
+
+
+def shared_cache(cache_dir=None):
+    """This process's cache for cache_dir, created on first use."""
+    path = Path(cache_dir or Config.ASSET_CACHE_DIR).resolve()
+    if path not in _caches:
+        _caches[path] = AssetCache(path)
+    return _caches[path]
+
+
+def header(headers, name):
+    """Case-insensitive header lookup ("" if missing)."""
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return ""
+
+
+def cache_policy(headers):
+    """
+    (storable, max_age seconds) from Cache-Control. Without a max-age
+    an entry is revalidated every time it's used.
+    """
+    directives = {}
+    for part in header(headers, "cache-control").split(","):
+        name, _, value = part.strip().lower().partition("=")
+        directives[name] = value.strip('"')
+    if "no-store" in directives:
+        return False, 0
+    if "no-cache" in directives:
+        return True, 0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return True, int(directives[name])
+    return True, 0
+
+
+class AssetCache:
+    """Content-addressed, size-bounded cache shared by all contexts."""
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.dir = Path(cache_dir or Config.ASSET_CACHE_DIR)
+        self.blob_dir = self.dir / "blobs"
+        self.index_path = self.dir / "index.json"
+        self.max_bytes = max_bytes or Config.ASSET_CACHE_MAX_MB * 1024 * 1024
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.index = self._load_index()  # url -> entry
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "bypassed": 0, "corrupt": 0,
+                      "evicted": 0, "bytes_saved": 0}
+
+    # Routing
+
+    def install(self, context):
+        """Route this context's static requests through the cache."""
+        context.route("**/*", self._handle)
+
+    def _handle(self, route, request):
+        if not self.is_cacheable(request):
+            self.stats["bypassed"] += 1
+            return route.fallback()  # Let other routes (or the network) have it
+
+        entry = self.index.get(request.url)
+        body = self._read(entry) if entry else None
+        if body is not None and time.time() - entry.get("stored", 0) < entry.get("max_age", 0):
+            self.stats["hits"] += 1
+            return self._serve(route, entry, body)
+
+        # Stale: ask the server if it changed, if we can
+        validators = self._validators(entry) if body is not None else {}
+        if validators:
+            response = route.fetch(headers={**request.headers, **validators})
+            if response.status == 304:
+                self.stats["revalidated"] += 1
+                with self.lock:
+                    entry["stored"] = time.time()
+                    entry["max_age"] = cache_policy(response.headers)[1]
+                return self._serve(route, entry, body)
+        else:
+            response = route.fetch()
+
+        self.stats["misses"] += 1
+        body = response.body()
+        if response.ok:
+            self._store(request.url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    def _serve(self, route, entry, body):
+        self.stats["bytes_saved"] += len(body)
+        entry["last_used"] = time.time()
+        route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+
+    @staticmethod
+    def _validators(entry):
+        """Conditional request headers for a cached entry."""
+        validators = {}
+        etag = header(entry["headers"], "etag")
+        last_modified = header(entry["headers"], "last-modified")
+        if etag:
+            validators["if-none-match"] = etag
+        if last_modified:
+            validators["if-modified-since"] = last_modified
+        return validators
+
+    @staticmethod
+    def is_cacheable(request):
+        return (
+            request.method == "GET"
+            and request.resource_type in STATIC_TYPES
+            and "/api/" not in request.url
+        )
+
+    # Storage
+
+    def _blob_path(self, sha):
+        return self.blob_dir / sha
+
+    def _read(self, entry):
+        """Blob contents, or None if missing or not matching its hash."""
+        try:
+            body = self._blob_path(entry["sha256"]).read_bytes()
+        except FileNotFoundError:
+            return None
+        if hashlib.sha256(body).hexdigest() != entry["sha256"]:
+            self.stats["corrupt"] += 1
+            self._blob_path(entry["sha256"]).unlink(missing_ok=True)  # Refetched next time
+            return None
+        return body
+
+    def _store(self, url, status, headers, body):
+        storable, max_age = cache_policy(headers)
+        if not storable:
+            with self.lock:
+                self.index.pop(url, None)
+            return
+        sha = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(sha)
+        if not path.exists():
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, path)
+
+        with self.lock:
+            self.index[url] = {
+                "sha256": sha,
+                "size": len(body),
+                "status": status,
+                "headers": {k: v for k, v in headers.items() if k.lower() not in DROP_HEADERS},
+                "last_used": time.time(),
+                "stored": time.time(),
+                "max_age": max_age,
+            }
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until we fit in max_bytes."""
+        sizes = {}
+        for entry in self.index.values():
+            sizes[entry["sha256"]] = entry["size"]
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        for url, entry in sorted(self.index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            del self.index[url]
+            self.stats["evicted"] += 1
+            # Several URLs can share one blob; delete it with the last one
+            if not any(e["sha256"] == entry["sha256"] for e in self.index.values()):
+                self._blob_path(entry["sha256"]).unlink(missing_ok=True)
+                total -= entry["size"]
+
+    # Index
+
+    def _load_index(self):
+        try:
+            return json.loads(self.index_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save(self):
+        """Merge with what other workers saved, then write the index."""
+        with self.lock:
+            on_disk = self._load_index()
+            for url, entry in on_disk.items():
+                mine = self.index.get(url)
+                if mine is None or entry["last_used"] > mine["last_used"]:
+                    self.index[url] = entry
+            self._evict()
+            tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(self.index))
+            os.replace(tmp_path, self.index_path)
+
+    def hit_rate(self):
+        served = self.stats["hits"] + self.stats["revalidated"]
+        lookups = served + self.stats["misses"]
+        return served / lookups if lookups else 0.0
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+def pytest_terminal_summary(terminalreporter):
+    for cache in _caches.values():
+        stats = cache.stats
+        terminalreporter.section("static asset cache")
+        terminalreporter.write_line(
+            f"hit rate {cache.hit_rate():.0%} ({stats['hits']} hits, {stats['revalidated']} revalidated, "
+            f"{stats['misses']} misses), "
+            f"{stats['bytes_saved'] / 1024 / 1024:.1f} MB not downloaded, "
+            f"{stats['evicted']} evicted, {stats['corrupt']} failed hash check"
+        )
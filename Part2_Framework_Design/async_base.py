@@ -0,0 +1,293 @@
+"""
+Async Base Classes
+==================
+Same page objects as base_test_example.py, on async_playwright.
+
+The sync API drives one page at a time per Python process. With asyncio
+one worker can keep dozens of pages busy on one event loop - while one
+page waits for the server, the others carry on:
+
+    async def login(user):
+        async with factory.context() as context:
+            login_page = AsyncLoginPage(await context.new_page())
+            await login_page.goto(f"{url}/login")
+            await login_page.login_to_dashboard(user["email"], user["password"])
+
+    await asyncio.gather(*(login(user) for user in users))
+
+Methods are the same as BasePage/LoginPage, just awaited. Tests can be
+`async def`; the pytest hook below runs them on this worker's loop
+(no pytest-asyncio needed).
+
+Not supported here yet: the context pool, the asset cache, tracing
+spans and round-trip counts (they are written for the sync API).
+"""
+
+import asyncio
+import atexit
+import inspect
+import os
+import re
+from contextlib import asynccontextmanager
+
+import pytest
+
+from browser_factory import BROWSER_ENGINES
+from config_example import Config, Environments, Tenants
+from dependency_index import index
+from readiness import Ready, wait_until_ready_async
+
+
+# One event loop per worker process, shared by fixtures and tests
+_loop = None
+_loop_pid = None
+
+
+def get_loop():
+    global _loop, _loop_pid
+    if _loop is None or _loop_pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+    return _loop
+
+
+def run(coroutine):
+    """Run a coroutine on the worker's loop from sync code (fixtures)."""
+    return get_loop().run_until_complete(coroutine)
+
+
+class AsyncBrowserFactory:
+    """
+    One browser per worker, a new context per test.
+    At most `concurrency` contexts are open at once.
+    """
+
+    def __init__(self, browser_name=None, headless=None, concurrency=None):
+        self.browser_name = BROWSER_ENGINES[(browser_name or Config.BROWSER).lower()]
+        self.headless = Config.HEADLESS if headless is None else headless
+        self.slots = asyncio.Semaphore(concurrency or Config.ASYNC_CONCURRENCY)
+        self.playwright = None
+        self.browser = None
+
+    async def start(self):
+        if self.browser:
+            return self
+        from playwright.async_api import async_playwright
+
+        self.playwright = await async_playwright().start()
+        engine = getattr(self.playwright, self.browser_name)
+        self.browser = await engine.launch(headless=self.headless)
+        return self
+
+    @asynccontextmanager
+    async def context(self, **options):
+        """A fresh context for a with-block (waits for a free slot)."""
+        async with self.slots:
+            context = await self.browser.new_context(**options)
+            context.set_default_timeout(Config.DEFAULT_TIMEOUT)
+            try:
+                yield context
+            finally:
+                await context.close()
+
+    async def stop(self):
+        """Close everything. Safe to call twice."""
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+
+_factory = None
+
+
+def get_async_factory():
+    """This worker's async factory, started on first use."""
+    global _factory
+    if _factory is None or _factory.browser is None or _loop_pid != os.getpid():
+        _factory = run(AsyncBrowserFactory().start())
+    return _factory
+
+
+@atexit.register
+def _stop_factory():
+    """Whichever factory is current at exit (registered once, not per restart)."""
+    if _factory is not None and _loop_pid == os.getpid():
+        run(_factory.stop())
+
+
+class AsyncBasePage:
+    """
+    BasePage for async pages. Same methods, awaited.
+    """
+
+    READY = None
+    READY_TIMEOUT = Config.DEFAULT_TIMEOUT
+
+    def __init__(self, page):
+        self.page = page
+        self._locators = {}  # selector -> Locator, made on first use
+
+    def locator(self, selector):
+        """Locator for a selector, made once per page object"""
+        index.touch_selector(self, selector)
+        if selector not in self._locators:
+            self._locators[selector] = self.page.locator(selector)
+        return self._locators[selector]
+
+    async def goto(self, url):
+        """Navigate to URL and wait until the page is ready"""
+        await self.navigate(lambda: self.page.goto(url, wait_until="commit"))
+
+    async def navigate(self, action):
+        """Run something that loads this page and wait for READY (action returns an awaitable)"""
+        await wait_until_ready_async(self.page, self.READY, action, self.READY_TIMEOUT, type(self).__name__)
+
+    async def click(self, selector):
+        """Click once the element is visible, enabled and stable"""
+        await self.locator(selector).click()
+
+    async def fill(self, selector, text):
+        """Fill input once it is visible and editable"""
+        await self.locator(selector).fill(text)
+
+    async def get_text(self, selector):
+        """Get text from element (waits for it to appear)"""
+        return await self.locator(selector).text_content()
+
+    async def is_visible(self, selector):
+        """Check if element visible"""
+        return await self.locator(selector).is_visible()
+
+    async def wait_for_url(self, url_pattern):
+        """Wait for URL change"""
+        await self.page.wait_for_url(url_pattern)
+
+
+class AsyncLoginPage(AsyncBasePage):
+    """
+    LoginPage for async pages.
+    """
+
+    READY = Ready.selector("#email")
+
+    def __init__(self, page):
+        super().__init__(page)
+        # Locators
+        self.email_input = "#email"
+        self.password_input = "#password"
+        self.login_btn = "#login-btn"
+        self.error_msg = ".error-message"
+        self.two_fa_input = "#2fa-code"
+        self.verify_btn = "#verify-btn"
+
+    async def login(self, email, password):
+        """Perform login"""
+        await self.fill(self.email_input, email)
+        await self.fill(self.password_input, password)
+        await self.click(self.login_btn)
+
+    async def login_to_dashboard(self, email, password, code=None):
+        """Login and get past 2FA if it shows up"""
+        await self.login(email, password)
+
+        await self.wait_for_url(re.compile(r".*/(dashboard|2fa-verify)"))
+        if "/2fa-verify" in self.page.url:
+            await self.fill(self.two_fa_input, code or Config.TWO_FA_CODE)
+            await self.click(self.verify_btn)
+
+        await self.wait_for_url("**/dashboard")
+
+    async def get_error(self):
+        """Get error message"""
+        return await self.get_text(self.error_msg)
+
+
+class AsyncBaseTest:
+    """
+    BaseTest for async tests: self.factory, self.context and self.page
+    are async objects, test methods are `async def`.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup before each test"""
+        self.factory = get_async_factory()
+        self.browser = self.factory.browser
+        manager = self.factory.context()
+        self.context = run(manager.__aenter__())
+        self.page = run(self.context.new_page())
+
+        yield  # Test runs here
+
+        run(manager.__aexit__(None, None, None))
+
+
+# Pytest fixtures
+# ===============
+
+@pytest.fixture(scope="session")
+def async_browser_factory():
+    """Shared async browser for the worker session."""
+    factory = get_async_factory()
+    yield factory
+    run(factory.stop())
+
+
+@pytest.fixture
+def async_page(async_browser_factory):
+    """New async page in its own context."""
+    manager = async_browser_factory.context()
+    context = run(manager.__aenter__())
+    yield run(context.new_page())
+    run(manager.__aexit__(None, None, None))
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Run `async def` tests on the worker's loop."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    argnames = pyfuncitem._fixtureinfo.argnames
+    run(pyfuncitem.obj(**{name: pyfuncitem.funcargs[name] for name in argnames}))
+    return True
+
+
+# Example Test
+class TestLoginAsync(AsyncBaseTest):
+    """
+    TestLogin from base_test_example.py, async.
+    """
+
+    @pytest.mark.tenant("company1")
+    async def test_valid_login(self):
+        """Test login with valid credentials"""
+        login_page = AsyncLoginPage(self.page)
+
+        await login_page.goto(f"{Environments.get_url(Config.ENV)}/login")
+        await login_page.login("admin@company1.com", "password123")
+
+        await login_page.wait_for_url("**/dashboard")
+        assert "/dashboard" in self.page.url
+
+    @pytest.mark.tenant("company1", "company2")
+    async def test_all_users_login_concurrently(self):
+        """Every configured user logs in at the same time, one context each"""
+        async def login(tenant, user):
+            async with self.factory.context() as context:
+                login_page = AsyncLoginPage(await context.new_page())
+                await login_page.goto(f"{Tenants.TENANTS[tenant]['url']}/login")
+                await login_page.login_to_dashboard(user["email"], user["password"])
+                return login_page.page.url
+
+        urls = await asyncio.gather(*(
+            login(tenant, user)
+            for tenant, config in Tenants.TENANTS.items()
+            for user in config["users"].values()
+        ))
+        assert all("/dashboard" in url for url in urls)
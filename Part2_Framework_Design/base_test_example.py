@@ -3,8 +3,18 @@
 Shows how base classes make code reusable.
 """
 
+import re
+
 import pytest
-from playwright.sync_api import sync_playwright
+
+from browser_factory import get_factory
+from config_example import Config, Environments
+from dependency_index import index
+from failure_capture import capture
+from readiness import Ready, wait_until_all_ready, wait_until_ready
+from round_trips import counted
+from tracing import traced
+from web_vitals import vitals
 
 
 class BasePage:
@@ -13,51 +23,106 @@ class BasePage:
     Has common methods so we don't repeat code.
     """
     
+    # What "loaded" means for this page (see readiness.py).
+    # None = wait for networkidle.
+    READY = None
+    READY_TIMEOUT = Config.DEFAULT_TIMEOUT
+    
     def __init__(self, page):
         self.page = page
+        self._locators = {}  # selector -> Locator, made on first use
+    
+    def locator(self, selector):
+        """
+        Locator for a selector, made once per page object.
+        Locator actions wait for the element themselves, so each action
+        is a single call to the browser.
+        """
+        index.touch_selector(self, selector)
+        if selector not in self._locators:
+            self._locators[selector] = self.page.locator(selector)
+        return self._locators[selector]
     
+    @traced("action")
+    @counted
     def goto(self, url):
-        """Navigate to URL"""
-        self.page.goto(url)
-        self.page.wait_for_load_state("networkidle")
+        """Navigate to URL and wait until the page is ready"""
+        self.navigate(lambda: self.page.goto(url, wait_until="commit"))
     
+    @traced("action")
+    @counted
+    def navigate(self, action):
+        """Run something that loads this page (goto, click, reload) and wait for READY"""
+        wait_until_ready(self.page, self.READY, action, self.READY_TIMEOUT, type(self).__name__)
+        vitals.collect(self.page, type(self).__name__)
+        capture.snapshot(self.page)
+    
+    @traced("action")
+    @counted
     def click(self, selector):
-        """Wait then click"""
-        self.page.wait_for_selector(selector, state="visible")
-        self.page.click(selector)
+        """Click once the element is visible, enabled and stable"""
+        self.locator(selector).click()
     
+    @traced("action")
+    @counted
     def fill(self, selector, text):
-        """Wait then fill input"""
-        self.page.wait_for_selector(selector, state="visible")
-        self.page.fill(selector, text)
+        """Fill input once it is visible and editable"""
+        self.locator(selector).fill(text)
     
+    @traced("action")
+    @counted
     def get_text(self, selector):
-        """Get text from element"""
-        self.page.wait_for_selector(selector, state="visible")
-        return self.page.locator(selector).text_content()
+        """Get text from element (waits for it to appear)"""
+        return self.locator(selector).text_content()
     
+    @traced("action")
+    @counted
     def is_visible(self, selector):
         """Check if element visible"""
-        return self.page.locator(selector).is_visible()
+        return self.locator(selector).is_visible()
     
+    @traced("action")
+    @counted
     def wait_for_url(self, url_pattern):
         """Wait for URL change"""
         self.page.wait_for_url(url_pattern)
 
 
+def navigate_all(page_objects, action):
+    """
+    page_object.navigate(...) for several page objects at once, e.g. one
+    per tenant context. action(page_object) starts the navigation; all of
+    them start before we wait, so the pages load in parallel.
+    Returns each page's load time in ms.
+    """
+    page_objects = list(page_objects)
+    load_ms = wait_until_all_ready([
+        (po.page, po.READY, lambda po=po: action(po), po.READY_TIMEOUT, type(po).__name__)
+        for po in page_objects
+    ])
+    for po in page_objects:
+        vitals.collect(po.page, type(po).__name__)
+        capture.snapshot(po.page)
+    return load_ms
+
+
 class LoginPage(BasePage):
     """
     Login page object.
     Inherits common methods from BasePage.
     """
     
+    READY = Ready.selector("#email")
+    
     def __init__(self, page):
         super().__init__(page)
-        # Locators
+        # Locators (selectors; BasePage.locator() turns them into Locators once)
         self.email_input = "#email"
         self.password_input = "#password"
         self.login_btn = "#login-btn"
         self.error_msg = ".error-message"
+        self.two_fa_input = "#2fa-code"
+        self.verify_btn = "#verify-btn"
     
     def login(self, email, password):
         """Perform login"""
@@ -65,6 +130,18 @@ class LoginPage(BasePage):
         self.fill(self.password_input, password)
         self.click(self.login_btn)
     
+    def login_to_dashboard(self, email, password, code=None):
+        """Login and get past 2FA if it shows up"""
+        self.login(email, password)
+        
+        # 2FA only appears for some users
+        self.wait_for_url(re.compile(r".*/(dashboard|2fa-verify)"))
+        if "/2fa-verify" in self.page.url:
+            self.fill(self.two_fa_input, code or Config.TWO_FA_CODE)
+            self.click(self.verify_btn)
+        
+        self.wait_for_url("**/dashboard")
+    
     def get_error(self):
         """Get error message"""
         return self.get_text(self.error_msg)
@@ -79,15 +156,16 @@ class BaseTest:
     @pytest.fixture(autouse=True)
     def setup(self):
         """Setup before each test"""
-        # Launch browser
-        with sync_playwright() as p:
-            self.browser = p.chromium.launch(headless=True)
-            self.page = self.browser.new_page()
+        # Browser is launched once per worker, each test gets its own context
+        factory = get_factory()
+        with factory.context() as context:
+            self.browser = factory.browser
+            self.context = context
+            self.page = context.new_page()
             
             yield  # Test runs here
             
-            # Always cleanup
-            self.browser.close()
+            # Context is cleaned up (or recycled) when the with-block exits
 
 
 # Example Test
@@ -97,13 +175,14 @@ class TestLogin(BaseTest):
     Gets browser setup/cleanup automatically.
     """
     
+    @pytest.mark.tenant("company1")
     def test_valid_login(self):
         """Test login with valid credentials"""
         # Create page object
         login_page = LoginPage(self.page)
         
         # Perform actions
-        login_page.goto("https://staging.workflowpro.com/login")
+        login_page.goto(f"{Environments.get_url(Config.ENV)}/login")
         login_page.login("admin@company1.com", "password123")
         
         # Verify
@@ -114,7 +193,7 @@ class TestLogin(BaseTest):
         """Test login with invalid credentials"""
         login_page = LoginPage(self.page)
         
-        login_page.goto("https://staging.workflowpro.com/login")
+        login_page.goto(f"{Environments.get_url(Config.ENV)}/login")
         login_page.login("wrong@email.com", "wrongpass")
         
         # Verify error appears
@@ -126,7 +205,7 @@ class TestLogin(BaseTest):
 # ================
 # 1. BasePage has all common stuff (click, fill, etc)
 # 2. LoginPage only has login stuff
-# 3. BaseTest sets up browser automatically
+# 3. BaseTest sets up browser automatically (one browser per worker)
 # 4. TestLogin has clean test code
 
 # Benefits:
@@ -0,0 +1,97 @@
+"""
+Benchmark: APIHelper requests/sec
+=================================
+Starts local_server.py on a free port, in its own process so it doesn't
+share the benchmark's GIL, and measures GET throughput:
+
+1. new connection per call (what plain requests.get() does)
+2. pooled APIHelper, one thread
+3. pooled APIHelper, --concurrency threads
+4. AsyncAPIHelper, --concurrency coroutines (needs httpx)
+
+Run:
+    python bench_api_helper.py --requests 2000 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from api_helper import AsyncAPIHelper, APIHelper, close_sessions, tenant_headers
+from local_server import ServerProcess
+
+
+TOKEN = "test_token_company1"
+TENANT = "company1"
+
+
+def bench_unpooled(base_url, project_id, count):
+    url = f"{base_url}/api/v1/projects/{project_id}"
+    headers = tenant_headers(TOKEN, TENANT)
+    for _ in range(count):
+        requests.get(url, headers=headers).raise_for_status()
+
+
+def bench_pooled(api, project_id, count):
+    for _ in range(count):
+        api.get_project(project_id)
+
+
+def bench_pooled_threads(api, project_id, count, concurrency):
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda _: api.get_project(project_id), range(count)))
+
+
+async def bench_async(base_url, project_id, count, concurrency):
+    limit = asyncio.Semaphore(concurrency)
+
+    async with AsyncAPIHelper(base_url, TOKEN, TENANT, pool_size=concurrency) as api:
+        async def one():
+            async with limit:
+                await api.get_project(project_id)
+
+        await asyncio.gather(*(one() for _ in range(count)))
+
+
+def timed(name, count, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    if asyncio.iscoroutine(result):
+        asyncio.run(result)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<34} {count / elapsed:9.0f} req/s   ({elapsed:.2f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="APIHelper throughput against local_server.py")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    server = ServerProcess(project_counts={"company2": 0}).start()
+    base_url = server.url
+    api = APIHelper(base_url, TOKEN, TENANT, pool_size=args.concurrency)
+    project_id = api.create_project("Bench Project", "Benchmark")["id"]
+    count = args.requests
+
+    print(f"{count} GETs against {base_url}\n")
+    try:
+        timed("new connection per call", count, bench_unpooled, base_url, project_id, count)
+        timed("pooled APIHelper", count, bench_pooled, api, project_id, count)
+        timed(f"pooled APIHelper x{args.concurrency} threads", count,
+              bench_pooled_threads, api, project_id, count, args.concurrency)
+        try:
+            timed(f"AsyncAPIHelper x{args.concurrency} tasks", count,
+                  bench_async, base_url, project_id, count, args.concurrency)
+        except ImportError:
+            print("AsyncAPIHelper                     skipped (pip install httpx)")
+    finally:
+        close_sessions()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
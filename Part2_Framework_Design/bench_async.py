@@ -0,0 +1,86 @@
+"""
+Benchmark: sync vs async page objects
+=====================================
+Runs the same login test N times in one worker process against
+local_server.py: one test at a time with LoginPage (sync), then many at
+once with AsyncLoginPage on one event loop. One process is one core's
+worth of Python, so tests/min here is tests/min per core.
+
+Run:
+    python bench_async.py --tests 100 --concurrency 20 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import time
+
+from async_base import AsyncBrowserFactory, AsyncLoginPage
+from base_test_example import LoginPage
+from browser_factory import BrowserFactory
+from config_example import Tenants
+from local_server import WorkflowProServer
+
+
+USER = Tenants.get_user("company1", "admin")
+
+
+def run_sync(base_url, count):
+    factory = BrowserFactory(headless=True).start()
+    try:
+        for _ in range(count):
+            with factory.context() as context:
+                login_page = LoginPage(context.new_page())
+                login_page.goto(f"{base_url}/login")
+                login_page.login_to_dashboard(USER["email"], USER["password"])
+    finally:
+        factory.stop()
+
+
+async def run_async(base_url, count, concurrency):
+    factory = await AsyncBrowserFactory(headless=True, concurrency=concurrency).start()
+
+    async def one_test():
+        async with factory.context() as context:
+            login_page = AsyncLoginPage(await context.new_page())
+            await login_page.goto(f"{base_url}/login")
+            await login_page.login_to_dashboard(USER["email"], USER["password"])
+
+    try:
+        await asyncio.gather(*(one_test() for _ in range(count)))
+    finally:
+        await factory.stop()
+
+
+def timed(name, count, func, *args):
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    func(*args)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    print(
+        f"{name:<18} {wall:7.2f} s   {count / wall * 60:8.0f} tests/min per core   "
+        f"python CPU {cpu:6.2f} s ({cpu / wall:4.0%} busy)"
+    )
+    return wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    args = parser.parse_args()
+
+    server = WorkflowProServer(port=0, project_counts={"company2": 0}, latency_ms=args.latency_ms).start()
+    print(f"{args.tests} login tests against {server.url} ({args.latency_ms} ms latency)\n")
+    try:
+        sync_wall = timed("sync", args.tests, run_sync, server.url, args.tests)
+        async_wall = timed(f"async x{args.concurrency}", args.tests,
+                           lambda: asyncio.run(run_async(server.url, args.tests, args.concurrency)))
+    finally:
+        server.stop()
+    print(f"\nSpeed-up: {sync_wall / async_wall:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: per-test browser launch vs shared browser + context pool
+===================================================================
+Runs the same tiny "test" many times both ways and prints per-test
+wall time. Works offline (uses page.set_content, no network).
+
+Run:
+    python bench_browser_factory.py --tests 50
+"""
+
+import argparse
+import statistics
+import time
+
+from playwright.sync_api import sync_playwright
+
+from browser_factory import BrowserFactory
+
+
+PAGE_HTML = """
+<form>
+  <input id="email"><input id="password" type="password">
+  <button id="login-btn" type="button"
+          onclick="document.body.insertAdjacentHTML('beforeend', '<p class=welcome-message>Hi</p>')">
+    Login
+  </button>
+</form>
+"""
+
+
+def fake_test(page):
+    """Small login-like test body."""
+    page.set_content(PAGE_HTML)
+    page.fill("#email", "admin@company1.com")
+    page.fill("#password", "password123")
+    page.click("#login-btn")
+    page.wait_for_selector(".welcome-message", state="visible")
+
+
+def run_per_test_launch(count):
+    """What the old fixtures did: new Playwright + browser every test."""
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            fake_test(page)
+            browser.close()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_pooled(count, max_uses):
+    """New fixtures: one browser, pooled contexts. Startup is counted once."""
+    timings = []
+    start = time.perf_counter()
+    factory = BrowserFactory(headless=True, max_uses=max_uses).start()
+    startup = time.perf_counter() - start
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            with factory.context() as context:
+                fake_test(context.new_page())
+            timings.append(time.perf_counter() - start)
+        stats = factory.pool.stats
+    finally:
+        factory.stop()
+    return timings, startup, stats
+
+
+def summary(name, timings):
+    ms = [t * 1000 for t in timings]
+    print(
+        f"{name:<22} mean {statistics.mean(ms):8.1f} ms   "
+        f"median {statistics.median(ms):8.1f} ms   "
+        f"total {sum(timings):7.2f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tests", type=int, default=20)
+    parser.add_argument("--max-uses", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Running {args.tests} tests each way...\n")
+    per_test = run_per_test_launch(args.tests)
+    pooled, startup, stats = run_pooled(args.tests, args.max_uses)
+
+    summary("per-test launch", per_test)
+    summary("shared + pooled", pooled)
+    print(f"\nShared browser startup (paid once): {startup * 1000:.1f} ms")
+    print(f"Pool stats: {stats}")
+    saved = statistics.mean(per_test) - statistics.mean(pooled)
+    print(f"Saved per test: {saved * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
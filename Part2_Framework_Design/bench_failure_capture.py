@@ -0,0 +1,96 @@
+"""
+Benchmark: failure capture overhead
+===================================
+Runs the same passing test (log in, open /projects) N times against
+local_server.py with failure capture off and on, and prints the cost per
+test. This includes what the end-of-run report can't see: the extra
+event messages from the driver and the DOM snapshot round trips.
+Then fails one test on purpose to time saving it.
+
+Run:
+    python bench_failure_capture.py --tests 50 --projects 2000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from base_test_example import LoginPage
+from browser_factory import BrowserFactory
+from config_example import Config, Tenants
+from failure_capture import capture
+from local_server import WorkflowProServer
+from projects_page import ProjectsPage
+
+
+USER = Tenants.get_user("company2", "admin")
+
+
+def one_test(factory, base_url):
+    with factory.context() as context:
+        page = context.new_page()
+        login_page = LoginPage(page)
+        login_page.goto(f"{base_url}/login")
+        login_page.login_to_dashboard(USER["email"], USER["password"])
+        ProjectsPage(page).goto(f"{base_url}/projects")
+
+
+def run(base_url, count, enabled):
+    """Per-test wall times (ms), with capture on or off for every context."""
+    capture.enabled = enabled
+    factory = BrowserFactory(headless=True).start()
+    try:
+        one_test(factory, base_url)  # Warm up
+        times = []
+        for _ in range(count):
+            capture.begin()
+            start = time.perf_counter()
+            one_test(factory, base_url)
+            times.append((time.perf_counter() - start) * 1000)
+            capture.end()
+        return times
+    finally:
+        factory.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tests", type=int, default=50)
+    parser.add_argument("--projects", type=int, default=2000, help="company2 project cards")
+    args = parser.parse_args()
+
+    server = WorkflowProServer(port=0, project_counts={"company2": args.projects}).start()
+    try:
+        off = run(server.url, args.tests, enabled=False)
+        on = run(server.url, args.tests, enabled=True)
+
+        # One failure: screenshot on this thread, the rest in the background
+        capture.dir = Path(tempfile.mkdtemp())
+        factory = BrowserFactory(headless=True).start()
+        try:
+            with factory.context() as context:
+                capture.begin()
+                LoginPage(context.new_page()).goto(f"{server.url}/login")
+                capture.save_failure("bench::failing_test", "call", "AssertionError: on purpose")
+            capture.wait()
+        finally:
+            factory.stop()
+    finally:
+        server.stop()
+
+    median_off, median_on = statistics.median(off), statistics.median(on)
+    print(f"{args.tests} tests, {args.projects} projects on the page ({Config.CAPTURE_BUFFER_SIZE} events kept)\n")
+    print(f"capture off  median {median_off:7.1f} ms per test")
+    print(f"capture on   median {median_on:7.1f} ms per test  "
+          f"(+{median_on - median_off:.1f} ms, {(median_on - median_off) / median_off:+.1%})")
+    print(f"on the test thread: {capture.stats['buffer_s'] * 1000 / capture.stats['tests']:.2f} ms per test buffering, "
+          f"{capture.stats['snapshot_s'] * 1000 / capture.stats['tests']:.1f} ms DOM snapshots")
+    print(f"saving a failure: {capture.stats['capture_s'] * 1000:.0f} ms on the test thread, "
+          f"{capture.stats['background_s'] * 1000:.0f} ms in the background, "
+          f"{capture.stats['bytes'] / 1024:.0f} KB in {capture.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: seeding throughput
+=============================
+Creates and deletes projects for two tenants on local_server.py
+(started in its own process, so it doesn't share the benchmark's GIL):
+
+1. one create_project() call at a time (what the integration test does)
+2. Seeder: batches on a thread pool, both tenants at once
+
+Run:
+    python bench_seeding.py --projects 1000 --api-latency-ms 5
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+
+from api_helper import APIHelper, close_sessions
+from config_example import Tenants
+from local_server import ServerProcess
+from seeding import Seeder
+
+
+def specs(tenant, count):
+    return [{"name": f"Seed {tenant} {n}", "description": "bench"} for n in range(count)]
+
+
+def rate(count, elapsed):
+    return f"{count / elapsed:8.0f} projects/s   ({elapsed:.2f} s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seeder throughput against local_server.py")
+    parser.add_argument("--projects", type=int, default=500, help="Per tenant")
+    parser.add_argument("--api-latency-ms", type=float, default=5)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=10, help="Threads per tenant")
+    args = parser.parse_args()
+
+    server = ServerProcess(project_counts={"company2": 0}, api_latency_ms=args.api_latency_ms).start()
+    tenants = list(Tenants.TENANTS)
+    apis = {t: APIHelper(server.url, Tenants.TENANTS[t]["api_token"], t) for t in tenants}
+    journal_dir = tempfile.mkdtemp()
+    total = args.projects * len(tenants)
+    print(f"{total} projects over {len(tenants)} tenants, {args.api_latency_ms} ms API latency\n")
+
+    try:
+        start = time.perf_counter()
+        ids = [(t, apis[t].create_project(**spec)["id"]) for t in tenants for spec in specs(t, args.projects)]
+        print(f"{'sequential create':<20}{rate(total, time.perf_counter() - start)}")
+        start = time.perf_counter()
+        for tenant, project_id in ids:
+            apis[tenant].delete_project(project_id)
+        print(f"{'sequential delete':<20}{rate(total, time.perf_counter() - start)}")
+
+        seeder = Seeder(apis.get, journal_dir, args.batch_size, args.workers)
+        start = time.perf_counter()
+        seeder.create_projects({t: specs(t, args.projects) for t in tenants})
+        print(f"{'Seeder create':<20}{rate(total, time.perf_counter() - start)}")
+        start = time.perf_counter()
+        failed = seeder.teardown()
+        print(f"{'Seeder teardown':<20}{rate(total, time.perf_counter() - start)}")
+        if failed:
+            print(f"\n{len(failed)} projects could not be deleted")
+    finally:
+        close_sessions()
+        server.stop()
+        shutil.rmtree(journal_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: collection time
+==========================
+Times `pytest --collect-only` (a fresh interpreter each time) for:
+
+- api:   an API-only test module (APIHelper, consistency, seeder)
+- ui:    Part 1's fixed tests (page objects, browser fixtures)
+- full:  Part 1, Part 3 and the Part 2 examples
+
+and how much of it went on importing Playwright (from -X importtime).
+Playwright is only imported when a browser is started, so the API-only
+run shouldn't import it at all. The "api + playwright" row imports it up
+front, which is what every run used to pay.
+
+Run:
+    python bench_startup.py --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+
+API_CONFTEST = f"""
+import sys
+sys.path.insert(0, {str(HERE)!r})
+
+from seeding import seeder  # noqa: E402,F401
+from plugins import register_plugins  # noqa: E402
+
+
+def pytest_configure(config):
+    register_plugins(config)
+"""
+
+API_TESTS = """
+from api_helper import APIHelper
+from config_example import Tenants
+from consistency import project_visible, wait_until_consistent
+
+
+def test_create_project_visible():
+    tenant = Tenants.TENANTS["company1"]
+    api = APIHelper(tenant["url"], tenant["api_token"], "company1")
+    project = api.create_project("Startup", "API only")
+    wait_until_consistent(project_visible(api, project["id"]), "company1")
+"""
+
+
+def collect(targets, extra=(), cwd=ROOT):
+    """(wall seconds, ms importing playwright) for one collection."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q",
+         "-p", "no:cacheprovider", *extra, *targets],
+        cwd=cwd, capture_output=True, text=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Collection failed for {targets}:\n{result.stdout[-2000:]}")
+
+    # "import time: self | cumulative | name" - self time of every playwright module
+    playwright_us = 0
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip().startswith("playwright"):
+            playwright_us += int(parts[0].split(":")[1])
+    return wall, playwright_us / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        api_dir = Path(tmp_dir)
+        (api_dir / "conftest.py").write_text(API_CONFTEST)
+        (api_dir / "test_api_only.py").write_text(API_TESTS)
+
+        runs = [
+            ("api", [str(api_dir)], (), api_dir),
+            ("api + playwright", [str(api_dir)], ("-p", "playwright.sync_api"), api_dir),
+            ("ui", ["Part1_Flaky_Tests/fixed_code.py"], (), ROOT),
+            ("full", ["Part1_Flaky_Tests/fixed_code.py", "Part3_Integration_Test",
+                      "Part2_Framework_Design/base_test_example.py", "Part2_Framework_Design/async_base.py"], (), ROOT),
+        ]
+
+        print(f"{'run':<18}{'median':>9}{'min':>9}{'playwright':>12}")
+        for name, targets, extra, cwd in runs:
+            collect(targets, extra, cwd)  # Warm the OS file cache
+            samples = [collect(targets, extra, cwd) for _ in range(args.repeat)]
+            walls = [wall for wall, _ in samples]
+            playwright_ms = statistics.median(ms for _, ms in samples)
+            print(f"{name:<18}{statistics.median(walls) * 1000:>7.0f}ms{min(walls) * 1000:>7.0f}ms"
+                  f"{playwright_ms:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
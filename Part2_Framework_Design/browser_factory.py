@@ -0,0 +1,314 @@
+"""
+Browser Factory
+===============
+One browser per worker process, a fresh context for every test.
+
+Launching Chromium costs 1-2 seconds. A BrowserContext costs a few
+milliseconds and is just as isolated (own cookies, storage, cache),
+so we launch the browser once and hand out contexts from a small
+pre-warmed pool.
+
+Usage in a conftest.py:
+
+    from browser_factory import browser_factory, browser_context, page
+"""
+
+import atexit
+import os
+from contextlib import contextmanager
+
+import pytest
+
+from api_replay import replay
+from asset_cache import shared_cache
+from config_example import Config
+from failure_capture import capture
+from memory_monitor import memory
+from web_vitals import vitals
+
+
+# Config.BROWSER uses product names, Playwright uses engine names
+BROWSER_ENGINES = {
+    "chrome": "chromium",
+    "chromium": "chromium",
+    "firefox": "firefox",
+    "safari": "webkit",
+    "webkit": "webkit",
+}
+
+
+# Context settings reset() can't undo. The ones setup_context makes
+# (routes, init scripts) are made before the context is pooled; a test
+# calling any of these makes its context single use.
+STICKY_SETTINGS = (
+    "route", "route_from_har", "route_web_socket", "unroute", "unroute_all",
+    "set_extra_http_headers", "set_geolocation", "set_offline",
+    "add_init_script", "expose_binding", "expose_function",
+)
+
+
+class PooledContext:
+    """A context plus how many tests have used it."""
+
+    def __init__(self, context):
+        self.context = context
+        self.uses = 0
+        self.crashed = False
+        self.too_big = False  # Set by memory_monitor
+        self.changed = False  # A test changed a sticky setting
+        context.on("page", self._watch_page)
+        for name in STICKY_SETTINGS:
+            self._track(name)
+
+    def _watch_page(self, page):
+        page.on("crash", lambda _: setattr(self, "crashed", True))
+
+    def _track(self, name):
+        original = getattr(self.context, name)
+
+        def changed(*args, **kwargs):
+            self.changed = True
+            return original(*args, **kwargs)
+        setattr(self.context, name, changed)
+
+    def reset(self):
+        """
+        Clean up after a test so the next one starts fresh.
+        Returns False if the context can't be safely reused.
+        """
+        # Closing the pages also drops their sessionStorage
+        for page in list(self.context.pages):
+            page.close()
+        self.context.clear_cookies()
+        self.context.clear_permissions()
+        if self.changed:
+            return False
+
+        # localStorage and IndexedDB can only be cleared from inside the
+        # origin, so a context that has any is not reused
+        return not self.context.storage_state(indexed_db=True)["origins"]
+
+
+class ContextPool:
+    """
+    Keeps a few contexts ready so tests don't wait for one.
+    A context is thrown away after max_uses tests, if a page crashed, if
+    it used too much memory or if the test changed its routes, headers
+    or other settings.
+    """
+
+    def __init__(self, browser, size=None, max_uses=None, setup=None, **context_options):
+        self.browser = browser
+        self.setup = setup  # Called with every new context
+        self.size = size if size is not None else Config.CONTEXT_POOL_SIZE
+        self.max_uses = max_uses if max_uses is not None else Config.CONTEXT_MAX_USES
+        self.context_options = context_options
+        self.idle = []
+        self.stats = {"created": 0, "reused": 0, "recycled": 0}
+
+    def warm_up(self):
+        """Fill the pool up to its size."""
+        while len(self.idle) < self.size:
+            self.idle.append(self._create())
+
+    def _create(self):
+        self.stats["created"] += 1
+        context = self.browser.new_context(**self.context_options)
+        context.set_default_timeout(Config.DEFAULT_TIMEOUT)
+        if self.setup:
+            self.setup(context)
+        return PooledContext(context)
+
+    def acquire(self):
+        """Get a clean context for one test."""
+        if self.idle:
+            pooled = self.idle.pop()
+            if pooled.uses:
+                self.stats["reused"] += 1
+        else:
+            pooled = self._create()
+        pooled.uses += 1
+        return pooled
+
+    def release(self, pooled):
+        """Give a context back after the test."""
+        try:
+            reusable = (
+                not pooled.crashed
+                and not pooled.too_big
+                and pooled.uses < self.max_uses
+                and pooled.reset()
+            )
+        except Exception:
+            # Context died under us (browser crash etc.)
+            reusable = False
+
+        if reusable:
+            self.idle.append(pooled)
+        else:
+            self.stats["recycled"] += 1
+            self._close(pooled)
+            self.warm_up()
+
+    def close(self):
+        """Close every idle context."""
+        while self.idle:
+            self._close(self.idle.pop())
+
+    @staticmethod
+    def _close(pooled):
+        try:
+            pooled.context.close()
+        except Exception:
+            pass  # Already gone
+
+
+class BrowserFactory:
+    """
+    Owns the Playwright driver and the browser for one worker process.
+    """
+
+    def __init__(self, browser_name=None, headless=None, pool_size=None, max_uses=None, asset_cache=None):
+        self.browser_name = BROWSER_ENGINES[(browser_name or Config.BROWSER).lower()]
+        self.headless = Config.HEADLESS if headless is None else headless
+        self.pool_size = pool_size
+        self.max_uses = max_uses
+        self.asset_cache = asset_cache
+        if asset_cache is None and Config.ASSET_CACHE:
+            self.asset_cache = shared_cache()
+        self.playwright = None
+        self.browser = None
+        self.pool = None
+        self.other_browsers = {}  # engine -> browser, for device_matrix
+
+    def start(self):
+        """Launch the browser and pre-warm the context pool."""
+        if self.browser:
+            return self
+        from playwright.sync_api import sync_playwright  # Only runs that open a browser pay for this
+
+        self.playwright = sync_playwright().start()
+        self._launch()
+        memory.restart_browser = self.restart_browser
+        return self
+
+    def _launch(self):
+        engine = getattr(self.playwright, self.browser_name)
+        args = ["--enable-precise-memory-info"] if memory.enabled and self.browser_name == "chromium" else []
+        self.browser = engine.launch(headless=self.headless, args=args)
+        self.pool = ContextPool(self.browser, self.pool_size, self.max_uses, self.setup_context)
+        self.pool.warm_up()
+
+    def restart_browser(self):
+        """Relaunch after the browser crashed or got too big (memory_monitor)."""
+        self.pool.close()
+        try:
+            self.browser.close()
+        except Exception:
+            pass
+        self._launch()
+
+    @contextmanager
+    def context(self):
+        """Borrow a pooled context for the duration of a with-block."""
+        if self.browser is None:  # Stopped
+            self.start()
+        elif not self.browser.is_connected():
+            self.restart_browser()
+        pooled = self.pool.acquire()
+        memory.use(pooled.context)
+        try:
+            yield pooled.context
+        finally:
+            pooled.too_big = memory.sample(pooled.context)
+            self.pool.release(pooled)
+
+    def setup_context(self, context):
+        """Opt-in extras for every context this factory makes."""
+        if self.asset_cache:
+            self.asset_cache.install(context)
+        vitals.install(context)
+        capture.install(context)
+        memory.install(context)
+        # Registered last so it runs first; non-/api/ requests never reach it
+        replay.install(context)
+
+    def browser_for(self, engine):
+        """This worker's browser for a Playwright engine, launched on first use."""
+        if engine == self.browser_name:
+            return self.browser
+        if engine not in self.other_browsers:
+            self.other_browsers[engine] = getattr(self.playwright, engine).launch(headless=self.headless)
+        return self.other_browsers[engine]
+
+    def new_context(self, engine=None, **options):
+        """Unpooled context for tests that need special options (or another engine)."""
+        context = self.browser_for(engine or self.browser_name).new_context(**options)
+        self.setup_context(context)
+        memory.use(context)
+        return context
+
+    def stop(self):
+        """Close everything. Safe to call twice."""
+        if self.asset_cache:
+            self.asset_cache.save()
+        if memory.restart_browser == self.restart_browser:
+            memory.restart_browser = None
+        if self.pool:
+            self.pool.close()
+        while self.other_browsers:
+            try:
+                self.other_browsers.popitem()[1].close()
+            except Exception:
+                pass
+        if self.browser:
+            self.browser.close()
+            self.browser = None
+        if self.playwright:
+            self.playwright.stop()
+            self.playwright = None
+
+
+# One factory per worker process (pytest-xdist runs one process per worker)
+_factory = None
+_factory_pid = None
+
+
+def get_factory():
+    """Return this process's factory, starting it on first use."""
+    global _factory, _factory_pid
+    if _factory is None or _factory.browser is None or _factory_pid != os.getpid():
+        _factory = BrowserFactory().start()
+        _factory_pid = os.getpid()
+    return _factory
+
+
+@atexit.register
+def _stop_factory():
+    """Whichever factory is current at exit (registered once, not per restart)."""
+    if _factory is not None and _factory_pid == os.getpid():
+        _factory.stop()
+
+
+# Pytest fixtures
+# ===============
+
+@pytest.fixture(scope="session")
+def browser_factory():
+    """Shared browser for the whole worker session."""
+    factory = get_factory()
+    yield factory
+    factory.stop()
+
+
+@pytest.fixture
+def browser_context(browser_factory):
+    """Isolated context for one test."""
+    with browser_factory.context() as context:
+        yield context
+
+
+@pytest.fixture
+def page(browser_context):
+    """New page in the test's own context."""
+    return browser_context.new_page()
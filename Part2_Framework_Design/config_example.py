@@ -6,6 +6,30 @@ Shows how config would work in the framework.
 
 import os
 
+# Where local_server.py listens by default
+LOCAL_URL = "http://127.0.0.1:8000"
+
+# Set WORKFLOWPRO_URL to point every tenant at one server (e.g. LOCAL_URL)
+
+
+class lazy:
+    """
+    Class attribute built on first use, then stored on the class.
+    Env vars behind it are read when a test needs them, not at import.
+    """
+
+    def __init__(self, build):
+        self.build = build
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        value = self.build()
+        setattr(owner, self.name, value)
+        return value
+
+
 class Config:
     """Main configuration class"""
     
@@ -22,8 +46,84 @@ class Config:
     DEFAULT_TIMEOUT = 10000
     SLOW_TIMEOUT = 30000  # For large data loads
     
+    # Past durations (see result_store.py): baselines, slowdowns, derived timeouts
+    RESULTS_DB = os.getenv("RESULTS_DB", ".test_results.sqlite")
+    BASELINE_RUNS = int(os.getenv("BASELINE_RUNS", "20"))
+    DERIVED_TIMEOUTS = os.getenv("DERIVED_TIMEOUTS", "false").lower() == "true"
+    DERIVED_TIMEOUT_MIN = int(os.getenv("DERIVED_TIMEOUT_MIN", "2000"))
+    DERIVED_TIMEOUT_MAX = int(os.getenv("DERIVED_TIMEOUT_MAX", "60000"))
+    
+    # Test selection from git diffs (see dependency_index.py)
+    TEST_INDEX_DIR = os.getenv("TEST_INDEX_DIR", ".test_index")
+    SELECT_SAFETY_SAMPLE = float(os.getenv("SELECT_SAFETY_SAMPLE", "0.1"))  # Share of unaffected tests run anyway
+    
+    # Also wait for networkidle to measure what readiness checks save (slower)
+    READINESS_CALIBRATE = os.getenv("READINESS_CALIBRATE", "false").lower() == "true"
+    
     # Parallel execution
     PARALLEL_WORKERS = int(os.getenv("WORKERS", "4"))
+    DURATIONS_FILE = os.getenv("DURATIONS_FILE", ".test_durations.json")  # Used by scheduler.py
+    
+    # Browser reuse (see browser_factory.py)
+    CONTEXT_POOL_SIZE = int(os.getenv("CONTEXT_POOL_SIZE", "2"))  # Pre-warmed contexts
+    CONTEXT_MAX_USES = int(os.getenv("CONTEXT_MAX_USES", "20"))   # Tests per context before recycling
+    
+    # Browser memory (see memory_monitor.py): sampled after every test
+    MEMORY_SAMPLING = os.getenv("MEMORY_SAMPLING", "true").lower() == "true"
+    CONTEXT_MAX_HEAP_MB = int(os.getenv("CONTEXT_MAX_HEAP_MB", "300"))   # JS heap before a context is recycled
+    BROWSER_MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", "2000"))    # Renderers before the browser restarts
+    MEMORY_LEAK_MB = int(os.getenv("MEMORY_LEAK_MB", "50"))              # Kept after a test = possible leak
+    MEMORY_DIR = os.getenv("MEMORY_DIR", "reports/memory")
+    
+    # Static asset cache (see asset_cache.py) - off by default
+    ASSET_CACHE = os.getenv("ASSET_CACHE", "false").lower() == "true"
+    ASSET_CACHE_DIR = os.getenv("ASSET_CACHE_DIR", ".asset_cache")
+    ASSET_CACHE_MAX_MB = int(os.getenv("ASSET_CACHE_MAX_MB", "200"))
+    
+    # Saved logins (see login_cache.py)
+    AUTH_STATE_DIR = os.getenv("AUTH_STATE_DIR", ".auth")
+    LOGIN_STATE_TTL = int(os.getenv("LOGIN_STATE_TTL", "1800"))  # Seconds before logging in again
+    TWO_FA_CODE = os.getenv("TWO_FA_CODE", "123456")
+    
+    # API client (see api_helper.py)
+    API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))   # Open connections per tenant
+    API_RETRIES = int(os.getenv("API_RETRIES", "3"))
+    API_BACKOFF = float(os.getenv("API_BACKOFF", "0.2"))    # Seconds, doubles each retry
+    API_TIMEOUT = 10000
+    
+    # Bulk test data (see seeding.py)
+    SEED_BATCH_SIZE = int(os.getenv("SEED_BATCH_SIZE", "50"))
+    SEED_JOURNAL_DIR = os.getenv("SEED_JOURNAL_DIR", ".seed_journal")
+
+    # Browser /api/ traffic (see api_replay.py): off, record or replay
+    API_REPLAY = os.getenv("API_REPLAY", "off")
+    API_ARCHIVE_DIR = os.getenv("API_ARCHIVE_DIR", "api_archives")
+
+    # Page performance budgets (see web_vitals.py)
+    WEB_VITALS = os.getenv("WEB_VITALS", "false").lower() == "true"
+    PERF_BUDGETS_ENFORCE = os.getenv("PERF_BUDGETS_ENFORCE", "true").lower() == "true"
+    PERF_BUDGETS_FILE = os.getenv("PERF_BUDGETS_FILE")  # JSON overrides, optional
+    PERF_HISTORY_FILE = os.getenv("PERF_HISTORY_FILE", ".perf_history.jsonl")
+
+    # API -> UI sync waits (see consistency.py)
+    SYNC_TIMEOUT = int(os.getenv("SYNC_TIMEOUT", "10000"))
+    SYNC_METRICS_FILE = os.getenv("SYNC_METRICS_FILE", ".sync_latency.jsonl")
+
+    # Async engine (see async_base.py): contexts open at once per worker
+    ASYNC_CONCURRENCY = int(os.getenv("ASYNC_CONCURRENCY", "20"))
+
+    # Device matrix (see device_matrix.py): local or browserstack
+    DEVICE_BACKEND = os.getenv("DEVICE_BACKEND", "local")
+
+    # Step timing report (see tracing.py)
+    TRACE = os.getenv("TRACE", "false").lower() == "true"
+    TRACE_DIR = os.getenv("TRACE_DIR", "reports/trace")
+    
+    # Evidence for failing tests only (see failure_capture.py)
+    FAILURE_CAPTURE = os.getenv("FAILURE_CAPTURE", "true").lower() == "true"
+    CAPTURE_BUFFER_SIZE = int(os.getenv("CAPTURE_BUFFER_SIZE", "500"))  # Events per context
+    CAPTURE_DOM_MAX_KB = int(os.getenv("CAPTURE_DOM_MAX_KB", "512"))
+    CAPTURE_DIR = os.getenv("CAPTURE_DIR", "reports/failures")
 
 
 class Environments:
@@ -41,6 +141,11 @@ class Environments:
         "prod": {
             "web_url": "https://workflowpro.com",
             "api_url": "https://api.workflowpro.com"
+        },
+        # local_server.py - runs offline, same pages and API
+        "local": {
+            "web_url": LOCAL_URL,
+            "api_url": LOCAL_URL
         }
     }
     
@@ -53,44 +158,48 @@ class Environments:
 class Tenants:
     """Settings for different companies"""
     
-    TENANTS = {
-        "company1": {
-            "subdomain": "company1",
-            "url": "https://company1.workflowpro.com",
-            "users": {
-                "admin": {
-                    "email": "admin@company1.com",
-                    "password": os.getenv("COMPANY1_ADMIN_PASS", "password123")
-                },
-                "manager": {
-                    "email": "manager@company1.com",
-                    "password": os.getenv("COMPANY1_MANAGER_PASS", "password123")
-                },
-                "employee": {
-                    "email": "employee@company1.com",
-                    "password": os.getenv("COMPANY1_EMP_PASS", "password123")
+    @lazy
+    def TENANTS():
+        return {
+            "company1": {
+                "subdomain": "company1",
+                "url": os.getenv("WORKFLOWPRO_URL", "https://company1.workflowpro.com"),
+                "api_token": os.getenv("COMPANY1_API_TOKEN", "test_token_company1"),
+                "users": {
+                    "admin": {
+                        "email": "admin@company1.com",
+                        "password": os.getenv("COMPANY1_ADMIN_PASS", "password123")
+                    },
+                    "manager": {
+                        "email": "manager@company1.com",
+                        "password": os.getenv("COMPANY1_MANAGER_PASS", "password123")
+                    },
+                    "employee": {
+                        "email": "employee@company1.com",
+                        "password": os.getenv("COMPANY1_EMP_PASS", "password123")
+                    }
                 }
-            }
-        },
-        "company2": {
-            "subdomain": "company2",
-            "url": "https://company2.workflowpro.com",
-            "users": {
-                "admin": {
-                    "email": "admin@company2.com",
-                    "password": os.getenv("COMPANY2_ADMIN_PASS", "password123")
-                },
-                "manager": {
-                    "email": "manager@company2.com",
-                    "password": os.getenv("COMPANY2_MANAGER_PASS", "password123")
-                },
-                "employee": {
-                    "email": "employee@company2.com",
-                    "password": os.getenv("COMPANY2_EMP_PASS", "password123")
+            },
+            "company2": {
+                "subdomain": "company2",
+                "url": os.getenv("WORKFLOWPRO_URL", "https://company2.workflowpro.com"),
+                "api_token": os.getenv("COMPANY2_API_TOKEN", "test_token_company2"),
+                "users": {
+                    "admin": {
+                        "email": "admin@company2.com",
+                        "password": os.getenv("COMPANY2_ADMIN_PASS", "password123")
+                    },
+                    "manager": {
+                        "email": "manager@company2.com",
+                        "password": os.getenv("COMPANY2_MANAGER_PASS", "password123")
+                    },
+                    "employee": {
+                        "email": "employee@company2.com",
+                        "password": os.getenv("COMPANY2_EMP_PASS", "password123")
+                    }
                 }
             }
         }
-    }
     
     @staticmethod
     def get_user(tenant, role):
@@ -102,8 +211,8 @@ class BrowserStackConfig:
     """Settings for BrowserStack (mobile testing)"""
     
     # Login info (from environment variables)
-    USERNAME = os.getenv("BROWSERSTACK_USERNAME")
-    ACCESS_KEY = os.getenv("BROWSERSTACK_ACCESS_KEY")
+    USERNAME = lazy(lambda: os.getenv("BROWSERSTACK_USERNAME"))
+    ACCESS_KEY = lazy(lambda: os.getenv("BROWSERSTACK_ACCESS_KEY"))
     
     # Desktop browsers
     DESKTOP_BROWSERS = [
@@ -0,0 +1,9 @@
+"""
+Shared fixtures for Part 2 (TestLogin in base_test_example.py).
+"""
+
+from plugins import register_plugins
+
+
+def pytest_configure(config):
+    register_plugins(config)
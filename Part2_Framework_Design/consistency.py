@@ -0,0 +1,163 @@
+"""
+Eventual Consistency
+====================
+Wait until something written through the API is visible, by polling the
+API (cheap) instead of reloading the UI (expensive).
+
+    created = time.monotonic()
+    project = api.create_project(...)
+    wait_until_consistent(project_listed(api, project["id"]), "company1", started=created)
+    projects_page.open(...)  # Only now touch the UI
+
+project_listed() polls the list query the projects page renders from,
+so the latency is write -> visible in the list. project_visible() polls
+GET /projects/{id}, which can be ready sooner than the list.
+
+Polls back off exponentially. The first poll is delayed by about half
+the tenant's usual sync time, so we don't poll while it can't be there
+yet.
+
+Every wait is recorded per tenant (write -> visible, in ms). The end of
+the run prints a histogram, and the samples are appended to
+Config.SYNC_METRICS_FILE so propagation delay can be tracked over time.
+"""
+
+import json
+import statistics
+import time
+
+import requests
+
+from config_example import Config
+
+
+# Histogram bucket upper bounds (ms)
+BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class SyncTimeout(AssertionError):
+    """Still not visible through the API after the timeout."""
+
+
+class SyncLatency:
+    """Write-to-visible latency samples per tenant."""
+
+    def __init__(self):
+        self.samples = {}  # tenant -> [ms]
+        self.timeouts = {}  # tenant -> count
+
+    def record(self, tenant, ms):
+        self.samples.setdefault(tenant, []).append(ms)
+
+    def record_timeout(self, tenant):
+        self.timeouts[tenant] = self.timeouts.get(tenant, 0) + 1
+
+    def median(self, tenant):
+        samples = self.samples.get(tenant)
+        return statistics.median(samples) if samples else None
+
+    def histogram(self, tenant):
+        """[(label, count)] using BUCKETS_MS."""
+        counts = [0] * (len(BUCKETS_MS) + 1)
+        for ms in self.samples.get(tenant, []):
+            index = next((i for i, bound in enumerate(BUCKETS_MS) if ms <= bound), len(BUCKETS_MS))
+            counts[index] += 1
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return list(zip(labels, counts))
+
+    def save(self, path=None):
+        """Append this run's samples as JSON lines."""
+        with open(path or Config.SYNC_METRICS_FILE, "a") as out:
+            for tenant in set(self.samples) | set(self.timeouts):
+                out.write(json.dumps({
+                    "time": time.time(),
+                    "tenant": tenant,
+                    "samples_ms": [round(ms, 1) for ms in self.samples.get(tenant, [])],
+                    "timeouts": self.timeouts.get(tenant, 0),
+                }) + "\n")
+
+
+latency = SyncLatency()
+
+
+def wait_until_consistent(check, tenant, started=None, timeout=None, max_delay=1.0):
+    """
+    Call check() until it returns something truthy, and return that.
+
+    started: time.monotonic() of the write, so latency is measured from
+    the write and not from when we started waiting.
+    """
+    started = started or time.monotonic()
+    timeout = (timeout or Config.SYNC_TIMEOUT) / 1000
+    deadline = started + timeout
+
+    # Adaptive start: first poll at about half the tenant's usual sync time
+    usual_ms = latency.median(tenant)
+    if usual_ms is not None:
+        time.sleep(max(0.0, min(started + usual_ms / 2000, deadline) - time.monotonic()))
+
+    delay = 0.05
+    polls = 0
+    while True:
+        result = check()
+        polls += 1
+        if result:
+            latency.record(tenant, (time.monotonic() - started) * 1000)
+            return result
+
+        now = time.monotonic()
+        if now >= deadline:
+            latency.record_timeout(tenant)
+            raise SyncTimeout(f"Not visible for {tenant} after {timeout * 1000:.0f} ms ({polls} polls)")
+        time.sleep(min(delay, deadline - now))
+        delay = min(delay * 2, max_delay)
+
+
+def project_visible(api, project_id):
+    """check() for wait_until_consistent: the project, or None while it 404s."""
+    def check():
+        try:
+            return api.get_project(project_id)
+        except requests.HTTPError as error:
+            if error.response is not None and error.response.status_code == 404:
+                return None
+            raise
+    return check
+
+
+def project_listed(api, project_id, page_size=100):
+    """
+    check() for wait_until_consistent: the project once the projects list
+    returns it, else None. Reads the first page (what the page renders
+    first) and, if there are more, the last one (newest projects).
+    """
+    def check():
+        page = api.list_projects(0, page_size)
+        pages = [page]
+        if page["total"] > page_size:
+            pages.append(api.list_projects(page["total"] - page_size, page_size))
+        return next((item for p in pages for item in p["items"] if item["id"] == project_id), None)
+    return check
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+def pytest_sessionfinish(session):
+    if latency.samples or latency.timeouts:
+        latency.save()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not latency.samples and not latency.timeouts:
+        return
+    terminalreporter.section("API -> UI sync latency")
+    for tenant in sorted(set(latency.samples) | set(latency.timeouts)):
+        samples = latency.samples.get(tenant, [])
+        line = f"{tenant}: {len(samples)} waits, {latency.timeouts.get(tenant, 0)} timed out"
+        if samples:
+            line += f", median {latency.median(tenant):.0f} ms, max {max(samples):.0f} ms"
+        terminalreporter.write_line(line)
+        for label, count in latency.histogram(tenant):
+            if count:
+                terminalreporter.write_line(f"  {label:>10} {'#' * min(count, 50)} {count}")
@@ -0,0 +1,34 @@
+"""
+Dashboard Page Object
+=====================
+The page users land on after login.
+"""
+
+from base_test_example import BasePage
+from readiness import Ready
+
+
+class DashboardPage(BasePage):
+    """Dashboard page."""
+
+    # The welcome message is the last thing rendered for a logged-in user
+    READY = Ready.selector(".welcome-message")
+
+    def __init__(self, page):
+        super().__init__(page)
+        # Locators
+        self.welcome_message = ".welcome-message"
+        self.projects_link = "a[href='/projects']"
+        self.user_menu = "#user-menu"
+        self.logout_btn = "#logout-btn"
+        self.mobile_menu = ".mobile-menu"
+
+    def open(self, base_url):
+        """Go straight to /dashboard"""
+        self.goto(f"{base_url}/dashboard")
+
+    def logout(self):
+        """Open the user menu and log out"""
+        self.click(self.user_menu)
+        self.click(self.logout_btn)
+        self.wait_for_url("**/login")
@@ -0,0 +1,406 @@
+"""
+Dependency Index
+================
+Remembers what each test touched, so a change only reruns the tests
+that depend on it.
+
+Recorded while tests run (cheap: a set add per call):
+- selector:#email        BasePage.locator() / AsyncBasePage.locator()
+- class:LoginPage        page object classes (and their bases) used
+- endpoint:GET /api/v1/projects/{id}   APIHelper / AsyncAPIHelper calls
+- config:Tenants.company1              the test's tenants (tenant marker)
+- config:Environments.staging          the ENV the test ran against
+
+Anything touched while a fixture is set up is also stored for that
+fixture. Logins (login_cache.py) and precondition states (state_graph.py)
+are built once and restored after that, so what building one touched is
+stored under the snapshot's name and added to every test that restores
+it: a test on a cached login still depends on LoginPage. A test that
+restores a snapshot the index has no facts for isn't recorded, so it
+counts as new and runs next time.
+Each worker writes Config.TEST_INDEX_DIR/<worker>.json; the newest
+entry for a test wins when they're merged.
+
+Selection:
+    SELECT_CHANGED_SINCE=origin/main pytest ...
+
+reads `git diff <ref>` and keeps only:
+- tests whose facts match a changed line: a selector or endpoint string
+  on the line, the page object / helper class around it, or the
+  tenant / environment block in config_example.py
+- tests in changed test files (conftest.py: its whole folder)
+- tests the index hasn't seen yet
+- a SELECT_SAFETY_SAMPLE share of the rest, picked per test from the
+  ref's commit, so a rerun (and every worker) picks the same ones
+
+A change the index can't attribute (Config, Tenants.get_user,
+readiness.py, plugins...) runs everything.
+"""
+
+import ast
+import json
+import os
+import random
+import re
+import subprocess
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from config_example import Config
+from scheduler import tenants_for
+
+
+# Changes to these never affect a test
+IGNORED_SUFFIXES = (".md", ".txt", ".gitignore")
+
+# Test data next to the tests
+DATA_SUFFIXES = (".json",)
+
+
+class DependencyIndex:
+    """Facts touched by the running test (and fixture), plus the saved index."""
+
+    def __init__(self, index_dir=None):
+        self.dir = Path(index_dir or Config.TEST_INDEX_DIR)
+        self.current = None  # Facts of the running test
+        self.fixtures = []  # Facts of the fixtures being set up (innermost last)
+        self.tests = {}  # nodeid -> {"time", "facts", "fixtures"} for this run
+        self.fixture_facts = {}  # fixture name -> facts, this run
+        self.ran = False  # Whether the running test got to its call phase
+        self.building = []  # Facts of the snapshots being built (innermost last)
+        self.builds = {}  # snapshot name -> facts, this run
+        self.saved_builds = None  # From earlier runs, read on first reuse()
+        self.unknown_build = False  # The running test restored a snapshot we have no facts for
+        self._class_names = {}  # class -> names of it and its bases
+
+    # Recording
+
+    def touch(self, *facts):
+        if self.current is None:
+            return
+        self.current.update(facts)
+        if self.fixtures:
+            self.fixtures[-1].update(facts)
+        for build in self.building:
+            build.update(facts)
+
+    @contextmanager
+    def built(self, name):
+        """Remember what building a reusable snapshot (login, state) touched."""
+        facts = set()
+        self.building.append(facts)
+        try:
+            yield
+        finally:
+            self.building.pop()
+        self.builds[name] = facts
+
+    def reuse(self, name):
+        """A snapshot was restored: the test depends on what built it."""
+        if self.current is None:
+            return
+        facts = self.builds.get(name)
+        if facts is None:
+            if self.saved_builds is None:
+                self.saved_builds = self.load_builds()
+            facts = self.saved_builds.get(name)
+        if facts is None:
+            self.unknown_build = True
+            return
+        self.touch(*facts)
+
+    def touch_selector(self, page_object, selector):
+        cls = type(page_object)
+        names = self._class_names.get(cls)
+        if names is None:
+            names = self._class_names[cls] = [f"class:{c.__name__}" for c in cls.__mro__[:-1]]
+        self.touch(f"selector:{selector}", *names)
+
+    # Saved index
+
+    def save(self, worker=None):
+        if not self.tests:
+            return
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.dir / f"{worker or os.getenv('WORKER_ID', 'main')}.json"
+        saved = read_index_file(path)
+        saved["tests"].update({
+            nodeid: {"time": entry["time"], "facts": sorted(entry["facts"]), "fixtures": entry["fixtures"]}
+            for nodeid, entry in self.tests.items()
+        })
+        saved["fixtures"].update({name: sorted(facts) for name, facts in self.fixture_facts.items()})
+        saved.setdefault("builds", {}).update({name: sorted(facts) for name, facts in self.builds.items()})
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(saved))
+        os.replace(tmp, path)
+
+    def load(self):
+        """{nodeid: set of facts} over all workers, fixtures included."""
+        tests, fixtures = {}, {}
+        for path in sorted(self.dir.glob("*.json")) if self.dir.exists() else []:
+            saved = read_index_file(path)
+            fixtures.update(saved["fixtures"])
+            for nodeid, entry in saved["tests"].items():
+                if nodeid not in tests or entry["time"] > tests[nodeid]["time"]:
+                    tests[nodeid] = entry
+        return {
+            nodeid: set(entry["facts"]).union(*(fixtures.get(name, []) for name in entry["fixtures"]))
+            for nodeid, entry in tests.items()
+        }
+
+    def load_builds(self):
+        """{snapshot name: set of facts} over all workers."""
+        builds = {}
+        for path in sorted(self.dir.glob("*.json")) if self.dir.exists() else []:
+            for name, facts in read_index_file(path).get("builds", {}).items():
+                builds.setdefault(name, set()).update(facts)
+        return builds
+
+
+def read_index_file(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (FileNotFoundError, ValueError):
+        return {"tests": {}, "fixtures": {}}
+
+
+index = DependencyIndex()
+
+
+# Git diff -> changed facts
+# =========================
+
+def changed_lines(diff_text):
+    """[(path, side, line number, text)] from `git diff -U0`; side is + or -."""
+    changes = []
+    old_path = new_path = None
+    old_line = new_line = 0
+    for line in diff_text.splitlines():
+        if line.startswith("--- "):
+            old_path = None if line == "--- /dev/null" else line[6:]
+        elif line.startswith("+++ "):
+            new_path = None if line == "+++ /dev/null" else line[6:]
+        elif line.startswith("@@"):
+            match = re.match(r"@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@", line)
+            old_line, new_line = int(match.group(1)), int(match.group(2))
+        elif line.startswith("-"):
+            changes.append((old_path, "-", old_line, line[1:]))
+            old_line += 1
+        elif line.startswith("+"):
+            changes.append((new_path, "+", new_line, line[1:]))
+            new_line += 1
+    return changes
+
+
+def enclosing(lines, number):
+    """
+    (class name, tenant/environment key) around 1-based line number.
+    The key is the top-level dict key whose entry contains the line, so
+    a method after the dict (Tenants.get_user) has none. (None, None)
+    outside classes or if the file doesn't parse.
+    """
+    try:
+        tree = ast.parse("\n".join(lines))
+    except SyntaxError:
+        return None, None
+    cls = None
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and node.lineno <= number <= node.end_lineno:
+            cls = node  # Walked outside-in, so the innermost class wins
+    if cls is None:
+        return None, None
+    for node in ast.walk(cls):  # Breadth first: the outermost dict comes first
+        if isinstance(node, ast.Dict):
+            for key, value in zip(node.keys, node.values):
+                if (isinstance(key, ast.Constant) and isinstance(key.value, str)
+                        and key.lineno <= number <= value.end_lineno):
+                    return cls.name, key.value
+    return cls.name, None
+
+
+def affected(changes, known_facts, read_lines, test_files=()):
+    """
+    What the changes touch:
+    (facts, test files, test folders, reason to run everything or None).
+    read_lines(path, side) -> the file's lines on that side of the diff.
+    test_files: paths of the collected test modules.
+    """
+    selectors = {fact[len("selector:"):] for fact in known_facts if fact.startswith("selector:")}
+    endpoints = {fact for fact in known_facts if fact.startswith("endpoint:")}
+    facts, files, folders = set(), set(), set()
+
+    for path, side, number, text in changes:
+        if path is None or path.endswith(IGNORED_SUFFIXES):
+            continue
+        name = Path(path).name
+        if name == "conftest.py" or path.endswith(DATA_SUFFIXES):
+            folders.add(str(Path(path).parent))
+            continue
+        if path in test_files:
+            files.add(path)
+            continue
+        if not path.endswith(".py"):
+            return facts, files, folders, f"{path} changed"
+
+        cls, key = enclosing(read_lines(path, side), number)
+        if name == "config_example.py":
+            if cls in ("Tenants", "Environments") and key:
+                facts.add(f"config:{cls}.{key}")
+                continue
+            return facts, files, folders, f"{path}:{number} ({cls or 'module'}) changed"
+
+        strings = set(re.findall(r"""["']([^"']+)["']""", text))
+        hits = {f"selector:{s}" for s in strings & selectors}
+        paths = {re.sub(r"\{[^}]*\}", "{id}", s[s.index("/api/"):]) for s in strings if "/api/" in s}
+        hits |= {e for e in endpoints for p in paths if p in e}
+        if not hits and f"class:{cls}" in known_facts:
+            hits = {f"class:{cls}"}
+        if not hits:
+            return facts, files, folders, f"{path}:{number} ({cls or 'module'}) changed"
+        facts |= hits
+    return facts, files, folders, None
+
+
+def git_changes(ref):
+    """changed_lines() of the working tree against ref, and a file reader."""
+    root = Path(subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True, check=True,
+    ).stdout.strip())
+    diff = subprocess.run(
+        ["git", "diff", "-U0", "--no-color", ref], capture_output=True, text=True, check=True, cwd=root,
+    ).stdout
+
+    def read_lines(path, side):
+        if side == "+":
+            return (root / path).read_text().splitlines()
+        return subprocess.run(
+            ["git", "show", f"{ref}:{path}"], capture_output=True, text=True, cwd=root,
+        ).stdout.splitlines()
+
+    commit = subprocess.run(
+        ["git", "rev-parse", ref], capture_output=True, text=True, check=True, cwd=root,
+    ).stdout.strip()
+    return root, commit, changed_lines(diff), read_lines
+
+
+def sampled(nodeid, seed, share):
+    """Whether a test is in the safety sample. Depends only on the test and
+    the seed, so every worker (and the scheduler's planning run) agrees."""
+    return random.Random(f"{seed} {nodeid}").random() < share
+
+
+def relative(path, root):
+    try:
+        return str(Path(path).resolve().relative_to(root))
+    except ValueError:
+        return None
+
+
+def select(items, ref, sample=None):
+    """
+    Split items into (selected, deselected, summary dict).
+    The safety sample is seeded from ref's commit, so the same ref picks
+    the same tests.
+    """
+    sample = Config.SELECT_SAFETY_SAMPLE if sample is None else sample
+    root, commit, changes, read_lines = git_changes(ref)
+    saved = index.load()
+    known = set().union(*saved.values()) if saved else set()
+    paths = {item: relative(item.path, root) for item in items}
+    facts, files, folders, everything = affected(changes, known, read_lines, set(paths.values()))
+
+    summary = {"ref": ref, "changes": len(changes), "everything": everything,
+               "affected": 0, "new": 0, "sampled": 0}
+    if everything:
+        return list(items), [], summary
+
+    selected, rest = [], []
+    for item in items:
+        path = paths[item]
+        if item.nodeid not in saved:
+            summary["new"] += 1
+            selected.append(item)
+        elif saved[item.nodeid] & facts or path in files or (path and str(Path(path).parent) in folders):
+            summary["affected"] += 1
+            selected.append(item)
+        else:
+            rest.append(item)
+
+    deselected = []
+    for item in rest:
+        if sampled(item.nodeid, commit, sample):
+            summary["sampled"] += 1
+            selected.append(item)
+        else:
+            deselected.append(item)
+    keep = set(map(id, selected))
+    return [item for item in items if id(item) in keep], deselected, summary
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+_selection = None  # select()'s summary, for the terminal report
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    index.current = {f"config:Tenants.{tenant}" for tenant in tenants_for(item)}
+    index.current.add(f"config:Environments.{Config.ENV}")
+    index.ran = False
+    index.unknown_build = False
+    yield
+    # Skipped in setup: nothing worth remembering. Restored an unknown
+    # snapshot: the facts are incomplete
+    if index.ran and not index.unknown_build:
+        index.tests[item.nodeid] = {"time": time.time(), "facts": index.current,
+                                    "fixtures": list(item.fixturenames)}
+    index.current = None
+
+
+def pytest_runtest_logreport(report):
+    if report.when == "call":
+        index.ran = True
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef):
+    facts = index.fixture_facts.setdefault(fixturedef.argname, set())
+    index.fixtures.append(facts)
+    try:
+        yield
+    finally:
+        index.fixtures.pop()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    global _selection
+    ref = os.getenv("SELECT_CHANGED_SINCE")
+    if not ref:
+        return
+    selected, deselected, _selection = select(items, ref)
+    if deselected:
+        items[:] = selected
+        config.hook.pytest_deselected(items=deselected)
+
+
+def pytest_sessionfinish(session):
+    index.save()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _selection:
+        return
+    s = _selection
+    terminalreporter.section(f"test selection (changes since {s['ref']})")
+    if s["everything"]:
+        terminalreporter.write_line(f"Running everything: {s['everything']}")
+    else:
+        terminalreporter.write_line(
+            f"{s['changes']} changed lines -> {s['affected']} affected tests, "
+            f"{s['new']} not in the index yet, {s['sampled']} safety sample"
+        )
@@ -0,0 +1,295 @@
+"""
+Device Matrix
+=============
+Runs the same page-object check on every device in BrowserStackConfig,
+side by side.
+
+Each configured device is mapped to a Playwright emulation profile
+(viewport, user agent, touch, pixel ratio). Locally every profile gets
+its own context in a browser of its engine (the factory's own browser,
+or WebKit / Firefox launched once per worker), all pages load in
+parallel, then the check runs on each:
+
+    results = device_matrix.run(ProjectsPage, f"{url}/projects", check, tenant="company1")
+    assert all_passed(results), format_report(results)
+
+check(page_object, profile) raises AssertionError on failure. Any
+error on one device (a failed check, a Playwright timeout, a device that
+won't open or load) is recorded for that device and the others are still
+checked. Timings are reported per device.
+
+Backends:
+- LocalEmulation (default) - emulated contexts in a local browser of
+  the device's engine, works offline
+- BrowserStackGrid (DEVICE_BACKEND=browserstack) - one remote browser
+  per device through BrowserStack's Playwright endpoint
+"""
+
+import json
+import time
+from urllib.parse import quote
+
+import pytest
+
+from base_test_example import navigate_all
+from config_example import BrowserStackConfig, Config
+from web_vitals import vitals
+
+
+# Devices Playwright doesn't ship a descriptor for
+FALLBACK_DEVICES = {
+    "Samsung Galaxy S22": {
+        "user_agent": (
+            "Mozilla/5.0 (Linux; Android 12; SM-S901B) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+        ),
+        "viewport": {"width": 360, "height": 780},
+        "device_scale_factor": 3,
+        "is_mobile": True,
+        "has_touch": True,
+        "default_browser_type": "chromium",
+    },
+}
+
+# Firefox can't emulate these
+FIREFOX_UNSUPPORTED = {"is_mobile"}
+
+# Kept for results reported at the end of the run
+_results = []
+
+
+class DeviceProfile:
+    """One row of the matrix: context options plus the original config."""
+
+    def __init__(self, name, options, engine, caps):
+        self.name = name
+        self.options = options  # For browser.new_context()
+        self.engine = engine  # Browser the real device would use
+        self.caps = caps  # The BrowserStackConfig entry
+
+    @property
+    def is_mobile(self):
+        return self.options.get("is_mobile", False)
+
+    def __repr__(self):
+        return f"DeviceProfile({self.name!r})"
+
+
+def descriptor(devices, name):
+    """Playwright's descriptor for name, or our fallback."""
+    found = devices.get(name) or FALLBACK_DEVICES.get(name)
+    if found is None:
+        raise KeyError(f"No emulation profile for {name!r}, add one to FALLBACK_DEVICES")
+    return dict(found)
+
+
+def device_profiles(devices, mobile=None, desktop=None):
+    """
+    Profiles for the configured matrix.
+    devices: playwright.devices (name -> descriptor)
+    """
+    mobile = BrowserStackConfig.MOBILE_DEVICES if mobile is None else mobile
+    desktop = BrowserStackConfig.DESKTOP_BROWSERS if desktop is None else desktop
+
+    profiles = []
+    for entry in mobile:
+        options = descriptor(devices, entry["device"])
+        engine = options.pop("default_browser_type")
+        profiles.append(DeviceProfile(entry["device"], options, engine, entry))
+    for entry in desktop:
+        options = descriptor(devices, f"Desktop {entry['browser']}")
+        engine = options.pop("default_browser_type")
+        name = f"{entry['browser']} on {entry['os']} {entry['os_version']}"
+        profiles.append(DeviceProfile(name, options, engine, entry))
+    return profiles
+
+
+# Backends
+# ========
+
+class LocalEmulation:
+    """Emulated contexts in a local browser of each device's engine."""
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    def open(self, profile, **context_options):
+        options = dict(profile.options, **context_options)
+        if profile.engine == "firefox":
+            options = {k: v for k, v in options.items() if k not in FIREFOX_UNSUPPORTED}
+        return self.factory.new_context(engine=profile.engine, **options)
+
+    def close(self, context):
+        context.close()
+
+
+class BrowserStackGrid:
+    """One remote browser per device (needs BROWSERSTACK_* credentials)."""
+
+    ENDPOINT = "wss://cdp.browserstack.com/playwright?caps="
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.browsers = {}  # context -> remote browser
+
+    def open(self, profile, **context_options):
+        caps = dict(
+            profile.caps,
+            **{
+                "browserstack.username": BrowserStackConfig.USERNAME,
+                "browserstack.accessKey": BrowserStackConfig.ACCESS_KEY,
+            },
+        )
+        browser = self.factory.playwright.chromium.connect(self.ENDPOINT + quote(json.dumps(caps)))
+        context = browser.new_context(**context_options)
+        self.browsers[context] = browser
+        return context
+
+    def close(self, context):
+        context.close()
+        self.browsers.pop(context).close()
+
+
+BACKENDS = {
+    "local": LocalEmulation,
+    "browserstack": BrowserStackGrid,
+}
+
+
+# Runner
+# ======
+
+class DeviceResult:
+    def __init__(self, profile):
+        self.profile = profile
+        self.error = None
+        self.timings = {}  # open_ms, load_ms, check_ms
+
+    @property
+    def passed(self):
+        return self.error is None
+
+
+class DeviceMatrix:
+    """Fans one check out over every device profile."""
+
+    def __init__(self, backend, profiles):
+        self.backend = backend
+        self.profiles = profiles
+
+    def run(self, page_class, url, check, tenant=None, **context_options):
+        """
+        Open url as page_class on every device and run check on each.
+        tenant: whose page it is (web_vitals budgets), needed when the test
+        covers several tenants. context_options (e.g. storage_state) go to
+        every context.
+        """
+        results = [DeviceResult(profile) for profile in self.profiles]
+        contexts = []
+        try:
+            opened = []  # (result, page object)
+            for result in results:
+                start = time.perf_counter()
+                try:
+                    context = self.backend.open(result.profile, **context_options)
+                    contexts.append(context)
+                    if tenant:
+                        vitals.set_tenant(context, tenant)
+                    opened.append((result, page_class(context.new_page())))
+                except Exception as error:
+                    result.error = describe(error, "open")
+                    continue
+                result.timings["open_ms"] = (time.perf_counter() - start) * 1000
+
+            for result, page_object in self._load(opened, url):
+                start = time.perf_counter()
+                try:
+                    check(page_object, result.profile)
+                except Exception as error:
+                    result.error = describe(error)
+                result.timings["check_ms"] = (time.perf_counter() - start) * 1000
+        finally:
+            for context in contexts:
+                try:
+                    self.backend.close(context)
+                except Exception:
+                    pass  # Already gone (e.g. remote browser dropped)
+
+        _results.extend(results)
+        return results
+
+    @staticmethod
+    def _load(opened, url):
+        """
+        Load url on every opened device in parallel. If that fails, load
+        them one by one so one device's timeout doesn't fail the others.
+        Returns the (result, page object) pairs that loaded.
+        """
+        def goto(page_object):
+            page_object.page.goto(url, wait_until="commit")
+
+        try:
+            load_ms = navigate_all([page_object for _, page_object in opened], goto)
+        except Exception:
+            load_ms = []
+            for result, page_object in opened:
+                start = time.perf_counter()
+                try:
+                    page_object.navigate(lambda page_object=page_object: goto(page_object))
+                except Exception as error:
+                    result.error = describe(error, "load")
+                    load_ms.append(None)
+                    continue
+                load_ms.append((time.perf_counter() - start) * 1000)
+
+        loaded = []
+        for (result, page_object), ms in zip(opened, load_ms):
+            if ms is not None:
+                result.timings["load_ms"] = ms
+                loaded.append((result, page_object))
+        return loaded
+
+
+def describe(error, stage=None):
+    """Short text for a device's error."""
+    if isinstance(error, AssertionError):
+        text = str(error) or "assertion failed"
+    else:
+        first_line = str(error).splitlines()[0] if str(error) else ""
+        text = f"{type(error).__name__}: {first_line}" if first_line else type(error).__name__
+    return f"{stage} failed - {text}" if stage else text
+
+
+def all_passed(results):
+    return all(result.passed for result in results)
+
+
+def format_report(results):
+    lines = []
+    for result in results:
+        timings = "  ".join(f"{key} {value:6.0f}" for key, value in result.timings.items())
+        status = "ok" if result.passed else f"FAILED: {result.error}"
+        name = f"{result.profile.name} ({result.profile.engine})"
+        lines.append(f"{name:<40} {timings}  {status}")
+    return "\n".join(lines)
+
+
+# Pytest fixtures
+# ===============
+
+@pytest.fixture
+def device_matrix(browser_factory):
+    """Matrix over the configured devices, on the DEVICE_BACKEND backend."""
+    backend = BACKENDS[Config.DEVICE_BACKEND](browser_factory)
+    return DeviceMatrix(backend, device_profiles(browser_factory.playwright.devices))
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("device matrix")
+    for line in format_report(_results).splitlines():
+        terminalreporter.write_line(line)
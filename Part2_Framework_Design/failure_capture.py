@@ -0,0 +1,237 @@
+"""
+Failure Capture
+===============
+Evidence for failing tests, without paying for full Playwright tracing
+on every test.
+
+With FAILURE_CAPTURE=true (default) every context keeps a ring buffer of
+its last CAPTURE_BUFFER_SIZE events:
+- page-object actions (from @traced, with selector / URL)
+- requests, responses, failed requests, console errors, page errors
+- a DOM snapshot after every page-object navigation (at most
+  CAPTURE_DOM_MAX_KB, and only the last few are kept)
+
+Nothing is written while tests pass. When a test fails the buffers of
+the contexts it used (events since the test started), plus a screenshot
+and the final DOM of each open page, go to
+Config.CAPTURE_DIR/<test id>/ - gzipped on a background thread pool, so
+the test thread only pays for taking the screenshot.
+
+The end of the run reports the time the test thread spends per test
+buffering events and taking DOM snapshots, and what the failures cost.
+It can't see the driver's extra event messages; bench_failure_capture.py
+measures the whole per-test cost.
+"""
+
+import gzip
+import json
+import re
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from config_example import Config
+
+
+DOM_SNAPSHOTS = 3  # Kept per context
+
+# Trimmed in the browser, so a 50,000-card page isn't sent over whole
+DOM_JS = "(max) => document.documentElement.outerHTML.slice(0, max)"
+
+
+class ContextBuffer:
+    """Recent events and DOM snapshots for one context."""
+
+    def __init__(self, size):
+        self.events = deque(maxlen=size)  # (time, kind, data)
+        self.snapshots = deque(maxlen=DOM_SNAPSHOTS)  # (time, url, html)
+
+    def since(self, start):
+        return [event for event in self.events if event[0] >= start]
+
+
+class FailureCapture:
+    """Ring buffers per context; writes them out when a test fails."""
+
+    def __init__(self, enabled=None):
+        self.enabled = Config.FAILURE_CAPTURE if enabled is None else enabled
+        self.dir = Path(Config.CAPTURE_DIR)
+        self.buffers = weakref.WeakKeyDictionary()  # context -> ContextBuffer
+        self.test_start = 0.0
+        self.buffer_s = 0.0  # On the test thread, this test: appending events
+        self.snapshot_s = 0.0  # ... and DOM snapshot round trips
+        self.stats = {"tests": 0, "buffer_s": 0.0, "snapshot_s": 0.0, "failures": 0, "capture_s": 0.0,
+                      "background_s": 0.0, "bytes": 0}
+        self._executor = None
+        self._pending = []
+        self._lock = threading.Lock()  # stats from the writer threads
+
+    # Recording (test thread)
+
+    def install(self, context):
+        """Called for every new context (see BrowserFactory.setup_context)."""
+        if not self.enabled:
+            return
+        buffer = self.buffers[context] = ContextBuffer(Config.CAPTURE_BUFFER_SIZE)
+        add = self._adder(buffer)
+        context.on("request", lambda request: add("request", f"{request.method} {request.url}"))
+        context.on("response", lambda response: add("response", f"{response.status} {response.url}"))
+        context.on("requestfailed", lambda request: add("requestfailed", f"{request.url} {request.failure}"))
+        context.on("page", lambda page: self._watch_page(page, add))
+
+    def _watch_page(self, page, add):
+        def on_console(message):
+            if message.type == "error":
+                add("console", message.text)
+        page.on("console", on_console)
+        page.on("pageerror", lambda error: add("pageerror", str(error)))
+
+    def _adder(self, buffer):
+        def add(kind, data):
+            start = time.perf_counter()
+            buffer.events.append((time.time(), kind, data))
+            self.buffer_s += time.perf_counter() - start
+        return add
+
+    def action(self, page, name, target=None):
+        """A page-object action is about to run (see tracing.traced)."""
+        buffer = self.buffers.get(page.context)
+        if buffer is not None:
+            start = time.perf_counter()
+            buffer.events.append((time.time(), "action", f"{name} {target}" if target else name))
+            self.buffer_s += time.perf_counter() - start
+
+    def snapshot(self, page):
+        """DOM after a navigation (see BasePage.navigate)."""
+        buffer = self.buffers.get(page.context)
+        if buffer is None:
+            return
+        start = time.perf_counter()
+        try:
+            buffer.snapshots.append((time.time(), page.url, page.evaluate(DOM_JS, Config.CAPTURE_DOM_MAX_KB * 1024)))
+        except Exception:
+            pass  # Page navigated again or closed; not worth failing the test for
+        self.snapshot_s += time.perf_counter() - start
+
+    # Per test
+
+    def begin(self):
+        self.test_start = time.time()
+        self.buffer_s = 0.0
+        self.snapshot_s = 0.0
+
+    def end(self):
+        self.stats["tests"] += 1
+        self.stats["buffer_s"] += self.buffer_s
+        self.stats["snapshot_s"] += self.snapshot_s
+
+    def save_failure(self, nodeid, when, longrepr):
+        """Grab what's only available now (test thread), write it off-thread."""
+        start = time.perf_counter()
+        contexts = []
+        for context, buffer in list(self.buffers.items()):
+            events = buffer.since(self.test_start)
+            if not events:
+                continue
+            pages = []
+            for page in context.pages:
+                try:
+                    pages.append({
+                        "url": page.url,
+                        "screenshot": page.screenshot(full_page=False),
+                        "dom": page.evaluate(DOM_JS, Config.CAPTURE_DOM_MAX_KB * 1024),
+                    })
+                except Exception as error:
+                    pages.append({"url": page.url, "error": str(error)})
+            snapshots = [s for s in buffer.snapshots if s[0] >= self.test_start]
+            contexts.append({"events": events, "snapshots": snapshots, "pages": pages})
+        if not contexts:
+            return  # No browser in this test (e.g. API only)
+        self.stats["failures"] += 1
+        self.stats["capture_s"] += time.perf_counter() - start
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="failure-capture")
+        out_dir = self.dir / re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_")[:150]
+        self._pending.append(self._executor.submit(self._write, out_dir, nodeid, when, str(longrepr), contexts))
+
+    def _write(self, out_dir, nodeid, when, error, contexts):
+        """Background thread: compress and write."""
+        start = time.perf_counter()
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for index, context in enumerate(contexts):
+            for number, page in enumerate(context["pages"]):
+                screenshot = page.pop("screenshot", None)
+                if screenshot:
+                    path = out_dir / f"context{index}-page{number}.png"
+                    path.write_bytes(screenshot)
+                    written += len(screenshot)
+            data = gzip.compress(json.dumps({"test": nodeid, "phase": when, "error": error, **context}).encode())
+            (out_dir / f"context{index}.json.gz").write_bytes(data)
+            written += len(data)
+        with self._lock:
+            self.stats["bytes"] += written
+            self.stats["background_s"] += time.perf_counter() - start
+        return out_dir
+
+    def wait(self):
+        """Finish pending writes (end of session)."""
+        for future in self._pending:
+            future.result()
+        self._pending = []
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+
+capture = FailureCapture()
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    if capture.enabled:
+        capture.begin()
+    yield
+    if capture.enabled:
+        capture.end()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if capture.enabled and report.failed and report.when in ("setup", "call"):
+        capture.save_failure(item.nodeid, report.when, report.longrepr)
+
+
+def pytest_sessionfinish(session):
+    capture.wait()
+
+
+def pytest_terminal_summary(terminalreporter):
+    stats = capture.stats
+    if not capture.enabled or not stats["tests"]:
+        return
+    terminalreporter.section("failure capture")
+    terminalreporter.write_line(
+        f"{stats['tests']} tests, per test on the test thread: "
+        f"{stats['buffer_s'] * 1000 / stats['tests']:.2f} ms buffering events, "
+        f"{stats['snapshot_s'] * 1000 / stats['tests']:.1f} ms taking DOM snapshots "
+        "(the driver's extra event traffic isn't included; bench_failure_capture.py measures it)"
+    )
+    if stats["failures"]:
+        terminalreporter.write_line(
+            f"{stats['failures']} failures saved to {capture.dir}/: "
+            f"{stats['capture_s'] * 1000 / stats['failures']:.0f} ms each on the test thread (screenshots), "
+            f"{stats['background_s'] * 1000:.0f} ms compressing/writing in the background, "
+            f"{stats['bytes'] / 1024:.0f} KB"
+        )
@@ -0,0 +1,231 @@
+"""
+Load Mode
+=========
+Puts concurrent load on an environment with the same code the tests use.
+
+- API users are cheap coroutines running AsyncAPIHelper
+  create_project -> get_project -> delete_project in a loop
+- Browser users (fewer, they cost a context each) log in with
+  AsyncLoginPage and open /projects
+- Users are spread over --processes worker processes and started
+  evenly over --ramp seconds, then run for --duration seconds
+- The report has errors, p50/p95/p99 and throughput per operation:
+  over the whole run and over the full-load window (after the ramp)
+- A project an API user created is always deleted, even if a later
+  call failed
+
+Run against staging (URLs and tokens from Tenants.TENANTS):
+    python load_mode.py --api-users 50 --browser-users 2 --processes 4 --ramp 30 --duration 120
+
+Or against local_server.py:
+    python load_mode.py --local --latency-ms 20 --api-users 20 --duration 10
+
+API users need httpx; browser users need the Playwright browsers.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from contextlib import asynccontextmanager
+
+from api_helper import AsyncAPIHelper
+from config_example import Tenants
+
+
+class Recorder:
+    """Latencies (ms) and error counts per operation."""
+
+    def __init__(self, full_load_at=0.0, stop_at=float("inf")):
+        self.full_load = (full_load_at, stop_at)  # After the ramp, until the users stop
+        self.ops = {}  # op -> {"ms": [...], "errors": n, "full_load": n done at full load}
+
+    @asynccontextmanager
+    async def timed(self, op):
+        row = self.ops.setdefault(op, {"ms": [], "errors": 0, "full_load": 0})
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            row["errors"] += 1
+            raise
+        row["ms"].append((time.perf_counter() - start) * 1000)
+        if self.full_load[0] <= time.time() < self.full_load[1]:
+            row["full_load"] += 1
+
+
+# Virtual users
+# =============
+
+async def api_user(user, stop_at, recorder, think):
+    async with AsyncAPIHelper(user["url"], user["token"], user["tenant"], pool_size=2, retries=0) as api:
+        number = 0
+        while time.time() < stop_at:
+            number += 1
+            project = None
+            try:
+                async with recorder.timed("api.create_project"):
+                    project = await api.create_project(f"Load {user['id']}-{number}", "Load test")
+                async with recorder.timed("api.get_project"):
+                    await api.get_project(project["id"])
+            except Exception:
+                pass  # Counted by the recorder; keep the user going
+            finally:
+                if project:  # Don't leave load data behind
+                    try:
+                        async with recorder.timed("api.delete_project"):
+                            await api.delete_project(project["id"])
+                    except Exception:
+                        pass
+            await asyncio.sleep(think)
+
+
+async def browser_user(factory, user, stop_at, recorder, think):
+    # Imported here so API-only runs don't need Playwright browsers
+    from async_base import AsyncBasePage, AsyncLoginPage
+    from projects_page import ProjectsPage
+
+    class AsyncProjectsPage(AsyncBasePage):
+        READY = ProjectsPage.READY
+        READY_TIMEOUT = ProjectsPage.READY_TIMEOUT
+
+    credentials = Tenants.get_user(user["tenant"], "admin")
+    while time.time() < stop_at:
+        try:
+            async with factory.context() as context:
+                page = await context.new_page()
+                async with recorder.timed("ui.login"):
+                    login_page = AsyncLoginPage(page)
+                    await login_page.goto(f"{user['url']}/login")
+                    await login_page.login_to_dashboard(credentials["email"], credentials["password"])
+                async with recorder.timed("ui.open_projects"):
+                    await AsyncProjectsPage(page).goto(f"{user['url']}/projects")
+        except Exception:
+            pass
+        await asyncio.sleep(think)
+
+
+async def run_users(users, start_at, ramp, duration, think):
+    stop_at = start_at + ramp + duration
+    recorder = Recorder(start_at + ramp, stop_at)
+    factory = None
+    if any(user["kind"] == "browser" for user in users):
+        from async_base import AsyncBrowserFactory
+        factory = await AsyncBrowserFactory(headless=True).start()
+
+    async def start(user):
+        await asyncio.sleep(max(0.0, start_at + user["delay"] - time.time()))
+        if user["kind"] == "api":
+            await api_user(user, stop_at, recorder, think)
+        else:
+            await browser_user(factory, user, stop_at, recorder, think)
+
+    try:
+        await asyncio.gather(*(start(user) for user in users))
+    finally:
+        if factory:
+            await factory.stop()
+    return recorder.ops
+
+
+def worker(args):
+    """Entry point of one load process."""
+    return asyncio.run(run_users(*args))
+
+
+# Planning and report
+# ===================
+
+def plan_users(tenants, api_users, browser_users, processes, ramp, urls):
+    """
+    One list of users per process. Start delays are spread evenly over
+    the ramp across all processes.
+    """
+    users = []
+    for tenant in tenants:
+        token = Tenants.TENANTS[tenant]["api_token"]
+        users += [{"kind": "api", "tenant": tenant, "url": urls[tenant], "token": token} for _ in range(api_users)]
+        users += [{"kind": "browser", "tenant": tenant, "url": urls[tenant]} for _ in range(browser_users)]
+
+    plans = [[] for _ in range(processes)]
+    for index, user in enumerate(users):
+        user["id"] = index
+        user["delay"] = ramp * index / max(1, len(users))
+        plans[index % processes].append(user)
+    return [plan for plan in plans if plan]
+
+
+def merge(results):
+    merged = {}
+    for ops in results:
+        for op, row in ops.items():
+            target = merged.setdefault(op, {"ms": [], "errors": 0, "full_load": 0})
+            target["ms"] += row["ms"]
+            target["errors"] += row["errors"]
+            target["full_load"] += row["full_load"]
+    return merged
+
+
+def percentiles(samples):
+    """p50, p95, p99 (ms)."""
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def print_report(ops, ramp, duration):
+    """ops/s over the whole run (ramp included) and at full load (after the ramp)."""
+    print(f"{'operation':<22} {'ok':>8} {'errors':>7} {'ops/s':>8} {'full ops/s':>10} "
+          f"{'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    for op, row in sorted(ops.items()):
+        p50, p95, p99 = percentiles(row["ms"])
+        print(
+            f"{op:<22} {len(row['ms']):>8} {row['errors']:>7} {len(row['ms']) / (ramp + duration):>8.1f} "
+            f"{row['full_load'] / duration:>10.1f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", default=",".join(Tenants.TENANTS))
+    parser.add_argument("--api-users", type=int, default=10, help="per tenant")
+    parser.add_argument("--browser-users", type=int, default=0, help="per tenant")
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--ramp", type=float, default=5, help="seconds to start all users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds at full load")
+    parser.add_argument("--think", type=float, default=0.0, help="pause between iterations (s)")
+    parser.add_argument("--local", action="store_true", help="start local_server.py and use it")
+    parser.add_argument("--latency-ms", type=int, default=0, help="local server latency")
+    args = parser.parse_args()
+    if args.duration <= 0:
+        parser.error("--duration must be more than 0 (throughput is per second at full load)")
+    if args.ramp < 0:
+        parser.error("--ramp can't be negative")
+
+    tenants = args.tenants.split(",")
+    server = None
+    urls = {tenant: Tenants.TENANTS[tenant]["url"] for tenant in tenants}
+    if args.local:
+        from local_server import WorkflowProServer
+        server = WorkflowProServer(port=0, project_counts={"company2": 0}, latency_ms=args.latency_ms).start()
+        urls = {tenant: server.url for tenant in tenants}
+
+    plans = plan_users(tenants, args.api_users, args.browser_users, args.processes, args.ramp, urls)
+    start_at = time.time() + 2  # Time for the processes to start
+    print(f"{sum(map(len, plans))} users on {len(plans)} processes, "
+          f"ramp {args.ramp:.0f} s, full load {args.duration:.0f} s\n")
+    try:
+        with multiprocessing.get_context("spawn").Pool(len(plans)) as pool:
+            results = pool.map(worker, [(plan, start_at, args.ramp, args.duration, args.think) for plan in plans])
+    finally:
+        if server:
+            server.stop()
+
+    print_report(merge(results), args.ramp, args.duration)
+
+
+if __name__ == "__main__":
+    main()
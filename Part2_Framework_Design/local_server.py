@@ -0,0 +1,522 @@
+"""
+Local WorkflowPro Server
+========================
+A small stand-in for WorkflowPro so tests and benchmarks can run
+offline, fast and the same way every time.
+
+It has:
+- Login page, 2FA page, dashboard and projects page (same selectors
+  as the real app: #email, #password, #login-btn, #2fa-code, ...)
+- /api/v1/projects endpoints that APIHelper calls
+- Users and tokens from Part1/Part3 test_data.json and config_example.py
+- Any number of seeded projects per tenant (e.g. 50,000 for Company2)
+- Optional extra latency, to make slow networks reproducible
+
+Run:
+    python local_server.py --port 8000 --projects company2=50000 --latency-ms 50
+    WORKFLOWPRO_URL=http://127.0.0.1:8000 pytest ../Part3_Integration_Test
+
+Or from Python:
+    server = WorkflowProServer(port=0).start()
+    ... server.url ...
+    server.stop()
+
+Benchmarks use ServerProcess instead (same arguments, same start() /
+url / stop()): a server thread in the benchmark's own process competes
+with the client for the GIL, so it measures contention, not the client.
+"""
+
+import argparse
+import bisect
+import html
+import itertools
+import json
+import random
+import re
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from config_example import Config, Tenants
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PART1_DATA = REPO_ROOT / "Part1_Flaky_Tests" / "test_data.json"
+PART3_DATA = REPO_ROOT / "Part3_Integration_Test" / "test_data.json"
+
+# Company2 is the "big customer" from the case study
+DEFAULT_PROJECT_COUNTS = {"company1": 25, "company2": 50000}
+
+PAGE_SIZE = 100  # Cards fetched per scroll on the projects list
+
+
+# Data
+# ====
+
+class Store:
+    """In-memory users, sessions and projects. Thread safe."""
+
+    def __init__(self, project_counts=None):
+        self.lock = threading.Lock()
+        self.users = {}      # email -> {"password", "tenant", "has_2fa"}
+        self.tokens = {}     # api token -> tenant
+        self.sessions = {}   # session id -> email
+        self.pending_2fa = {}  # 2FA session id -> email
+        self.projects = {}   # tenant -> {id: project}
+        self.order = {}      # tenant -> sorted ids, so a page is a slice, not a walk from the start
+        self.ids = itertools.count(1)
+
+        self._load_users()
+        counts = dict(DEFAULT_PROJECT_COUNTS, **(project_counts or {}))
+        for tenant in Tenants.TENANTS:
+            self.projects[tenant] = {}
+            self.order[tenant] = []
+            for n in range(1, counts.get(tenant, 0) + 1):
+                self.add_project(tenant, f"{company_name(tenant)} Project {n:05d}", "Seeded")
+
+    def _load_users(self):
+        # Config users (every tenant/role)
+        for tenant, tenant_config in Tenants.TENANTS.items():
+            for user in tenant_config["users"].values():
+                self.users[user["email"]] = {"password": user["password"], "tenant": tenant, "has_2fa": None}
+
+        # Part 3: API tokens and admins
+        part3 = json.loads(PART3_DATA.read_text())
+        for tenant, company in part3["companies"].items():
+            self.tokens[company["api_token"]] = tenant
+            for user in company["users"].values():
+                self.users.setdefault(user["email"], {"password": user["password"], "tenant": tenant, "has_2fa": None})
+
+        # Part 1: who has 2FA
+        part1 = json.loads(PART1_DATA.read_text())
+        two_fa_tenants = set()
+        for user in part1["test_users"].values():
+            tenant = user["company"].lower()
+            self.users[user["email"]] = {"password": user["password"], "tenant": tenant, "has_2fa": user["has_2fa"]}
+            if user["has_2fa"]:
+                two_fa_tenants.add(tenant)
+
+        # Users not listed in Part 1 follow their company's 2FA setting
+        for user in self.users.values():
+            if user["has_2fa"] is None:
+                user["has_2fa"] = user["tenant"] in two_fa_tenants
+
+    def add_project(self, tenant, name, description, team_members=None):
+        project = {
+            "name": name,
+            "description": description,
+            "team_members": team_members or [],
+            "status": "active",
+            "tenant": tenant,
+            "company": company_name(tenant),
+        }
+        with self.lock:  # Ids handed out under the lock, so order stays sorted
+            project["id"] = next(self.ids)
+            self.projects[tenant][project["id"]] = project
+            self.order[tenant].append(project["id"])
+        return project
+
+    def delete_project(self, tenant, project_id):
+        with self.lock:
+            if self.projects[tenant].pop(project_id, None):
+                order = self.order[tenant]
+                del order[bisect.bisect_left(order, project_id)]
+
+    def list_projects(self, tenant, offset, limit):
+        with self.lock:
+            projects = self.projects[tenant]
+            items = [projects[project_id] for project_id in self.order[tenant][offset:offset + limit]]
+            return {"total": len(projects), "offset": offset, "items": items}
+
+    def check_login(self, email, password):
+        user = self.users.get(email)
+        return user if user and user["password"] == password else None
+
+    def new_session(self, email, pending=False):
+        session_id = secrets.token_hex(16)
+        with self.lock:
+            (self.pending_2fa if pending else self.sessions)[session_id] = email
+        return session_id
+
+
+def company_name(tenant):
+    """company2 -> Company2 (the label shown on project cards)"""
+    return tenant.capitalize()
+
+
+# Pages
+# =====
+
+STYLE = """
+body { font-family: sans-serif; margin: 0; }
+nav { display: flex; gap: 1em; padding: 1em; background: #eee; }
+.mobile-menu { display: none; }
+#logout-btn { display: none; }
+#logout-btn.open { display: inline; }
+#project-list { height: 70vh; overflow-y: auto; }
+.project-card { border: 1px solid #ccc; margin: 4px; padding: 8px; }
+.error-message { color: red; }
+@media (max-width: 768px) {
+    .mobile-menu { display: block; }
+    .desktop-nav { display: none; }
+}
+"""
+
+# Loads project cards from the API page by page as the list scrolls
+PROJECT_LIST_JS = """
+(function () {
+    const list = document.getElementById("project-list");
+    if (!list) return;
+    const pageSize = Number(list.dataset.pageSize);
+    let offset = 0, total = Infinity, loading = false;
+    const esc = (s) => s.replace(/[&<>"]/g, (c) => "&#" + c.charCodeAt(0) + ";");
+
+    async function loadMore() {
+        if (loading || offset >= total) return;
+        loading = true;
+        const response = await fetch(`/api/v1/projects?offset=${offset}&limit=${pageSize}`);
+        const data = await response.json();
+        total = data.total;
+        list.insertAdjacentHTML("beforeend", data.items.map((p) =>
+            `<div class="project-card" data-project-id="${p.id}" data-tenant="${p.company}">` +
+            `<span class="project-name">${esc(p.name)}</span> ` +
+            `<span class="project-tenant">${p.company}</span></div>`).join(""));
+        offset += data.items.length;
+        list.dataset.loaded = offset;
+        list.dataset.total = total;
+        loading = false;
+        // Keep loading until the list is scrollable
+        if (list.scrollHeight <= list.clientHeight) loadMore();
+    }
+
+    list.addEventListener("scroll", () => {
+        if (list.scrollTop + list.clientHeight >= list.scrollHeight - 200) loadMore();
+    });
+    loadMore();
+})();
+
+const menu = document.getElementById("user-menu");
+if (menu) menu.addEventListener("click", () =>
+    document.getElementById("logout-btn").classList.toggle("open"));
+"""
+
+
+def layout(title, body):
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} - WorkflowPro</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<link rel="stylesheet" href="/static/app.css"></head>
+<body>{body}<script src="/static/app.js"></script></body></html>"""
+
+
+def login_page(error=False):
+    message = '<p class="error-message">Invalid credentials</p>' if error else ""
+    return layout("Login", f"""
+<form method="post" action="/login">
+  <h1>Login</h1>{message}
+  <input id="email" name="email" type="email" placeholder="Email">
+  <input id="password" name="password" type="password" placeholder="Password">
+  <button id="login-btn" type="submit">Login</button>
+</form>""")
+
+
+def two_fa_page(error=False):
+    message = '<p class="error-message">Invalid code</p>' if error else ""
+    return layout("Verify", f"""
+<form method="post" action="/2fa-verify">
+  <h1>Two-factor verification</h1>{message}
+  <input id="2fa-code" name="code" placeholder="6-digit code">
+  <button id="verify-btn" type="submit">Verify</button>
+</form>""")
+
+
+def app_page(title, email, tenant):
+    return layout(title, f"""
+<nav>
+  <div class="mobile-menu">&#9776; Menu</div>
+  <span class="desktop-nav"><a href="/dashboard">Dashboard</a></span>
+  <a href="/projects">Projects</a>
+  <button id="user-menu">{html.escape(email)}</button>
+  <a id="logout-btn" href="/logout">Logout</a>
+</nav>
+<h1>{title}</h1>
+<p class="welcome-message">Welcome, {html.escape(email)} ({company_name(tenant)})</p>
+<div id="project-list" data-page-size="{PAGE_SIZE}"></div>""")
+
+
+# Request handling
+# ================
+
+class Handler(BaseHTTPRequestHandler):
+    """Routes for pages, static files and the projects API."""
+
+    protocol_version = "HTTP/1.1"   # Keep-alive, like the real app
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+    server_version = "WorkflowProLocal/1.0"
+
+    # Set by WorkflowProServer
+    store = None
+    latency = 0.0
+    api_latency = 0.0
+    jitter = 0.0
+
+    def log_message(self, *args):
+        pass  # Quiet during test runs
+
+    # Helpers
+
+    def _delay(self, api):
+        delay = (self.api_latency if api else self.latency) + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, status, body):
+        self._send(status, json.dumps(body), "application/json")
+
+    def _redirect(self, location, cookie=None):
+        headers = {"Location": location}
+        if cookie:
+            headers["Set-Cookie"] = cookie
+        self._send(302, "", headers=headers)
+
+    def _cookie(self, name):
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            key, _, value = part.strip().partition("=")
+            if key == name:
+                return value
+        return None
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length).decode() if length else ""
+
+    def _session_email(self):
+        return self.store.sessions.get(self._cookie("session"))
+
+    def _api_tenant(self):
+        """Tenant from Bearer token + X-Tenant-ID, or the browser session."""
+        auth = self.headers.get("Authorization", "")
+        if auth.startswith("Bearer "):
+            tenant = self.store.tokens.get(auth[len("Bearer "):])
+            return tenant if tenant and tenant == self.headers.get("X-Tenant-ID") else None
+        email = self._session_email()
+        return self.store.users[email]["tenant"] if email else None
+
+    # Routing
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self._delay(url.path.startswith("/api/"))
+
+        if url.path.startswith("/api/v1/projects"):
+            return self._api("GET", url)
+        if url.path == "/static/app.css":
+            return self._send(200, STYLE, "text/css", {"Cache-Control": "max-age=3600"})
+        if url.path == "/static/app.js":
+            return self._send(200, PROJECT_LIST_JS, "application/javascript", {"Cache-Control": "max-age=3600"})
+        if url.path in ("/", "/login"):
+            return self._send(200, login_page())
+        if url.path == "/2fa-verify":
+            return self._send(200, two_fa_page())
+        if url.path == "/logout":
+            self.store.sessions.pop(self._cookie("session"), None)
+            return self._redirect("/login", "session=; Path=/; Max-Age=0")
+        if url.path in ("/dashboard", "/projects"):
+            email = self._session_email()
+            if not email:
+                return self._redirect("/login")
+            title = "Dashboard" if url.path == "/dashboard" else "Projects"
+            return self._send(200, app_page(title, email, self.store.users[email]["tenant"]))
+        self._send(404, "Not found", "text/plain")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        self._delay(url.path.startswith("/api/"))
+
+        if url.path.startswith("/api/v1/projects"):
+            return self._api("POST", url)
+        form = {key: values[0] for key, values in parse_qs(self._body()).items()}
+
+        if url.path == "/login":
+            user = self.store.check_login(form.get("email"), form.get("password"))
+            if not user:
+                return self._send(200, login_page(error=True))
+            if user["has_2fa"]:
+                pending = self.store.new_session(form["email"], pending=True)
+                return self._redirect("/2fa-verify", f"pending_2fa={pending}; Path=/; HttpOnly")
+            session = self.store.new_session(form["email"])
+            return self._redirect("/dashboard", f"session={session}; Path=/; HttpOnly")
+
+        if url.path == "/2fa-verify":
+            email = self.store.pending_2fa.get(self._cookie("pending_2fa"))
+            if not email:
+                return self._redirect("/login")
+            if form.get("code") != Config.TWO_FA_CODE:
+                return self._send(200, two_fa_page(error=True))
+            self.store.pending_2fa.pop(self._cookie("pending_2fa"), None)
+            session = self.store.new_session(email)
+            return self._redirect("/dashboard", f"session={session}; Path=/; HttpOnly")
+
+        self._send(404, "Not found", "text/plain")
+
+    def do_DELETE(self):
+        url = urlparse(self.path)
+        self._delay(True)
+        if url.path.startswith("/api/v1/projects"):
+            return self._api("DELETE", url)
+        self._send(404, "Not found", "text/plain")
+
+    def _api(self, method, url):
+        tenant = self._api_tenant()
+        if not tenant:
+            return self._json(401, {"error": "unauthorized"})
+
+        projects = self.store.projects[tenant]
+        parts = url.path.rstrip("/").split("/")  # ['', 'api', 'v1', 'projects', id?]
+        project_id = int(parts[4]) if len(parts) > 4 and parts[4].isdigit() else None
+
+        if method == "GET" and project_id is None:
+            query = parse_qs(url.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(PAGE_SIZE)])[0])
+            return self._json(200, self.store.list_projects(tenant, offset, limit))
+
+        if method == "POST" and project_id is None:
+            payload = json.loads(self._body() or "{}")
+            if not payload.get("name"):
+                return self._json(400, {"error": "name is required"})
+            project = self.store.add_project(
+                tenant, payload["name"], payload.get("description", ""), payload.get("team_members")
+            )
+            return self._json(201, project)
+
+        # Other tenants' projects look the same as missing ones
+        if project_id not in projects:
+            return self._json(404, {"error": "not found"})
+        if method == "GET":
+            return self._json(200, projects[project_id])
+        if method == "DELETE":
+            self.store.delete_project(tenant, project_id)
+            return self._json(200, {"status": "deleted"})
+        self._json(405, {"error": "method not allowed"})
+
+
+# Server
+# ======
+
+class WorkflowProServer:
+    """Runs the local app on a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=8000, project_counts=None,
+                 latency_ms=0, api_latency_ms=None, jitter_ms=0):
+        self.store = Store(project_counts)
+        # Each server gets its own handler class so settings don't leak
+        self.handler = type("LocalHandler", (Handler,), {
+            "store": self.store,
+            "latency": latency_ms / 1000,
+            "api_latency": (latency_ms if api_latency_ms is None else api_latency_ms) / 1000,
+            "jitter": jitter_ms / 1000,
+        })
+        self.httpd = ThreadingHTTPServer((host, port), self.handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread:  # shutdown() waits for serve_forever(), so only if it's running
+            self.httpd.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.httpd.server_close()
+
+
+class ServerProcess:
+    """Runs the local app in a child process (see the module docstring)."""
+
+    def __init__(self, project_counts=None, latency_ms=0, api_latency_ms=None, jitter_ms=0):
+        self.args = ["--port", "0", "--latency-ms", str(latency_ms), "--jitter-ms", str(jitter_ms)]
+        for tenant, count in (project_counts or {}).items():
+            self.args += ["--projects", f"{tenant}={count}"]
+        if api_latency_ms is not None:
+            self.args += ["--api-latency-ms", str(api_latency_ms)]
+        self.process = None
+        self.url = None
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), *self.args],
+            stdout=subprocess.PIPE, text=True,
+        )
+        line = self.process.stdout.readline()  # Printed once the data is seeded
+        match = re.search(r"http://\S+", line)
+        if not match:
+            self.stop()
+            raise RuntimeError(f"local_server.py didn't start: {line!r}")
+        self.url = match.group(0)
+        return self
+
+    def stop(self):
+        if self.process:
+            self.process.terminate()
+            self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+
+
+def parse_counts(values):
+    """["company2=50000"] -> {"company2": 50000}"""
+    counts = {}
+    for value in values or []:
+        tenant, _, count = value.partition("=")
+        counts[tenant] = int(count)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local WorkflowPro stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--projects", action="append", metavar="TENANT=COUNT",
+                        help="Seeded projects per tenant (default company1=25, company2=50000)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added to every response")
+    parser.add_argument("--api-latency-ms", type=float, default=None, help="Override for /api/ calls")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra delay, 0..N ms")
+    args = parser.parse_args()
+
+    server = WorkflowProServer(
+        args.host, args.port, parse_counts(args.projects),
+        args.latency_ms, args.api_latency_ms, args.jitter_ms,
+    )
+    print(f"WorkflowPro running at {server.url} (Ctrl+C to stop)", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Login State Cache
+=================
+Log in once per tenant + role, reuse the session everywhere else.
+
+Most tests don't test login, they just need to be logged in. The UI
+login (plus 2FA for some users) takes seconds, so we do it once, save
+Playwright's storage state (cookies + localStorage) to disk and load it
+into new contexts. Tests start directly on /dashboard.
+
+Saved states expire after Config.LOGIN_STATE_TTL seconds. If the server
+rejects a saved session (we land on /login), it is deleted and we log
+in again automatically.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from base_test_example import LoginPage
+from api_replay import replay
+from config_example import Config, Tenants
+from dependency_index import index
+from web_vitals import vitals
+
+
+# Shows up on the dashboard when logged in, or on the login page if not
+LOGGED_IN_MARKER = ".welcome-message"
+LOGIN_FORM_MARKER = "#email"
+
+
+class LoginRejected(Exception):
+    """Saved session still rejected after a fresh login."""
+
+
+class LoginStateCache:
+    """Storage-state files keyed by (tenant, role) from Tenants.TENANTS."""
+
+    def __init__(self, factory, cache_dir=None, ttl=None):
+        self.factory = factory
+        self.cache_dir = Path(cache_dir or Config.AUTH_STATE_DIR)
+        self.ttl = Config.LOGIN_STATE_TTL if ttl is None else ttl
+        self.stats = {"hits": 0, "logins": 0, "rejected": 0}
+
+    def state_path(self, tenant, role):
+        return self.cache_dir / f"{tenant}-{role}.json"
+
+    def is_fresh(self, path):
+        """File exists and is younger than the TTL."""
+        return path.exists() and time.time() - path.stat().st_mtime < self.ttl
+
+    def get_state(self, tenant, role):
+        """Path to a saved login, logging in first if needed."""
+        path = self.state_path(tenant, role)
+        if self.is_fresh(path):
+            self.stats["hits"] += 1
+            index.reuse(f"login:{tenant}-{role}")
+            return path
+        with index.built(f"login:{tenant}-{role}"), replay.shared():
+            return self.login(tenant, role)
+
+    def invalidate(self, tenant, role):
+        """Forget a saved login."""
+        self.state_path(tenant, role).unlink(missing_ok=True)
+
+    def login(self, tenant, role):
+        """Do the real UI login and save the storage state."""
+        user = Tenants.get_user(tenant, role)
+        path = self.state_path(tenant, role)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        context = self.factory.new_context()
+        try:
+            login_page = LoginPage(context.new_page())
+            login_page.goto(f"{Tenants.TENANTS[tenant]['url']}/login")
+            login_page.login_to_dashboard(user["email"], user["password"])
+
+            # Write then rename, so other workers never read half a file
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            context.close()
+
+        self.stats["logins"] += 1
+        return path
+
+    def _open_dashboard(self, tenant, role):
+        """Context with the saved login, navigation to /dashboard started."""
+        state = self.get_state(tenant, role)
+        context = self.factory.new_context(storage_state=str(state))
+        vitals.set_tenant(context, tenant)
+        page = context.new_page()
+        page.goto(f"{Tenants.TENANTS[tenant]['url']}/dashboard", wait_until="commit")
+        return page
+
+    def _accepted(self, page, tenant, role):
+        """
+        True if the dashboard rendered. If we were bounced to login
+        (session expired or revoked on the server side) the context is
+        closed and the saved state forgotten.
+        """
+        page.wait_for_selector(f"{LOGGED_IN_MARKER}, {LOGIN_FORM_MARKER}", state="visible")
+        if "/login" not in page.url:
+            return True
+        page.context.close()
+        self.stats["rejected"] += 1
+        self.invalidate(tenant, role)
+        return False
+
+    def new_page(self, tenant, role="admin"):
+        """
+        New context with the saved login, already on /dashboard.
+        The caller closes page.context when done.
+        """
+        with replay.shared():
+            for _ in range(2):
+                page = self._open_dashboard(tenant, role)
+                if self._accepted(page, tenant, role):
+                    return page
+
+        raise LoginRejected(f"Fresh login for {tenant}/{role} was rejected")
+
+    def new_pages(self, logins):
+        """
+        new_page() for several (tenant, role) pairs at once. Every
+        dashboard starts loading before we wait for any of them.
+        """
+        pages = []
+        try:
+            with replay.shared():
+                for tenant, role in logins:
+                    pages.append(self._open_dashboard(tenant, role))
+                for i, (tenant, role) in enumerate(logins):
+                    if not self._accepted(pages[i], tenant, role):
+                        pages[i] = self.new_page(tenant, role)
+        except Exception:
+            for page in pages:
+                if not page.is_closed():
+                    page.context.close()
+            raise
+        return pages
+
+
+# Pytest fixtures
+# ===============
+
+@pytest.fixture(scope="session")
+def login_cache(browser_factory):
+    """One cache for the worker session."""
+    return LoginStateCache(browser_factory)
+
+
+@pytest.fixture
+def logged_in(login_cache):
+    """
+    Open pages that are already logged in:
+
+        page = logged_in("company1", "admin")
+    """
+    pages = []
+
+    def open_page(tenant, role="admin"):
+        page = login_cache.new_page(tenant, role)
+        pages.append(page)
+        return page
+
+    yield open_page
+
+    for page in pages:
+        page.context.close()
@@ -0,0 +1,215 @@
+"""
+Browser Memory Monitor
+======================
+Samples browser memory for every test and recycles what got too big.
+
+With MEMORY_SAMPLING=true (default), for each test that used a browser
+context - pooled (BrowserFactory.context) or not (new_context: cached
+logins, multi-tenant, device matrix, state graph):
+- JS heap of each of its contexts' open pages (performance.memory,
+  Chromium only - the browser is launched with
+  --enable-precise-memory-info) is summed per context, just before the
+  context is given back or closed, or at teardown if it's still open.
+  A pooled context over CONTEXT_MAX_HEAP_MB is closed instead of going
+  back to the pool.
+- RSS of the browser's renderer processes is read (needs psutil) after
+  teardown. Over BROWSER_MAX_RSS_MB the browser is relaunched.
+- Renderer RSS still there after the test's pages were closed is its
+  growth. Tests that grow by more than MEMORY_LEAK_MB are listed as
+  leak suspects at the end of the run.
+
+Without psutil only the JS heap is sampled, and the memory section at
+the end of the run says so (no warning: psutil is optional).
+
+Each worker's time series goes to Config.MEMORY_DIR/memory-<worker>.jsonl.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from config_example import Config
+
+
+MB = 1024 * 1024
+
+HEAP_JS = "() => performance.memory ? performance.memory.usedJSHeapSize : null"
+
+# Command line markers of renderer / content processes per engine
+RENDERER_MARKERS = ("--type=renderer", "-contentproc", "WebKitWebProcess")
+
+
+def renderer_memory_mb():
+    """RSS of the renderer processes started under this process, or None without psutil."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            if any(marker in part for part in child.cmdline() for marker in RENDERER_MARKERS):
+                total += child.memory_info().rss
+        except psutil.Error:
+            continue  # Exited while we looked
+    return total / MB
+
+
+def heap_mb(context):
+    """Used JS heap of the context's open pages (MB), or None if the browser can't tell."""
+    total = None
+    for page in context.pages:
+        try:
+            used = page.evaluate(HEAP_JS)
+        except Exception:
+            continue  # Page crashed or is closing
+        if used is not None:
+            total = (total or 0) + used / MB
+    return total
+
+
+class MemoryMonitor:
+    """Per-worker time series of memory samples, one per test."""
+
+    def __init__(self, enabled=None):
+        self.enabled = Config.MEMORY_SAMPLING if enabled is None else enabled
+        self.samples = []
+        self.current_test = None
+        self.stats = {"contexts_over_limit": 0, "browsers_restarted": 0}
+        self.restart_browser = None  # Set by the running BrowserFactory
+        self._sample = None  # Being filled in for the running test
+        self._contexts = set()  # Used by the running test
+        self._heaps = {}  # context -> MB, sampled this test
+
+    def install(self, context):
+        """Every new context (BrowserFactory.setup_context): sampled before it closes."""
+        if not self.enabled:
+            return
+        close = context.close
+
+        def close_after_sampling(*args, **kwargs):
+            self.sample(context)
+            return close(*args, **kwargs)
+
+        context.close = close_after_sampling
+
+    def use(self, context):
+        """The running test uses this context (BrowserFactory.context / new_context)."""
+        if self._sample is not None:
+            self._contexts.add(context)
+
+    def start_test(self):
+        """Renderer memory before the test."""
+        if not self.enabled:
+            return
+        self._contexts, self._heaps = set(), {}
+        self._sample = {"time": time.time(), "test": self.current_test, "before_mb": renderer_memory_mb()}
+
+    def sample(self, context):
+        """
+        JS heap of a context while its pages are still open (once per test).
+        True if it's over CONTEXT_MAX_HEAP_MB.
+        """
+        if context not in self._contexts:
+            return False
+        if context not in self._heaps:
+            self._heaps[context] = heap_mb(context)
+        heap = self._heaps[context]
+        return heap is not None and heap > Config.CONTEXT_MAX_HEAP_MB
+
+    def sample_open(self):
+        """Contexts still open at teardown (closed later by their fixtures)."""
+        for context in list(self._contexts):
+            self.sample(context)
+
+    def finish_test(self):
+        """
+        Renderer memory after the test's contexts were cleaned up.
+        Returns True when the browser should be restarted.
+        """
+        sample, self._sample = self._sample, None
+        contexts, heaps = self._contexts, [h for h in self._heaps.values() if h is not None]
+        self._contexts, self._heaps = set(), {}
+        if not sample or not contexts:
+            return False  # No browser in this test
+        sample["contexts"] = len(contexts)
+        sample["heap_mb"] = max(heaps) if heaps else None
+        over = sum(heap > Config.CONTEXT_MAX_HEAP_MB for heap in heaps)
+        self.stats["contexts_over_limit"] += over
+        sample["contexts_over_limit"] = over
+
+        after = renderer_memory_mb()
+        sample["after_mb"] = after
+        sample["growth_mb"] = None if after is None or sample["before_mb"] is None else after - sample["before_mb"]
+        restart = after is not None and after > Config.BROWSER_MAX_RSS_MB
+        if restart:
+            self.stats["browsers_restarted"] += 1
+        sample["browser_restarted"] = restart
+        self.samples.append(sample)
+        return restart
+
+    def leak_suspects(self):
+        """Samples that kept more than MEMORY_LEAK_MB after cleanup, biggest first."""
+        suspects = [s for s in self.samples if (s.get("growth_mb") or 0) > Config.MEMORY_LEAK_MB]
+        return sorted(suspects, key=lambda s: -s["growth_mb"])
+
+    def save(self, out_dir=None):
+        out_dir = Path(out_dir or Config.MEMORY_DIR)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        worker = os.getenv("WORKER_ID") or "main"
+        with open(out_dir / f"memory-{worker}.jsonl", "a") as out:
+            for sample in self.samples:
+                out.write(json.dumps(sample) + "\n")
+
+
+memory = MemoryMonitor()
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    memory.current_test = item.nodeid
+    memory.start_test()
+    yield
+    if memory.finish_test() and memory.restart_browser:
+        memory.restart_browser()
+    memory.current_test = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    memory.sample_open()  # Before fixtures close the pages
+    yield
+
+
+def pytest_sessionfinish(session):
+    if memory.samples:
+        memory.save()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not memory.samples:
+        return
+    terminalreporter.section("browser memory")
+    heaps = [s["heap_mb"] for s in memory.samples if s.get("heap_mb") is not None]
+    renderer = [s["after_mb"] for s in memory.samples if s.get("after_mb") is not None]
+    line = f"{len(memory.samples)} samples"
+    if heaps:
+        line += f", JS heap max {max(heaps):.0f} MB per context"
+    if renderer:
+        line += f", renderers {renderer[0]:.0f} -> {renderer[-1]:.0f} MB"
+    else:
+        line += " (psutil not installed: no renderer memory, restarts or leak reports)"
+    terminalreporter.write_line(line)
+    terminalreporter.write_line(
+        f"{memory.stats['contexts_over_limit']} contexts over {Config.CONTEXT_MAX_HEAP_MB} MB heap "
+        "(pooled ones not reused), "
+        f"{memory.stats['browsers_restarted']} browser restarts (> {Config.BROWSER_MAX_RSS_MB} MB)"
+    )
+    for sample in memory.leak_suspects()[:10]:
+        terminalreporter.write_line(f"  possible leak: +{sample['growth_mb']:.0f} MB after {sample['test']}")
@@ -0,0 +1,94 @@
+"""
+Multi-Tenant Checks
+===================
+Looks at the app as several tenants at the same time.
+
+Checking isolation one tenant after another (log out, log in as the
+next company, open /projects again) costs one full session per tenant.
+Here every tenant gets its own context in the same browser, all the
+projects pages load in parallel, and the results are compared at the
+end:
+
+    cards = multi_tenant.project_cards(["company1", "company2"])
+    problems = isolation_problems(cards, {"company1": ["My Project"]})
+    assert not problems, problems
+
+Wall time stays around one page load however many tenants there are.
+"""
+
+import pytest
+
+from base_test_example import navigate_all
+from config_example import Tenants
+from projects_page import ProjectsPage
+
+
+class MultiTenant:
+    """One logged-in context per tenant, opened side by side."""
+
+    def __init__(self, login_cache):
+        self.login_cache = login_cache
+        self.pages = []
+
+    def open(self, tenants=None, role="admin"):
+        """{tenant: page on /dashboard}, default: every tenant in config."""
+        tenants = list(tenants or Tenants.TENANTS)
+        pages = self.login_cache.new_pages([(tenant, role) for tenant in tenants])
+        self.pages.extend(pages)
+        return dict(zip(tenants, pages))
+
+    def project_cards(self, tenants=None, role="admin", timeout=10000):
+        """{tenant: ProjectCards} as each tenant sees /projects."""
+        projects_pages = {
+            tenant: ProjectsPage(page)
+            for tenant, page in self.open(tenants, role).items()
+        }
+        navigate_all(projects_pages.values(), lambda projects_page: projects_page.click(projects_page.nav_link))
+
+        cards = {}
+        for tenant, projects_page in projects_pages.items():
+            projects_page.wait_for_cards(timeout=timeout)
+            cards[tenant] = projects_page.get_cards()
+        return cards
+
+    def close(self):
+        for page in self.pages:
+            if not page.is_closed():
+                page.context.close()
+        self.pages = []
+
+
+def isolation_problems(cards_by_tenant, owned_by_tenant=None):
+    """
+    Cross-check what every tenant sees. Returns a list of problems,
+    empty if tenants are isolated:
+    - a card labelled with another tenant
+    - another tenant's project (from owned_by_tenant) is visible
+    - a tenant can't see its own project (so the check proved nothing)
+
+    owned_by_tenant: {tenant: [project names it created]}
+    """
+    owned_by_tenant = owned_by_tenant or {}
+    problems = []
+    for viewer, cards in cards_by_tenant.items():
+        for name in cards.not_owned_by(viewer):
+            problems.append(f"{viewer} sees another tenant's card {name!r}")
+        for owner, names in owned_by_tenant.items():
+            for name in names:
+                visible = cards.has_name(name)
+                if owner == viewer and not visible:
+                    problems.append(f"{viewer} can't see its own project {name!r}")
+                elif owner != viewer and visible:
+                    problems.append(f"{viewer} sees {owner}'s project {name!r}")
+    return problems
+
+
+# Pytest fixtures
+# ===============
+
+@pytest.fixture
+def multi_tenant(login_cache):
+    """MultiTenant for this test; its contexts are closed afterwards."""
+    tenants = MultiTenant(login_cache)
+    yield tenants
+    tenants.close()
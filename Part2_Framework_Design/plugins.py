@@ -0,0 +1,37 @@
+"""
+Framework Plugins
+=================
+Pytest hooks that live in the framework modules.
+
+Each conftest.py calls register_plugins() from pytest_configure, so the
+hooks are active whichever folder pytest is started from.
+"""
+
+import importlib
+
+
+# Modules with pytest hooks
+PLUGIN_MODULES = [
+    "scheduler",
+    "readiness",
+    "asset_cache",
+    "api_replay",
+    "tracing",
+    "round_trips",
+    "consistency",
+    "web_vitals",
+    "device_matrix",
+    "async_base",
+    "result_store",
+    "dependency_index",
+    "failure_capture",
+    "memory_monitor",
+    "state_graph",
+]
+
+
+def register_plugins(config):
+    """Register each module once per pytest session."""
+    for name in PLUGIN_MODULES:
+        if not config.pluginmanager.has_plugin(name):
+            config.pluginmanager.register(importlib.import_module(name), name)
@@ -0,0 +1,232 @@
+"""
+Projects Page Object
+====================
+Reads project cards in bulk instead of one element at a time.
+
+locator(".project-card").all() + text_content() costs one browser
+round trip per card. Company2 has 50,000 projects, so that is 50,000
+round trips. Here one page.evaluate() reads a whole chunk of cards
+(names, tenant labels, ids) and returns plain lists.
+
+get_cards() reads what is rendered right now. stream_cards() scrolls
+the list to the end and yields cards batch by batch as they render:
+
+    for batch in projects_page.stream_cards():
+        assert not batch.not_owned_by("Company2")
+"""
+
+from collections import deque
+
+from base_test_example import BasePage
+from config_example import Config
+from readiness import Ready
+from tracing import traced
+
+
+# Runs inside the page. Reads cards [offset, offset + limit).
+EXTRACT_CARDS_JS = """
+([cardSel, nameSel, tenantSel, offset, limit]) => {
+    const cards = document.querySelectorAll(cardSel);
+    const end = Math.min(offset + limit, cards.length);
+    const ids = [], names = [], tenants = [];
+    for (let i = offset; i < end; i++) {
+        const card = cards[i];
+        const name = card.querySelector(nameSel);
+        const tenant = card.querySelector(tenantSel);
+        ids.push(card.dataset.projectId || card.id || "");
+        names.push((name || card).textContent.trim());
+        // No data-tenant and no label: "" (reported as not owned)
+        tenants.push(card.dataset.tenant || (tenant ? tenant.textContent.trim() : ""));
+    }
+    return {total: cards.length, ids, names, tenants};
+}
+"""
+
+
+# Runs inside the page. Reads up to `limit` cards we haven't read yet and
+# marks them. Once caught up, scrolls the list so it loads the next page.
+STREAM_CARDS_JS = """
+([listSel, cardSel, nameSel, tenantSel, limit]) => {
+    const list = document.querySelector(listSel);
+    if (!list) return {ids: [], names: [], tenants: [], pending: 0, total: null};
+    const fresh = list.querySelectorAll(`${cardSel}:not([data-streamed])`);
+    const end = Math.min(limit, fresh.length);
+    const ids = [], names = [], tenants = [];
+    for (let i = 0; i < end; i++) {
+        const card = fresh[i];
+        const name = card.querySelector(nameSel);
+        const tenant = card.querySelector(tenantSel);
+        card.dataset.streamed = "1";
+        ids.push(card.dataset.projectId || card.id || "");
+        names.push((name || card).textContent.trim());
+        tenants.push(card.dataset.tenant || (tenant ? tenant.textContent.trim() : ""));
+    }
+    if (end === fresh.length) list.scrollTop = list.scrollHeight;
+    const total = list.dataset.total;
+    return {ids, names, tenants, pending: fresh.length - end, total: total ? Number(total) : null};
+}
+"""
+
+# True once the list has rendered a card we haven't read
+HAS_FRESH_CARDS_JS = """
+([listSel, cardSel]) => {
+    const list = document.querySelector(listSel);
+    return !!list && !!list.querySelector(`${cardSel}:not([data-streamed])`);
+}
+"""
+
+
+class IncompleteList(AssertionError):
+    """The list stopped loading before reaching its total."""
+
+
+class RecentIds:
+    """
+    Remembers the last `capacity` ids. Virtualized lists only re-render
+    cards near the viewport, so duplicates are always recent and we
+    don't need to keep all 50,000 ids.
+    """
+
+    def __init__(self, capacity):
+        self.order = deque()
+        self.ids = set()
+        self.capacity = capacity
+
+    def add(self, project_id):
+        """False if project_id was seen recently."""
+        if project_id in self.ids:
+            return False
+        self.order.append(project_id)
+        self.ids.add(project_id)
+        if len(self.order) > self.capacity:
+            self.ids.discard(self.order.popleft())
+        return True
+
+
+class ProjectCards:
+    """
+    Cards as columns: ids[i], names[i] and tenants[i] are the same card.
+    """
+
+    def __init__(self, ids=None, names=None, tenants=None):
+        self.ids = ids or []
+        self.names = names or []
+        self.tenants = tenants or []
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, project_id, name, tenant):
+        self.ids.append(project_id)
+        self.names.append(name)
+        self.tenants.append(tenant)
+
+    def extend(self, chunk):
+        self.ids.extend(chunk["ids"])
+        self.names.extend(chunk["names"])
+        self.tenants.extend(chunk["tenants"])
+
+    def not_owned_by(self, tenant):
+        """
+        Names of cards whose tenant isn't exactly `tenant` (ignoring case),
+        so "Company1" doesn't pass for a "Company10" card.
+        """
+        tenant = tenant.lower()
+        return [
+            name for name, label in zip(self.names, self.tenants)
+            if label.strip().lower() != tenant
+        ]
+
+    def has_name(self, text):
+        """True if any card name contains text."""
+        return any(text in name for name in self.names)
+
+
+class ProjectsPage(BasePage):
+    """Projects list page."""
+
+    # Cards come from the projects API, so that response is "loaded"
+    READY = Ready.response("/api/v1/projects")
+    READY_TIMEOUT = Config.SLOW_TIMEOUT
+
+    def __init__(self, page):
+        super().__init__(page)
+        # Locators
+        self.project_list = "#project-list"
+        self.project_card = ".project-card"
+        self.project_name = ".project-name"
+        self.project_tenant = ".project-tenant"
+        self.nav_link = "a[href='/projects']"
+
+    def open(self, base_url):
+        """Go straight to /projects"""
+        self.goto(f"{base_url}/projects")
+
+    def open_from_nav(self):
+        """Click the Projects link in the nav bar"""
+        self.navigate(lambda: self.click(self.nav_link))
+
+    @traced("action")
+    def wait_for_cards(self, timeout=Config.SLOW_TIMEOUT):
+        """Big tenants (Company2) take a few seconds to render"""
+        self.locator(self.project_card).first.wait_for(state="visible", timeout=timeout)
+
+    @traced("action")
+    def get_cards(self, chunk_size=5000):
+        """
+        Read every rendered card.
+        One evaluate() per chunk_size cards keeps the result message small.
+        """
+        cards = ProjectCards()
+        offset = 0
+        while True:
+            chunk = self.page.evaluate(
+                EXTRACT_CARDS_JS,
+                [self.project_card, self.project_name, self.project_tenant, offset, chunk_size],
+            )
+            cards.extend(chunk)
+            offset += len(chunk["names"])
+            if offset >= chunk["total"] or not chunk["names"]:
+                return cards
+
+    def stream_cards(self, batch_size=500, idle_timeout=None, dedupe_window=10000):
+        """
+        Yield ProjectCards batches as the list renders them, scrolling it
+        for more, until the end of the list.
+
+        - Each card is yielded once; ids are de-duplicated over the last
+          dedupe_window cards, so memory doesn't grow with the list
+        - Stops when the list's data-total is reached, or nothing new
+          renders for idle_timeout ms
+        - Raises IncompleteList if it stops short of data-total
+        """
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+        idle_timeout = idle_timeout or Config.DEFAULT_TIMEOUT
+        seen = RecentIds(dedupe_window)
+        streamed = 0
+        total = None
+        args = [self.project_list, self.project_card, self.project_name, self.project_tenant, batch_size]
+
+        while True:
+            chunk = self.page.evaluate(STREAM_CARDS_JS, args)
+            total = chunk["total"] or total
+
+            batch = ProjectCards()
+            for project_id, name, tenant in zip(chunk["ids"], chunk["names"], chunk["tenants"]):
+                if not project_id or seen.add(project_id):
+                    batch.add(project_id, name, tenant)
+            if batch:
+                streamed += len(batch)
+                yield batch
+
+            if chunk["pending"]:
+                continue
+            if total is not None and streamed >= total:
+                return
+            try:
+                self.page.wait_for_function(HAS_FRESH_CARDS_JS, arg=args[:2], timeout=idle_timeout)
+            except PlaywrightTimeoutError:
+                if total is not None:
+                    raise IncompleteList(f"List stopped at {streamed} of {total} projects")
+                return
@@ -0,0 +1,256 @@
+"""
+Page Readiness
+==============
+Each page object says what "loaded" means for it, and BasePage waits
+for exactly that instead of networkidle.
+
+networkidle always costs at least 500 ms (it waits for 500 ms with no
+requests) and never fires on pages that poll. Usually we only care
+that one element is visible or one API call came back.
+
+    class DashboardPage(BasePage):
+        READY = Ready.selector(".welcome-message")
+
+    class ProjectsPage(BasePage):
+        READY = Ready.response("/api/v1/projects")
+
+    class ReportsPage(BasePage):
+        READY = Ready.predicate("() => window.chartsRendered === true")
+
+Pages without READY still wait for networkidle.
+
+Set READINESS_CALIBRATE=true to also wait for networkidle after the page
+is ready and record how much time the readiness check saved.
+"""
+
+import time
+from contextlib import AsyncExitStack, ExitStack, nullcontext
+
+from config_example import Config
+from result_store import page_key, results
+from web_vitals import vitals
+
+
+class Condition:
+    """Something to wait for after a navigation."""
+
+    def arm(self, page, timeout):
+        """Called before navigating. Returns a context manager."""
+        return nullcontext()
+
+    def wait(self, page, armed, timeout):
+        """Called after navigating, with what arm() yielded."""
+
+    async def wait_async(self, page, armed, timeout):
+        """wait() for async_playwright pages."""
+
+
+class SelectorReady(Condition):
+    def __init__(self, selector, state="visible"):
+        self.selector = selector
+        self.state = state
+
+    def wait(self, page, armed, timeout):
+        page.wait_for_selector(self.selector, state=self.state, timeout=timeout)
+
+    async def wait_async(self, page, armed, timeout):
+        await page.wait_for_selector(self.selector, state=self.state, timeout=timeout)
+
+    def __repr__(self):
+        return f"selector({self.selector!r})"
+
+
+class ResponseReady(Condition):
+    """
+    Ready when a matching response arrives. Listening starts before
+    the navigation, so a fast response can't be missed.
+    """
+
+    def __init__(self, url_part, status=200):
+        self.url_part = url_part
+        self.status = status
+
+    def _matches(self, response):
+        return self.url_part in response.url and response.status == self.status
+
+    def arm(self, page, timeout):
+        return page.expect_response(self._matches, timeout=timeout)
+
+    def wait(self, page, armed, timeout):
+        armed.value  # Blocks until the response has arrived
+
+    async def wait_async(self, page, armed, timeout):
+        await armed.value
+
+    def __repr__(self):
+        return f"response({self.url_part!r})"
+
+
+class PredicateReady(Condition):
+    """Ready when a JS expression/function in the page returns truthy."""
+
+    def __init__(self, expression):
+        self.expression = expression
+
+    def wait(self, page, armed, timeout):
+        page.wait_for_function(self.expression, timeout=timeout)
+
+    async def wait_async(self, page, armed, timeout):
+        await page.wait_for_function(self.expression, timeout=timeout)
+
+    def __repr__(self):
+        return f"predicate({self.expression!r})"
+
+
+class NetworkIdle(Condition):
+    """The old behaviour, for pages that don't declare READY."""
+
+    def wait(self, page, armed, timeout):
+        page.wait_for_load_state("networkidle", timeout=timeout)
+
+    async def wait_async(self, page, armed, timeout):
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+
+    def __repr__(self):
+        return "networkidle"
+
+
+class Ready:
+    """Shortcuts for page objects."""
+
+    selector = SelectorReady
+    response = ResponseReady
+    predicate = PredicateReady
+
+    @staticmethod
+    def all(*conditions):
+        return list(conditions)
+
+
+# Instrumentation
+# ===============
+
+class ReadinessStats:
+    """Wait time per navigation, and (when calibrating) time saved."""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, page_name, url, ready_ms, idle_ms=None):
+        self.records.append({
+            "page": page_name,
+            "url": url,
+            "ready_ms": ready_ms,
+            "networkidle_ms": idle_ms,
+            "saved_ms": None if idle_ms is None else idle_ms - ready_ms,
+        })
+
+    def summary(self):
+        """Per page: navigations, average wait, total saved."""
+        pages = {}
+        for record in self.records:
+            row = pages.setdefault(record["page"], {"navigations": 0, "ready_ms": 0.0, "saved_ms": 0.0, "calibrated": 0})
+            row["navigations"] += 1
+            row["ready_ms"] += record["ready_ms"]
+            if record["saved_ms"] is not None:
+                row["calibrated"] += 1
+                row["saved_ms"] += record["saved_ms"]
+        return pages
+
+
+stats = ReadinessStats()
+
+
+def _as_list(conditions):
+    if conditions is None:
+        return [NetworkIdle()]
+    if isinstance(conditions, Condition):
+        return [conditions]
+    return conditions
+
+
+def wait_until_ready(page, conditions, action, timeout=None, page_name="page"):
+    """
+    Run a navigation (action) and wait for the page's conditions.
+    Falls back to networkidle when no conditions are declared.
+    """
+    wait_until_all_ready([(page, conditions, action, timeout, page_name)])
+
+
+def wait_until_all_ready(navigations):
+    """
+    wait_until_ready() for several pages at once:
+
+        [(page, conditions, action, timeout, page_name), ...]
+
+    Every action is started before anything is waited for, so the pages
+    (e.g. one context per tenant) load in parallel and the total wait is
+    about the slowest page, not the sum. Returns each page's wait in ms.
+    """
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        armed = []
+        for page, conditions, action, timeout, page_name in navigations:
+            key = page_key(vitals.tenant_of(page), page_name)
+            timeout = results.timeout_for("page", key, timeout or Config.DEFAULT_TIMEOUT)
+            conditions = _as_list(conditions)
+            handles = [stack.enter_context(c.arm(page, timeout)) for c in conditions]
+            armed.append((page, conditions, handles, timeout, page_name, key))
+        for _, _, action, _, _ in navigations:
+            action()
+
+        ready_ms = []
+        for page, conditions, handles, timeout, _, _ in armed:
+            for condition, handle in zip(conditions, handles):
+                condition.wait(page, handle, timeout)
+            ready_ms.append((time.perf_counter() - start) * 1000)
+
+    for (page, _, _, timeout, page_name, key), page_ready_ms in zip(armed, ready_ms):
+        idle_ms = None
+        if Config.READINESS_CALIBRATE:
+            page.wait_for_load_state("networkidle", timeout=timeout)
+            idle_ms = (time.perf_counter() - start) * 1000
+        stats.record(page_name, page.url, page_ready_ms, idle_ms)
+        results.add("page", key, page_ready_ms)
+    return ready_ms
+
+
+async def wait_until_ready_async(page, conditions, action, timeout=None, page_name="page"):
+    """
+    wait_until_ready() for async_playwright pages; action is a coroutine
+    function. arm() results are used with `async with`.
+    """
+    key = page_key(vitals.tenant_of(page), page_name)
+    timeout = results.timeout_for("page", key, timeout or Config.DEFAULT_TIMEOUT)
+    conditions = _as_list(conditions)
+
+    start = time.perf_counter()
+    async with AsyncExitStack() as stack:
+        armed = [await stack.enter_async_context(c.arm(page, timeout)) for c in conditions]
+        await action()
+        for condition, handle in zip(conditions, armed):
+            await condition.wait_async(page, handle, timeout)
+    ready_ms = (time.perf_counter() - start) * 1000
+
+    idle_ms = None
+    if Config.READINESS_CALIBRATE:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+        idle_ms = (time.perf_counter() - start) * 1000
+
+    stats.record(page_name, page.url, ready_ms, idle_ms)
+    results.add("page", key, ready_ms)
+    return ready_ms
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+def pytest_terminal_summary(terminalreporter):
+    if not stats.records:
+        return
+    terminalreporter.section("page readiness")
+    for name, row in sorted(stats.summary().items()):
+        line = f"{name:<20} {row['navigations']:>4} navigations, avg wait {row['ready_ms'] / row['navigations']:7.0f} ms"
+        if row["calibrated"]:
+            line += f", saved vs networkidle {row['saved_ms']:8.0f} ms total"
+        terminalreporter.write_line(line)
@@ -0,0 +1,230 @@
+"""
+Result Store
+============
+Every run appends its durations to a SQLite file (Config.RESULTS_DB), so
+we know how long things took before and can spot when they get slower.
+
+Recorded per run:
+- test:  setup + call + teardown of every test, with its outcome
+- step:  each step("[STEP n] ...") of a test (see tracing.step)
+- page:  each page-object navigation's READY wait (see readiness.py),
+         per tenant ("company2 ProjectsPage") - 50,000 projects load
+         slower than 10
+
+Everything recorded during a failed test is stored as failed. Baselines
+are the last Config.BASELINE_RUNS passing samples of the same name in
+the same ENV. The end of the run lists anything significantly
+slower than its baseline: median + robust z-score (MAD), and at least
+SLOWDOWN_RATIO slower, so noisy tests don't get flagged.
+
+Derived timeouts (opt-in): with DERIVED_TIMEOUTS=true a page's READY
+wait uses TIMEOUT_FACTOR x the slowest recent navigation of that page
+for that tenant (within DERIVED_TIMEOUT_MIN/MAX) once it has enough
+history, instead of DEFAULT_TIMEOUT/SLOW_TIMEOUT. Pages a tenant hasn't
+loaded often enough keep their hardcoded timeout.
+
+    sqlite3 .test_results.sqlite "select name, avg(ms) from durations group by name"
+"""
+
+import os
+import sqlite3
+import statistics
+import time
+
+import pytest
+
+from config_example import Config
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    env TEXT NOT NULL,
+    worker TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS durations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ms REAL NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS durations_by_name ON durations (kind, name, run_id);
+"""
+
+MIN_SAMPLES = 5  # Before a baseline is trusted
+SLOWDOWN_Z = 3.5  # Robust z-score to call something slower
+SLOWDOWN_RATIO = 0.25  # ... and at least 25% slower than the median
+TIMEOUT_FACTOR = 3
+
+
+def page_key(tenant, page_name):
+    """Name page samples are stored under."""
+    return f"{tenant} {page_name}"
+
+
+def robust_z(value, samples):
+    """How many (MAD-based) standard deviations value is above the median."""
+    median = statistics.median(samples)
+    mad = statistics.median(abs(s - median) for s in samples) * 1.4826
+    if mad == 0:
+        return float("inf") if value > median else 0.0
+    return (value - median) / mad
+
+
+class ResultStore:
+    """This run's durations (buffered) plus baselines from earlier runs."""
+
+    def __init__(self, path=None, env=None):
+        self.path = path or Config.RESULTS_DB
+        self.env = env or Config.ENV
+        self.rows = []  # (kind, name, ms, outcome) for this run
+        self._baselines = None  # (kind, name) -> [ms], newest first
+        self.current_test = None
+        self._test_rows = 0  # Where the running test's rows start
+        self._step = None  # (test, name, start) of the running step
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)  # Workers finish at about the same time
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+        return db
+
+    # Recording
+
+    def add(self, kind, name, ms, outcome="passed"):
+        self.rows.append((kind, name, ms, outcome))
+
+    def begin_test(self, nodeid):
+        self.current_test = nodeid
+        self._test_rows = len(self.rows)
+
+    def test_failed(self):
+        """Keep the running test's steps and page loads out of the baselines."""
+        for i in range(self._test_rows, len(self.rows)):
+            kind, name, ms, _ = self.rows[i]
+            self.rows[i] = (kind, name, ms, "failed")
+
+    def step(self, name):
+        """End the previous step (if any) and start timing name."""
+        self.end_step()
+        if self.current_test:
+            self._step = (self.current_test, name, time.perf_counter())
+
+    def end_step(self, outcome="passed"):
+        if self._step:
+            test, name, start = self._step
+            self.add("step", f"{test} :: {name}", (time.perf_counter() - start) * 1000, outcome)
+            self._step = None
+
+    def save(self):
+        """Write this run in one transaction."""
+        if not self.rows:
+            return
+        self.baselines()  # Read before this run is in the file
+        with self._connect() as db:
+            run_id = db.execute(
+                "INSERT INTO runs (started, env, worker) VALUES (?, ?, ?)",
+                (time.time(), self.env, os.getenv("WORKER_ID", "main")),
+            ).lastrowid
+            db.executemany(
+                "INSERT INTO durations (run_id, kind, name, ms, outcome) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in self.rows],
+            )
+        db.close()
+
+    # Baselines
+
+    def baselines(self):
+        """Last BASELINE_RUNS passing samples per (kind, name), read once."""
+        if self._baselines is None:
+            self._baselines = {}
+            if os.path.exists(self.path):
+                db = self._connect()
+                # Limited in SQL, so a growing file doesn't mean more rows read into Python
+                rows = db.execute(
+                    "SELECT kind, name, ms FROM ("
+                    " SELECT d.kind, d.name, d.ms, d.run_id, ROW_NUMBER() OVER ("
+                    "  PARTITION BY d.kind, d.name ORDER BY d.run_id DESC) AS age"
+                    " FROM durations d JOIN runs r ON r.id = d.run_id"
+                    " WHERE r.env = ? AND d.outcome = 'passed'"
+                    ") WHERE age <= ? ORDER BY run_id DESC",
+                    (self.env, Config.BASELINE_RUNS),
+                )
+                for kind, name, ms in rows:
+                    self._baselines.setdefault((kind, name), []).append(ms)
+                db.close()
+        return self._baselines
+
+    def slowdowns(self):
+        """[(kind, name, baseline median, this run, z)] slowest change first."""
+        current = {}
+        for kind, name, ms, outcome in self.rows:
+            if outcome == "passed":
+                current.setdefault((kind, name), []).append(ms)
+
+        found = []
+        baselines = self.baselines()
+        for key, values in current.items():
+            history = baselines.get(key, [])
+            if len(history) < MIN_SAMPLES:
+                continue
+            now = statistics.median(values)
+            median = statistics.median(history)
+            z = robust_z(now, history)
+            if z >= SLOWDOWN_Z and now >= median * (1 + SLOWDOWN_RATIO):
+                found.append((*key, median, now, z))
+        return sorted(found, key=lambda row: -(row[3] / row[2]))
+
+    def timeout_for(self, kind, name, default):
+        """Derived timeout (ms) for name, or default without enough history."""
+        history = self.baselines().get((kind, name), []) if Config.DERIVED_TIMEOUTS else []
+        if len(history) < MIN_SAMPLES:
+            return default
+        derived = max(history) * TIMEOUT_FACTOR
+        return int(min(max(derived, Config.DERIVED_TIMEOUT_MIN), Config.DERIVED_TIMEOUT_MAX))
+
+
+results = ResultStore()
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+_tests = {}  # nodeid -> [ms, outcome]
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    results.begin_test(item.nodeid)
+
+
+def pytest_runtest_logreport(report):
+    row = _tests.setdefault(report.nodeid, [0.0, "passed"])
+    row[0] += report.duration * 1000
+    if report.failed:
+        row[1] = "failed"
+    elif report.skipped and row[1] == "passed":
+        row[1] = "skipped"
+    if report.when == "call":
+        results.end_step("failed" if report.failed else "passed")
+    if report.failed:
+        results.test_failed()
+
+
+def pytest_sessionfinish(session):
+    for nodeid, (ms, outcome) in _tests.items():
+        results.add("test", nodeid, ms, outcome)
+    results.save()
+
+
+def pytest_terminal_summary(terminalreporter):
+    slower = results.slowdowns()
+    if not slower:
+        return
+    terminalreporter.section(f"slower than baseline ({results.env})")
+    for kind, name, median, now, z in slower:
+        terminalreporter.write_line(
+            f"{kind:<5} {median / 1000:6.1f} s -> {now / 1000:6.1f} s ({(now - median) / median:+.0%}, z {z:.1f})  {name}"
+        )
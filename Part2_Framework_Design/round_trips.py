@@ -0,0 +1,84 @@
+"""
+Round Trip Counter
+==================
+Counts how many messages each BasePage action sends to the browser.
+
+Every Playwright call is a message to the driver and usually a reply
+back, so fewer messages per action is the thing to optimise. The count
+comes from Playwright's own message id counter on the connection, so it
+includes everything an action does (waits, retries, evaluate calls).
+
+    @counted
+    def click(self, selector): ...
+
+Only the outermost counted call is recorded: goto() calls navigate(),
+and its messages are counted once, as goto's.
+
+The counter is per connection, so it also includes messages sent by
+route handlers while the action runs (asset_cache.py, api_replay.py
+fulfilling requests). The report says so.
+
+The end of the run prints messages per action across the suite.
+
+Note: the counter is a private Playwright attribute; if it goes away in
+a future version counting just switches itself off.
+"""
+
+import functools
+import threading
+
+
+def messages_sent(page):
+    """Messages sent so far on page's driver connection, or None."""
+    impl = getattr(page, "_impl_obj", None)
+    return getattr(getattr(impl, "_connection", None), "_last_id", None)
+
+
+class RoundTripStats:
+    """Calls and messages per action name."""
+
+    def __init__(self):
+        self.actions = {}  # name -> [calls, messages]
+
+    def record(self, name, messages):
+        row = self.actions.setdefault(name, [0, 0])
+        row[0] += 1
+        row[1] += messages
+
+    def summary(self):
+        """[(name, calls, messages, per call)] most messages first."""
+        rows = [(name, calls, messages, messages / calls) for name, (calls, messages) in self.actions.items()]
+        return sorted(rows, key=lambda row: -row[2])
+
+
+stats = RoundTripStats()
+
+_depth = threading.local()  # Counted calls running on this thread
+
+
+def counted(func):
+    """Record the messages a page object method sends (outermost call only)."""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        depth = getattr(_depth, "value", 0)
+        before = messages_sent(self.page) if depth == 0 else None
+        _depth.value = depth + 1
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            _depth.value = depth
+            if before is not None:
+                stats.record(f"{type(self).__name__}.{func.__name__}", messages_sent(self.page) - before)
+    return wrapper
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+def pytest_terminal_summary(terminalreporter):
+    if not stats.actions:
+        return
+    terminalreporter.section("browser round trips")
+    terminalreporter.write_line("(messages include route handlers that ran during the action: asset cache, API replay)")
+    for name, calls, messages, per_call in stats.summary():
+        terminalreporter.write_line(f"{name:<32} {calls:>6} calls {messages:>8} messages {per_call:6.1f} per call")
@@ -0,0 +1,281 @@
+"""
+Tenant-Sharded Parallel Runner
+==============================
+Splits the suite across Config.PARALLEL_WORKERS pytest processes.
+
+- Tests for the same tenant always run on the same worker, so the
+  saved login and browser contexts get reused, and two workers never
+  change the same company's data at the same time.
+- Tests that touch several tenants glue those tenants together.
+- Groups are handed out longest-first (using durations from earlier
+  runs) to whichever worker has the least work so far.
+- Durations are a moving average over runs, so one slow or fast run
+  doesn't throw the next plan off.
+
+Mark tests with the tenants they use (otherwise the tenant name is
+looked for in the test id):
+
+    @pytest.mark.tenant("company1", "company2")
+
+Run:
+    python scheduler.py ../Part1_Flaky_Tests/fixed_code.py ../Part3_Integration_Test
+    WORKERS=8 python scheduler.py <any pytest args>
+"""
+
+import heapq
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from config_example import Config, Tenants
+
+
+# Used to talk to the pytest worker processes
+ENV_COLLECT_OUT = "SCHEDULER_COLLECT_OUT"
+ENV_SHARD = "SCHEDULER_SHARD"
+ENV_DURATIONS_OUT = "SCHEDULER_DURATIONS_OUT"
+
+DEFAULT_DURATION = 5.0  # Seconds, for tests we've never timed
+DURATION_WEIGHT = 0.3  # Of the latest run in the moving average
+
+
+# Pytest hooks (registered by conftest.py via plugins.py)
+# =======================================================
+
+# The tenant marker is registered in the root conftest.py
+
+def tenants_for(item):
+    """Tenants from @pytest.mark.tenant, else from the test id (whole names:
+    "company1" isn't found in "company12")."""
+    tenants = set()
+    for marker in item.iter_markers("tenant"):
+        tenants.update(marker.args)
+    if not tenants:
+        tenants = {
+            tenant for tenant in Tenants.TENANTS
+            if re.search(rf"(?<![A-Za-z0-9]){re.escape(tenant)}(?![A-Za-z0-9])", item.nodeid)
+        }
+    return sorted(tenants)
+
+
+def pytest_collection_modifyitems(config, items):
+    # Worker: only run this shard's tests
+    shard_file = os.getenv(ENV_SHARD)
+    if shard_file:
+        wanted = set(Path(shard_file).read_text().split("\n"))
+        deselected = [item for item in items if item.nodeid not in wanted]
+        items[:] = [item for item in items if item.nodeid in wanted]
+        config.hook.pytest_deselected(items=deselected)
+
+
+def pytest_collection_finish(session):
+    # Collection pass: tell the scheduler what exists. Runs after every
+    # pytest_collection_modifyitems, so tests dropped by
+    # dependency_index's selection aren't planned
+    collect_out = os.getenv(ENV_COLLECT_OUT)
+    if collect_out:
+        tests = [{"nodeid": item.nodeid, "tenants": tenants_for(item)} for item in session.items]
+        Path(collect_out).write_text(json.dumps(tests))
+
+
+_durations = {}
+
+
+def pytest_runtest_logreport(report):
+    # setup + call + teardown
+    _durations[report.nodeid] = _durations.get(report.nodeid, 0) + report.duration
+
+
+def pytest_sessionfinish(session):
+    durations_out = os.getenv(ENV_DURATIONS_OUT)
+    if durations_out:
+        Path(durations_out).write_text(json.dumps(_durations))
+
+
+# Duration history
+# ================
+
+def load_durations(path=None):
+    path = Path(path or Config.DURATIONS_FILE)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_durations(durations, path=None):
+    Path(path or Config.DURATIONS_FILE).write_text(json.dumps(durations, indent=2, sort_keys=True))
+
+
+def smooth(durations, latest, weight=DURATION_WEIGHT):
+    """Fold one run's durations into the history (exponential moving average)."""
+    for nodeid, seconds in latest.items():
+        previous = durations.get(nodeid)
+        durations[nodeid] = seconds if previous is None else previous + weight * (seconds - previous)
+
+
+# Planning
+# ========
+
+class Shard:
+    """Tests for one worker."""
+
+    def __init__(self, worker):
+        self.worker = worker
+        self.tests = []
+        self.tenants = set()
+        self.expected = 0.0
+
+    def __lt__(self, other):
+        return (self.expected, self.worker) < (other.expected, other.worker)
+
+
+def group_by_tenant(tests):
+    """
+    Units that must stay on one worker.
+    Tenants used together by any test end up in the same unit.
+    """
+    parent = {}
+
+    def find(tenant):
+        parent.setdefault(tenant, tenant)
+        while parent[tenant] != tenant:
+            parent[tenant] = parent[parent[tenant]]
+            tenant = parent[tenant]
+        return tenant
+
+    for test in tests:
+        for tenant in test["tenants"][1:]:
+            parent[find(tenant)] = find(test["tenants"][0])
+
+    groups = {}
+    units = []
+    for test in tests:
+        if test["tenants"]:
+            root = find(test["tenants"][0])
+            groups.setdefault(root, []).append(test)
+        else:
+            units.append([test])  # No tenant: can go anywhere
+    return list(groups.values()) + units
+
+
+def plan(tests, durations, workers):
+    """Longest unit first, onto the least loaded worker."""
+    known = [durations[t["nodeid"]] for t in tests if t["nodeid"] in durations]
+    default = statistics.median(known) if known else DEFAULT_DURATION
+
+    def cost(test):
+        return durations.get(test["nodeid"], default)
+
+    units = sorted(group_by_tenant(tests), key=lambda unit: -sum(map(cost, unit)))
+    shards = [Shard(worker) for worker in range(workers)]
+    heap = list(shards)
+    heapq.heapify(heap)
+
+    for unit in units:
+        shard = heapq.heappop(heap)
+        shard.tests.extend(test["nodeid"] for test in unit)
+        shard.tenants.update(tenant for test in unit for tenant in test["tenants"])
+        shard.expected += sum(map(cost, unit))
+        heapq.heappush(heap, shard)
+
+    return [shard for shard in shards if shard.tests]
+
+
+# Running
+# =======
+
+def worker_env(**extra):
+    """Make sure workers can import the framework modules."""
+    env = dict(os.environ, **extra)
+    here = str(Path(__file__).resolve().parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [here, env.get("PYTHONPATH")]))
+    return env
+
+
+def collect(pytest_args, tmp_dir):
+    out = Path(tmp_dir) / "collected.json"
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args],
+        env=worker_env(**{ENV_COLLECT_OUT: str(out)}),
+        stdout=subprocess.DEVNULL,
+        check=False,
+    )
+    return json.loads(out.read_text()) if out.exists() else []
+
+
+def run(pytest_args, workers=None):
+    """Collect, plan, run the shards in parallel and print a report."""
+    workers = workers or Config.PARALLEL_WORKERS
+    durations = load_durations()
+
+    started = time.time()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = collect(pytest_args, tmp_dir)
+        if not tests:
+            print("No tests collected")
+            return 5  # pytest's "no tests" exit code
+        shards = plan(tests, durations, workers)
+
+        start = time.perf_counter()
+        running = []
+        for shard in shards:
+            shard_file = Path(tmp_dir) / f"shard-{shard.worker}.txt"
+            shard_file.write_text("\n".join(shard.tests))
+            shard.durations_file = Path(tmp_dir) / f"durations-{shard.worker}.json"
+            process = subprocess.Popen(
+                [sys.executable, "-m", "pytest", "-q", *pytest_args],
+                env=worker_env(**{
+                    ENV_SHARD: str(shard_file),
+                    ENV_DURATIONS_OUT: str(shard.durations_file),
+                    "WORKER_ID": f"gw{shard.worker}",
+                }),
+            )
+            running.append((shard, process))
+
+        # Poll so each worker's finish time is recorded when it happens
+        exit_code = 0
+        while running:
+            for shard, process in list(running):
+                if process.poll() is None:
+                    continue
+                running.remove((shard, process))
+                shard.actual = time.perf_counter() - start
+                exit_code = max(exit_code, process.returncode)
+                if shard.durations_file.exists():
+                    smooth(durations, json.loads(shard.durations_file.read_text()))
+            time.sleep(0.05)
+
+    save_durations(durations)
+    print_report(shards)
+
+    from tracing import merge_reports  # Only the merge needs it
+    merged = merge_reports([f"gw{shard.worker}" for shard in shards], since=started)
+    if merged:
+        print(f"Merged trace of all workers: {merged}")
+    return exit_code
+
+
+def print_report(shards):
+    makespan = max(shard.actual for shard in shards)
+    print("\n" + "=" * 64)
+    print("Parallel run report")
+    print("=" * 64)
+    print(f"{'worker':<8}{'tests':>6}{'expected':>11}{'actual':>9}{'busy':>8}  tenants")
+    for shard in shards:
+        busy = shard.actual / makespan * 100 if makespan else 100
+        tenants = ", ".join(sorted(shard.tenants)) or "-"
+        print(
+            f"gw{shard.worker:<6}{len(shard.tests):>6}{shard.expected:>10.1f}s"
+            f"{shard.actual:>8.1f}s{busy:>7.0f}%  {tenants}"
+        )
+    total = sum(shard.actual for shard in shards)
+    utilization = total / (makespan * len(shards)) * 100 if makespan else 100
+    print(f"\nMakespan: {makespan:.1f}s   Utilization: {utilization:.0f}%")
+
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv[1:]))
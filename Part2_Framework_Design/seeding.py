@@ -0,0 +1,216 @@
+"""
+Test Data Seeding
+=================
+Creates lots of test data through APIHelper quickly, and always
+cleans it up.
+
+- Projects are created in batches on a thread pool, for several
+  tenants at the same time (each tenant has its own pooled session)
+- Every created id is written to a journal file as soon as its create
+  returns, so data from a crashed run is still cleaned up next time
+  (and a failed create doesn't lose the rest of its batch)
+- teardown() deletes everything in parallel at the end
+
+    seeder = Seeder()
+    ids = seeder.create_projects({
+        "company1": [{"name": "Load 1", "description": "..."}, ...],
+        "company2": [...],
+    })
+    ...
+    seeder.teardown()
+
+Or use the `seeder` fixture.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pytest
+import requests
+
+from api_helper import APIHelper
+from config_example import Config, Tenants
+
+
+def default_api(tenant):
+    """APIHelper for a tenant from config."""
+    tenant_config = Tenants.TENANTS[tenant]
+    return APIHelper(tenant_config["url"], tenant_config["api_token"], tenant)
+
+
+class Seeder:
+    """Creates, tracks and deletes test data."""
+
+    def __init__(self, api_for=default_api, journal_dir=None, batch_size=None, workers=None):
+        self.api_for = api_for
+        self.journal_dir = Path(journal_dir or Config.SEED_JOURNAL_DIR)
+        self.journal_path = self.journal_dir / f"{os.getpid()}.jsonl"
+        self.batch_size = batch_size or Config.SEED_BATCH_SIZE
+        self.workers = workers or Config.API_POOL_SIZE
+        self.apis = {}
+        self.created = []  # (tenant, project id) - the registry
+        self.lock = threading.Lock()  # Tenants write to the journal at the same time
+
+    def api(self, tenant):
+        if tenant not in self.apis:
+            self.apis[tenant] = self.api_for(tenant)
+        return self.apis[tenant]
+
+    # Journal
+
+    def _journal(self, op, records):
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        with self.lock, open(self.journal_path, "a") as journal:
+            for tenant, project_id in records:
+                journal.write(json.dumps({"op": op, "tenant": tenant, "id": project_id}) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    @staticmethod
+    def _read_journal(path):
+        """(tenant, id) pairs created but not deleted."""
+        alive = {}
+        for line in path.read_text().splitlines():
+            if not line.strip():
+                continue  # Partial last line after a crash
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            key = (record["tenant"], record["id"])
+            if record["op"] == "created":
+                alive[key] = True
+            else:
+                alive.pop(key, None)
+        return list(alive)
+
+    # Create
+
+    def create_projects(self, specs_by_tenant):
+        """
+        Create projects for several tenants at once.
+        specs_by_tenant: {tenant: [{"name", "description", "team_members"?}, ...]}
+        Returns {tenant: [ids]} in the same order as the specs.
+        """
+        if not specs_by_tenant:
+            return {}
+        with ThreadPoolExecutor(self.workers * len(specs_by_tenant)) as pool:
+            futures = {
+                tenant: pool.submit(self._create_for_tenant, tenant, specs)
+                for tenant, specs in specs_by_tenant.items()
+            }
+            return {tenant: future.result() for tenant, future in futures.items()}
+
+    def _create_for_tenant(self, tenant, specs):
+        api = self.api(tenant)
+        ids = []
+        with ThreadPoolExecutor(self.workers) as pool:
+            for start in range(0, len(specs), self.batch_size):
+                batch = specs[start:start + self.batch_size]
+                futures = {pool.submit(api.create_project, **spec): i for i, spec in enumerate(batch)}
+                batch_ids = [None] * len(batch)
+                error = None
+                for future in as_completed(futures):
+                    try:
+                        project = future.result()
+                    except Exception as e:
+                        error = error or e  # Keep recording the others first
+                        continue
+                    record = (tenant, project["id"])
+                    self._journal("created", [record])
+                    self.created.append(record)
+                    batch_ids[futures[future]] = project["id"]
+                if error:
+                    raise error
+                ids.extend(batch_ids)
+        return ids
+
+    # Delete
+
+    def teardown(self):
+        """Delete everything this seeder created."""
+        failed = self._delete(self.created)
+        self.created = failed
+        if not failed and self.journal_path.exists():
+            self.journal_path.unlink()
+        return failed
+
+    def _delete(self, records):
+        """Delete in parallel. Returns the records that couldn't be deleted."""
+        by_tenant = {}
+        for tenant, project_id in records:
+            by_tenant.setdefault(tenant, []).append(project_id)
+        if not by_tenant:
+            return []
+
+        with ThreadPoolExecutor(len(by_tenant)) as pool:
+            results = pool.map(self._delete_for_tenant, by_tenant, by_tenant.values())
+            return [record for failed in results for record in failed]
+
+    def _delete_for_tenant(self, tenant, project_ids):
+        api = self.api(tenant)
+
+        def delete(project_id):
+            try:
+                api.delete_project(project_id)
+            except requests.HTTPError as error:
+                # Already gone is fine, anything else isn't
+                return error.response is not None and error.response.status_code == 404
+            except requests.RequestException:
+                return False
+            return True
+
+        failed = []
+        with ThreadPoolExecutor(self.workers) as pool:
+            for start in range(0, len(project_ids), self.batch_size):
+                batch = project_ids[start:start + self.batch_size]
+                results = list(pool.map(delete, batch))
+                self._journal("deleted", [(tenant, i) for i, ok in zip(batch, results) if ok])
+                failed.extend((tenant, i) for i, ok in zip(batch, results) if not ok)
+        return failed
+
+    def recover(self):
+        """
+        Clean up after runs that crashed before teardown().
+        Skips journals of processes that are still running.
+        """
+        leftovers = []
+        if not self.journal_dir.exists():
+            return leftovers
+        for path in self.journal_dir.glob("*.jsonl"):
+            if path == self.journal_path or not path.stem.isdigit() or _pid_alive(int(path.stem)):
+                continue
+            records = self._read_journal(path)
+            failed = self._delete(records)
+            leftovers.extend(failed)
+            if failed:
+                # Retry at our teardown, and keep them in our own journal
+                self._journal("created", failed)
+                self.created.extend(failed)
+            path.unlink()
+        return leftovers
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, just not ours
+    return True
+
+
+# Pytest fixtures
+# ===============
+
+@pytest.fixture(scope="session")
+def seeder():
+    """Session-wide seeder; cleans crashed runs first, everything at the end."""
+    seeder = Seeder()
+    seeder.recover()
+    yield seeder
+    seeder.teardown()
@@ -0,0 +1,246 @@
+"""
+Precondition State Graph
+========================
+Build an expensive starting point once per worker, then restore it.
+
+A state has a name, a parent state and the steps that get from the
+parent to it:
+
+    login -> "company1 admin logged in"          (login_cache: login + 2FA)
+          -> "company1 admin on projects page"   (open /projects, wait for cards)
+          -> your own states on top (seed data, open a project, ...)
+
+The first test that asks for a state builds it (restoring its parent
+first) and a snapshot is kept: storage state + URL + the data the steps
+returned (e.g. seeded project ids). Later tests get a new context
+restored from the snapshot and only load the URL, instead of replaying
+the chain. A state's ready(page) runs after that load, so a restored
+page is in the same state a built one is in (e.g. cards rendered, not
+just the projects API answered).
+
+    @pytest.fixture
+    def seeded_projects(state_graph, seeder):
+        def seed(page, data):
+            data["ids"] = seeder.create_projects({"company1": specs})["company1"]
+            ProjectsPage(page).goto(page.url)
+        state_graph.define("company1 admin with 20 projects", seed,
+                           parent="company1 admin on projects page", page_class=ProjectsPage,
+                           ready=lambda page: ProjectsPage(page).wait_for_cards())
+
+    def test_something(state, seeded_projects):
+        page, data = state("company1 admin with 20 projects")
+
+"<tenant> <role> logged in" and "<tenant> <role> on projects page" are
+defined automatically. The end of the run shows builds, restores and
+time saved per state.
+"""
+
+import re
+import time
+
+import pytest
+
+from api_replay import replay
+from dependency_index import index
+from projects_page import ProjectsPage
+from web_vitals import vitals
+
+
+# Defined automatically for every tenant and role
+LOGGED_IN = re.compile(r"(\w+) (\w+) logged in$")
+ON_PROJECTS = re.compile(r"(\w+) (\w+) on projects page$")
+
+
+class State:
+    def __init__(self, name, steps=None, parent=None, page_class=None, ready=None):
+        self.name = name
+        self.steps = steps  # steps(page, data) on a page in the parent state
+        self.parent = parent
+        self.page_class = page_class  # Its READY is waited for on restore
+        self.ready = ready  # ready(page): the steps' last wait, repeated on restore
+
+
+class Snapshot:
+    def __init__(self, storage_state, url, data, tenant, build_ms):
+        self.storage_state = storage_state
+        self.url = url
+        self.data = data
+        self.tenant = tenant
+        self.build_ms = build_ms  # Whole chain, from a fresh context
+
+
+class StateGraph:
+    """State definitions plus this worker's snapshots."""
+
+    def __init__(self, factory, login_cache):
+        self.factory = factory
+        self.login_cache = login_cache
+        self.states = {}
+        self.snapshots = {}
+        self.stats = {}  # name -> {"builds", "restores", "build_ms", "restore_ms"}
+
+    def define(self, name, steps, parent=None, page_class=None, ready=None):
+        if name not in self.states:
+            self.states[name] = State(name, steps, parent, page_class, ready)
+        return name
+
+    def _state(self, name):
+        if name not in self.states:
+            logged_in, on_projects = LOGGED_IN.match(name), ON_PROJECTS.match(name)
+            if logged_in:
+                self.states[name] = State(name)  # Root: login_cache logs in
+            elif on_projects:
+                tenant, role = on_projects.groups()
+                self.define(name, _open_projects, f"{tenant} {role} logged in", ProjectsPage, _cards_rendered)
+            else:
+                raise KeyError(f"Unknown state {name!r}; define() it first")
+        return self.states[name]
+
+    def _row(self, name):
+        return self.stats.setdefault(name, {"builds": 0, "restores": 0, "build_ms": 0.0, "restore_ms": 0.0})
+
+    # Building and restoring
+
+    def open(self, name):
+        """(page, data) in the named state. The caller closes page.context."""
+        with replay.shared():  # Built or restored depends on test order
+            return self._open(name)
+
+    def _open(self, name):
+        snapshot = self.snapshots.get(name)
+        if snapshot:
+            page = self._restore(name, snapshot)
+            if page:
+                return page, dict(snapshot.data)
+            del self.snapshots[name]  # Session gone on the server; build again
+        return self._build(name)
+
+    def _build(self, name):
+        with index.built(f"state:{name}"):  # Tests restoring it depend on all of this
+            return self._build_chain(name)
+
+    def _build_chain(self, name):
+        state = self._state(name)
+        start = time.perf_counter()
+        if state.parent is None:
+            tenant, role = LOGGED_IN.match(name).groups()
+            page, data, parent_ms = self.login_cache.new_page(tenant, role), {}, 0.0
+        else:
+            page, data = self.open(state.parent)
+            tenant = self.snapshots[state.parent].tenant
+            parent_ms = self.snapshots[state.parent].build_ms
+            start = time.perf_counter()  # The parent's own build/restore is counted separately
+        try:
+            if state.steps:
+                state.steps(page, data)
+            storage_state = page.context.storage_state()
+        except Exception:
+            page.context.close()
+            raise
+
+        build_ms = parent_ms + (time.perf_counter() - start) * 1000
+        self.snapshots[name] = Snapshot(storage_state, page.url, dict(data), tenant, build_ms)
+        row = self._row(name)
+        row["builds"] += 1
+        row["build_ms"] += build_ms
+        return page, data
+
+    def _restore(self, name, snapshot):
+        """New context from the snapshot, or None if it's logged out."""
+        state = self._state(name)
+        start = time.perf_counter()
+        context = self.factory.new_context(storage_state=snapshot.storage_state)
+        vitals.set_tenant(context, snapshot.tenant)
+        try:
+            page = context.new_page()
+            if state.page_class:
+                state.page_class(page).goto(snapshot.url)
+            else:
+                page.goto(snapshot.url)
+            if state.ready and "/login" not in page.url:
+                state.ready(page)
+        except Exception:
+            context.close()
+            raise
+        if "/login" in page.url:
+            context.close()
+            return None
+
+        index.reuse(f"state:{name}")
+        row = self._row(name)
+        row["restores"] += 1
+        row["restore_ms"] += (time.perf_counter() - start) * 1000
+        return page
+
+    def report(self):
+        """[(name, builds, restores, build ms, avg restore ms, saved ms)]"""
+        rows = []
+        for name, row in self.stats.items():
+            build_ms = row["build_ms"] / row["builds"]  # A state is always built before it's restored
+            restore_ms = row["restore_ms"] / row["restores"] if row["restores"] else 0.0
+            saved = row["restores"] * (build_ms - restore_ms)
+            rows.append((name, row["builds"], row["restores"], build_ms, restore_ms, saved))
+        return sorted(rows, key=lambda r: -r[5])
+
+
+def _open_projects(page, data):
+    """'... logged in' (on /dashboard) -> '... on projects page'"""
+    projects_page = ProjectsPage(page)
+    projects_page.open_from_nav()
+    _cards_rendered(page)
+
+
+def _cards_rendered(page):
+    """ProjectsPage.READY is the API response; the cards render after it."""
+    ProjectsPage(page).wait_for_cards()
+
+
+_graph = None
+
+
+# Pytest fixtures
+# ===============
+
+@pytest.fixture(scope="session")
+def state_graph(browser_factory, login_cache):
+    """This worker's states and snapshots."""
+    global _graph
+    _graph = StateGraph(browser_factory, login_cache)
+    return _graph
+
+
+@pytest.fixture
+def state(state_graph):
+    """
+    Pages in a named state:
+
+        page, data = state("company1 admin on projects page")
+    """
+    pages = []
+
+    def open_state(name):
+        page, data = state_graph.open(name)
+        pages.append(page)
+        return page, data
+
+    yield open_state
+
+    for page in pages:
+        page.context.close()
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+def pytest_terminal_summary(terminalreporter):
+    if not (_graph and _graph.stats):
+        return
+    terminalreporter.section("precondition states")
+    total = 0.0
+    for name, builds, restores, build_ms, restore_ms, saved in _graph.report():
+        total += saved
+        terminalreporter.write_line(
+            f"{name:<40} built {builds}x ({build_ms:6.0f} ms)  restored {restores}x ({restore_ms:6.0f} ms)  "
+            f"saved {saved / 1000:6.1f} s"
+        )
+    terminalreporter.write_line(f"Total saved: {total / 1000:.1f} s")
@@ -0,0 +1,344 @@
+"""
+Step Timing and Trace Report
+============================
+Records how long everything takes, as nested spans:
+
+    test -> setup/call/teardown -> fixture / step -> action / api
+
+- BasePage actions (goto, click, fill, ...) and APIHelper calls are
+  recorded automatically
+- Tests mark their steps with step("[STEP 1] Creating project via API...")
+  (it also prints the line, like the old print() did)
+- Fixture setup and teardown and each test phase come from pytest hooks
+
+With TRACE=true each worker writes to Config.TRACE_DIR:
+- trace-<worker>.json - Chrome trace format, open it in
+  chrome://tracing or https://ui.perfetto.dev for a flame graph
+- summary-<worker>.html - slowest tests, actions and selectors
+
+After a scheduler.py run the workers' files are merged into
+trace-all.json (one process row per worker, on one timeline) and
+summary-all.html (aggregated over the whole run).
+"""
+
+import functools
+import html
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from config_example import Config
+from failure_capture import capture
+from result_store import results
+
+
+class Span:
+    __slots__ = ("id", "parent", "name", "kind", "target", "test", "thread", "start", "end")
+
+    def __init__(self, span_id, parent, name, kind, target, test):
+        self.id = span_id
+        self.parent = parent
+        self.name = name
+        self.kind = kind
+        self.target = target  # Selector, URL or endpoint
+        self.test = test
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter_ns()
+        self.end = None
+
+    @property
+    def duration_ms(self):
+        return (self.end - self.start) / 1e6
+
+
+class Tracer:
+    """Collects spans for this process. Cheap no-op when disabled."""
+
+    def __init__(self, enabled=None):
+        self.enabled = Config.TRACE if enabled is None else enabled
+        self.spans = []
+        self.origin = time.perf_counter_ns()
+        self.origin_wall = time.time()  # Lines up workers' traces when merging
+        self.current_test = None
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def start(self, name, kind, target=None):
+        stack = self._stack()
+        parent = stack[-1].id if stack else None
+        span = Span(next(self._ids), parent, name, kind, target, self.current_test)
+        stack.append(span)
+        return span
+
+    def finish(self, span):
+        span.end = time.perf_counter_ns()
+        stack = self._stack()
+        # Close anything left open inside this span (e.g. the last step)
+        while stack and stack[-1] is not span:
+            self.finish(stack[-1])
+        if stack:
+            stack.pop()
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name, kind, target=None):
+        if not self.enabled:
+            yield None
+            return
+        span = self.start(name, kind, target)
+        try:
+            yield span
+        finally:
+            self.finish(span)
+
+    def step(self, name):
+        """End the previous step (if any) and start a new one."""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        if stack and stack[-1].kind == "step":
+            self.finish(stack[-1])
+        self.start(name, "step")
+
+
+tracer = Tracer()
+
+
+def step(name):
+    """Mark a test step in the trace (and print it)."""
+    print(f"\n{name}")
+    tracer.step(name)
+    results.step(name)
+
+
+def traced(kind):
+    """
+    Decorator for page object methods.
+    A string first argument (selector or URL) is kept as the target.
+    Also feeds failure_capture's action buffer.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            target = args[0] if args and isinstance(args[0], str) else None
+            if capture.enabled:
+                capture.action(self.page, f"{type(self).__name__}.{func.__name__}", target)
+            if not tracer.enabled:
+                return func(self, *args, **kwargs)
+            with tracer.span(f"{type(self).__name__}.{func.__name__}", kind, target):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def endpoint(url):
+    """/api/v1/projects/123 -> /api/v1/projects/{id} (so calls group together)"""
+    path = re.sub(r"^https?://[^/]+", "", url).split("?")[0]
+    return re.sub(r"/\d+(?=/|$)", "/{id}", path)
+
+
+# Reports
+# =======
+
+def chrome_trace(spans, origin, origin_wall=None, worker=None):
+    """Chrome trace-event JSON ("X" = complete event)."""
+    pid = os.getpid()
+    return {"otherData": {"worker": worker, "origin_wall": origin_wall}, "traceEvents": [
+        {
+            "name": span.name,
+            "cat": span.kind,
+            "ph": "X",
+            "ts": (span.start - origin) / 1000,
+            "dur": (span.end - span.start) / 1000,
+            "pid": pid,
+            "tid": span.thread,
+            "args": {"target": span.target, "test": span.test},
+        }
+        for span in spans
+    ]}
+
+
+def aggregate(spans, key):
+    """{key: {"count", "total_ms", "max_ms"}} sorted by total, slowest first."""
+    rows = {}
+    for span in spans:
+        name = key(span)
+        if name is None:
+            continue
+        row = rows.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        row["count"] += 1
+        row["total_ms"] += span.duration_ms
+        row["max_ms"] = max(row["max_ms"], span.duration_ms)
+    return sorted(rows.items(), key=lambda item: -item[1]["total_ms"])
+
+
+def action_name(span):
+    """BasePage.click #login-btn (API span names already have the path)"""
+    if span.kind == "api" or not span.target:
+        return span.name
+    return f"{span.name} {span.target}"
+
+
+def summary_tables(spans, limit=20):
+    actions = [s for s in spans if s.kind in ("action", "api")]
+    return {
+        "Slowest tests": aggregate([s for s in spans if s.kind == "test"], lambda s: s.name)[:limit],
+        "Time by kind": aggregate(spans, lambda s: s.kind if s.kind not in ("test", "phase") else None),
+        "Slowest steps": aggregate([s for s in spans if s.kind == "step"], lambda s: f"{s.test} :: {s.name}")[:limit],
+        "Slowest actions": aggregate(actions, action_name)[:limit],
+        "Slowest selectors / endpoints": aggregate(actions, lambda s: s.target)[:limit],
+        "Slowest fixtures": aggregate([s for s in spans if s.kind == "fixture"], lambda s: s.name)[:limit],
+    }
+
+
+def html_summary(spans):
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Trace summary</title>",
+        "<style>body{font-family:sans-serif} table{border-collapse:collapse;margin-bottom:2em}"
+        "td,th{border:1px solid #ccc;padding:4px 8px} td.n{text-align:right}</style></head><body>",
+        "<h1>Trace summary</h1>",
+    ]
+    for title, rows in summary_tables(spans).items():
+        parts.append(f"<h2>{title}</h2><table><tr><th>name</th><th>count</th>"
+                     "<th>total ms</th><th>avg ms</th><th>max ms</th></tr>")
+        for name, row in rows:
+            parts.append(
+                f"<tr><td>{html.escape(str(name))}</td><td class=n>{row['count']}</td>"
+                f"<td class=n>{row['total_ms']:.0f}</td><td class=n>{row['total_ms'] / row['count']:.1f}</td>"
+                f"<td class=n>{row['max_ms']:.0f}</td></tr>"
+            )
+        parts.append("</table>")
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def write_reports(out_dir=None):
+    out_dir = Path(out_dir or Config.TRACE_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    worker = os.getenv("WORKER_ID") or os.getenv("PYTEST_XDIST_WORKER") or "main"
+    trace_path = out_dir / f"trace-{worker}.json"
+    trace_path.write_text(json.dumps(chrome_trace(tracer.spans, tracer.origin, tracer.origin_wall, worker)))
+    (out_dir / f"summary-{worker}.html").write_text(html_summary(tracer.spans))
+    return trace_path
+
+
+class SavedSpan:
+    """A span read back from a worker's trace file."""
+
+    def __init__(self, event):
+        self.name = event["name"]
+        self.kind = event["cat"]
+        self.target = event["args"]["target"]
+        self.test = event["args"]["test"]
+        self.duration_ms = event["dur"] / 1000
+
+
+def merge_reports(workers, out_dir=None, since=0.0):
+    """
+    Merge the trace-<worker>.json files written after `since` (wall time)
+    into trace-all.json and summary-all.html. Returns the merged trace
+    path, or None if no worker wrote one (TRACE off).
+    """
+    out_dir = Path(out_dir or Config.TRACE_DIR)
+    traces = []
+    for worker in workers:
+        path = out_dir / f"trace-{worker}.json"
+        if path.exists() and path.stat().st_mtime >= since:
+            traces.append(json.loads(path.read_text()))
+    if not traces:
+        return None
+
+    # Shift every worker onto the earliest worker's clock
+    start = min(trace["otherData"]["origin_wall"] for trace in traces)
+    events, spans = [], []
+    for trace in traces:
+        shift_us = (trace["otherData"]["origin_wall"] - start) * 1e6
+        for event in trace["traceEvents"]:
+            events.append(dict(event, ts=event["ts"] + shift_us))
+            spans.append(SavedSpan(event))
+        if trace["traceEvents"]:  # Label the worker's row
+            pid = trace["traceEvents"][0]["pid"]
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": trace["otherData"]["worker"]}})
+
+    trace_path = out_dir / "trace-all.json"
+    trace_path.write_text(json.dumps({"traceEvents": events}))
+    (out_dir / "summary-all.html").write_text(html_summary(spans))
+    return trace_path
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    tracer.current_test = item.nodeid
+    with tracer.span(item.nodeid, "test"):
+        yield
+    tracer.current_test = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    with tracer.span("setup", "phase"):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    with tracer.span("call", "phase"):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    with tracer.span("teardown", "phase"):
+        yield
+
+
+_fixture_teardowns = {}  # fixturedef -> teardown span
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef):
+    with tracer.span(fixturedef.argname, "fixture"):
+        yield
+    if tracer.enabled:
+        # Added after the fixture's own finalizers, so it runs first on teardown;
+        # pytest_fixture_post_finalizer (always last) ends the span
+        def start_teardown():
+            _fixture_teardowns[fixturedef] = tracer.start(f"{fixturedef.argname} (teardown)", "fixture")
+        fixturedef.addfinalizer(start_teardown)
+
+
+def pytest_fixture_post_finalizer(fixturedef):
+    span = _fixture_teardowns.pop(fixturedef, None)
+    if span:
+        tracer.finish(span)
+
+
+def pytest_sessionfinish(session):
+    if tracer.enabled and tracer.spans:
+        write_reports()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not (tracer.enabled and tracer.spans):
+        return
+    terminalreporter.section("slowest actions")
+    for name, row in summary_tables(tracer.spans, limit=10)["Slowest actions"]:
+        terminalreporter.write_line(f"{row['total_ms']:9.0f} ms  {row['count']:>5}x  {name}")
+    terminalreporter.write_line(f"Full report in {Config.TRACE_DIR}/")
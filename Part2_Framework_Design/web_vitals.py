@@ -0,0 +1,232 @@
+"""
+Web Vitals and Performance Budgets
+==================================
+Measures every page-object navigation and fails it if it's over budget.
+
+With WEB_VITALS=true:
+- Every context gets a small init script that watches LCP and long
+  tasks from the very start of each page
+- After BasePage.goto/navigate the page is asked (one evaluate) for
+  Navigation Timing, LCP, long tasks and resource timing (load_ms is
+  only there if the load event fired before the page was READY)
+- Metrics are checked against BUDGETS for the tenant and page; over
+  budget raises BudgetExceeded (PERF_BUDGETS_ENFORCE=false only reports)
+- Every sample is appended to Config.PERF_HISTORY_FILE with its tenant
+  and environment, and the end of the run compares this run's medians
+  with earlier runs
+
+Budgets (ms) are looked up default -> tenant -> tenant + page name, so
+Company2's 50,000-project pages can have their own. PERF_BUDGETS_FILE
+points at a JSON file in the same shape to override them.
+"""
+
+import json
+import os
+import statistics
+import time
+import weakref
+
+import pytest
+
+from config_example import Config
+from scheduler import tenants_for
+
+
+BUDGETS = {
+    "default": {"ttfb_ms": 800, "dom_content_loaded_ms": 3000, "load_ms": 5000, "lcp_ms": 4000, "blocking_ms": 600},
+    "company2": {"load_ms": 8000, "lcp_ms": 8000, "ProjectsPage": {"lcp_ms": 10000}},
+}
+
+# Injected into every page before its own scripts run
+OBSERVE_JS = """
+(() => {
+    const vitals = window.__vitals = {lcp: null, longTasks: 0, blockingMs: 0};
+    try {
+        new PerformanceObserver((list) => {
+            const entries = list.getEntries();
+            vitals.lcp = entries[entries.length - 1].startTime;
+        }).observe({type: "largest-contentful-paint", buffered: true});
+        new PerformanceObserver((list) => {
+            for (const task of list.getEntries()) {
+                vitals.longTasks += 1;
+                vitals.blockingMs += Math.max(0, task.duration - 50);
+            }
+        }).observe({type: "longtask", buffered: true});
+    } catch (e) {}  // Browser without these entry types (Firefox/WebKit: no longtask)
+})();
+"""
+
+# Everything in one round trip
+COLLECT_JS = """
+() => {
+    const nav = performance.getEntriesByType("navigation")[0];
+    const resources = performance.getEntriesByType("resource");
+    const vitals = window.__vitals || {};
+    const slowest = [...resources].sort((a, b) => b.duration - a.duration).slice(0, 5);
+    return {
+        ttfb_ms: nav ? nav.responseStart - nav.requestStart : null,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+        load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+        lcp_ms: vitals.lcp,
+        long_tasks: vitals.longTasks || 0,
+        blocking_ms: vitals.blockingMs || 0,
+        resources: resources.length,
+        transfer_kb: resources.reduce((sum, r) => sum + (r.transferSize || 0), 0) / 1024,
+        slowest_resources: slowest.map((r) => [r.name, Math.round(r.duration)]),
+    };
+}
+"""
+
+
+class BudgetExceeded(AssertionError):
+    """A navigation was slower than its budget."""
+
+
+def load_budgets():
+    budgets = json.loads(json.dumps(BUDGETS))  # Copy
+    if Config.PERF_BUDGETS_FILE:
+        with open(Config.PERF_BUDGETS_FILE) as budgets_file:
+            for key, values in json.load(budgets_file).items():
+                budgets.setdefault(key, {}).update(values)
+    return budgets
+
+
+def budget_for(budgets, tenant, page_name):
+    """default, then tenant, then tenant's page-specific budgets."""
+    budget = {k: v for k, v in budgets.get("default", {}).items() if not isinstance(v, dict)}
+    tenant_budgets = budgets.get(tenant, {})
+    budget.update({k: v for k, v in tenant_budgets.items() if not isinstance(v, dict)})
+    budget.update(tenant_budgets.get(page_name, {}))
+    return budget
+
+
+class Vitals:
+    """Samples for this run, plus which tenant each context belongs to."""
+
+    def __init__(self):
+        self.enabled = Config.WEB_VITALS
+        self.budgets = None
+        self.samples = []
+        self.current_tenants = []  # From the running test's tenant marker
+        self._context_tenants = weakref.WeakKeyDictionary()
+
+    def install(self, context):
+        """Called for every new context (see BrowserFactory.setup_context)."""
+        if self.enabled:
+            context.add_init_script(OBSERVE_JS)
+
+    def set_tenant(self, context, tenant):
+        """Tag a context with its tenant (login_cache does this)."""
+        self._context_tenants[context] = tenant
+
+    def tenant_of(self, page):
+        tenant = self._context_tenants.get(page.context)
+        if tenant:
+            return tenant
+        return self.current_tenants[0] if len(self.current_tenants) == 1 else "unknown"
+
+    def collect(self, page, page_name):
+        """Measure the page that just loaded and check its budget."""
+        if not self.enabled:
+            return None
+        if self.budgets is None:
+            self.budgets = load_budgets()
+
+        metrics = page.evaluate(COLLECT_JS)
+        tenant = self.tenant_of(page)
+        sample = {
+            "time": time.time(),
+            "env": Config.ENV,
+            "tenant": tenant,
+            "page": page_name,
+            "url": page.url,
+            "metrics": metrics,
+        }
+        self.samples.append(sample)
+
+        over = {
+            name: (metrics[name], limit)
+            for name, limit in budget_for(self.budgets, tenant, page_name).items()
+            if metrics.get(name) is not None and metrics[name] > limit
+        }
+        sample["over_budget"] = sorted(over)
+        if over and Config.PERF_BUDGETS_ENFORCE:
+            details = ", ".join(f"{name} {value:.0f} > {limit} ms" for name, (value, limit) in over.items())
+            raise BudgetExceeded(f"{page_name} for {tenant} ({Config.ENV}) over budget: {details}")
+        return metrics
+
+    def save(self, path=None):
+        with open(path or Config.PERF_HISTORY_FILE, "a") as history:
+            for sample in self.samples:
+                history.write(json.dumps(sample) + "\n")
+
+
+vitals = Vitals()
+
+
+def trend(samples, history, metric="load_ms"):
+    """
+    [(env, tenant, page, this run's median, earlier median)] for metric.
+    history: samples from earlier runs (same shape as samples).
+    """
+    def medians(rows):
+        grouped = {}
+        for row in rows:
+            value = row["metrics"].get(metric)
+            if value is not None:
+                grouped.setdefault((row["env"], row["tenant"], row["page"]), []).append(value)
+        return {key: statistics.median(values) for key, values in grouped.items()}
+
+    now, before = medians(samples), medians(history)
+    return [(*key, value, before.get(key)) for key, value in sorted(now.items())]
+
+
+def read_history(path=None):
+    path = path or Config.PERF_HISTORY_FILE
+    if not os.path.exists(path):
+        return []
+    rows = []
+    with open(path) as history:
+        for line in history:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                continue
+    return rows
+
+
+# Pytest hooks (registered via plugins.py)
+# ========================================
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    vitals.current_tenants = tenants_for(item)
+
+
+_history = []  # Earlier runs, read before this run's samples are added
+
+
+def pytest_sessionfinish(session):
+    # Saved here, not in the terminal summary, so runs without a terminal
+    # reporter (xdist workers, -p no:terminal) still add to the history
+    global _history
+    if vitals.samples:
+        _history = read_history()
+        vitals.save()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not vitals.samples:
+        return
+    history = _history
+
+    terminalreporter.section(f"web vitals ({Config.ENV})")
+    for metric in ("load_ms", "lcp_ms"):
+        for env, tenant, page, median, before in trend(vitals.samples, history, metric):
+            line = f"{tenant:<10} {page:<16} {metric:<8} median {median:7.0f} ms"
+            if before:
+                line += f"  (was {before:7.0f} ms, {(median - before) / before:+.0%})"
+            terminalreporter.write_line(line)
+    over = [s for s in vitals.samples if s["over_budget"]]
+    if over:
+        terminalreporter.write_line(f"{len(over)} navigations over budget")
@@ -0,0 +1,13 @@
+"""
+Root conftest.
+
+Registers the framework's markers before any test module is imported,
+so running pytest from the repository root doesn't warn about them.
+"""
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "tenant(*names): tenants the test uses (keeps them on one worker)",
+    )